@@ -0,0 +1,165 @@
+"""Run a scripted command stream against a queue engine, without menus.
+
+The interactive menus in bc.py and tugas.py block on input() and clear the
+screen after every action. This driver reads one command per line instead:
+
+    issue teller            # bc: Tambah Antrian; tugas: ambil nomor (nama opsional)
+    issue cs Budi Santoso
+    finish cs 2             # selesaikan layanan di loket 2
+    status teller           # lihat antrian; tanpa kategori = semua kategori
+    cancel teller 7         # bc saja: batalkan nomor antrian 7
+    skip teller 3           # bc saja: nasabah di loket 3 tidak hadir
+    recall teller 5         # bc saja: panggil ulang nomor 5 yang dilewati
+    # komentar dan baris kosong dilewati
+
+Each command calls the same method as the matching menu entry, so its output
+is byte-for-byte what the interactive mode prints for that action, minus the
+menus, prompts and screen clears (tests/test_batch_driver.py
+compares the two). Output goes through one large write buffer. A line the
+driver cannot parse is reported on stderr with its line number and skipped.
+
+Contoh:
+    python batch_driver.py hari_ini.txt > keluaran.txt
+    python batch_driver.py --engine tugas - < hari_ini.txt
+"""
+import argparse
+import contextlib
+import sys
+
+from bc import BankQueueSystem
+from categories import load_categories
+from estimator import WaitEstimator
+from tugas import SistemAntrianBank
+
+OUTPUT_BUFFER = 1 << 20
+ENGINES = ("bc", "tugas")
+
+
+def bank_commands(system):
+    """Command table for a bc.BankQueueSystem: verb -> handler(category, args)."""
+    def issue(category, args):
+        if args:
+            return "issue hanya menerima kategori"
+        system.add_to_queue(category)
+
+    def with_number(verb, method, what):
+        def handler(category, args):
+            if len(args) != 1:
+                return f"{verb} butuh satu {what}"
+            try:
+                number = int(args[0])
+            except ValueError:
+                # The menu's int(input(...)) fails the same way.
+                print("Input tidak valid, masukkan angka.")
+                return
+            method(category, number)
+        return handler
+
+    def status(category, args):
+        if args:
+            return "status hanya menerima kategori"
+        system.show_queue(category)
+
+    return {"issue": issue,
+            "finish": with_number("finish", system.finish_service, "nomor loket"),
+            "status": status,
+            "cancel": with_number("cancel", system.cancel_ticket, "nomor antrian"),
+            "skip": with_number("skip", system.skip_no_show, "nomor loket"),
+            "recall": with_number("recall", system.recall_ticket, "nomor antrian")}
+
+
+def tugas_commands(sistem):
+    """Command table for a tugas.SistemAntrianBank: verb -> handler(category, args)."""
+    def issue(category, args):
+        # The rest of the line is the customer name, as typed at the prompt.
+        sistem.tambah_nasabah(" ".join(args), category)
+
+    def finish(category, args):
+        if len(args) != 1:
+            return "finish butuh satu nomor loket"
+        if args[0].isdigit():
+            sistem.selesaikan_layanan(category, int(args[0]))
+        else:
+            print("Nomor loket tidak valid.")
+
+    def status(category, args):
+        if args:
+            return "status hanya menerima kategori"
+        sistem.tampilkan_status_antrian(category)
+
+    return {"issue": issue, "finish": finish, "status": status}
+
+
+def build_engine(engine, categories=None):
+    """The engine as its interactive CLI sets it up, plus its command table."""
+    if engine == "bc":
+        system = BankQueueSystem(categories=categories)
+        system.estimator = WaitEstimator(system)
+        return system, bank_commands(system), list(system.categories)
+    if engine == "tugas":
+        sistem = SistemAntrianBank(categories)
+        return sistem, tugas_commands(sistem), list(sistem.layanan)
+    raise ValueError(f"Mesin tidak dikenal: {engine!r}")
+
+
+def run(lines, commands, categories, errors=sys.stderr):
+    """Execute every command in `lines`; returns the number of rejected lines.
+
+    Engine output goes to the current sys.stdout.
+    """
+    known = set(categories)
+    rejected = 0
+    for lineno, line in enumerate(lines, 1):
+        words = line.split()
+        if not words or words[0][0] == "#":
+            continue
+        handler = commands.get(words[0])
+        if handler is None:
+            problem = f"perintah tidak dikenal: {words[0]!r}"
+        elif len(words) == 1:
+            if words[0] == "status":
+                for category in categories:
+                    handler(category, ())
+                continue
+            problem = f"{words[0]} butuh kategori"
+        elif words[1] not in known:
+            problem = f"kategori tidak dikenal: {words[1]!r}"
+        else:
+            problem = handler(words[1], words[2:])
+            if problem is None:
+                continue
+        rejected += 1
+        errors.write(f"baris {lineno}: {problem}\n")
+    return rejected
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Jalankan perintah antrian dari file atau stdin.")
+    parser.add_argument("script", nargs="?", default="-", help="file perintah ('-' untuk stdin)")
+    parser.add_argument("--engine", choices=ENGINES, default="bc")
+    parser.add_argument("--categories", metavar="FILE",
+                        help="file JSON berisi kategori layanan, prefix dan jumlah loket")
+    parser.add_argument("--output", metavar="FILE", help="tulis keluaran ke FILE, bukan stdout")
+    args = parser.parse_args()
+
+    categories = load_categories(args.categories) if args.categories else None
+    _, commands, keys = build_engine(args.engine, categories)
+
+    with contextlib.ExitStack() as stack:
+        if args.script == "-":
+            lines = sys.stdin
+        else:
+            lines = stack.enter_context(open(args.script, encoding="utf-8"))
+        if args.output:
+            out = stack.enter_context(open(args.output, "w", encoding="utf-8", buffering=OUTPUT_BUFFER))
+        else:
+            out = stack.enter_context(open(sys.stdout.fileno(), "w", encoding=sys.stdout.encoding,
+                                           buffering=OUTPUT_BUFFER, closefd=False))
+        with contextlib.redirect_stdout(out):
+            rejected = run(lines, commands, keys)
+    if rejected:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,148 +1,442 @@
+import argparse
+import gc
 import os
-from tabulate import tabulate
-from abc import ABC, abstractmethod
+import time
+from contextlib import ExitStack, contextmanager
+from functools import partial
+from itertools import repeat
+from ticket_queue import RECALL, Ticket, TicketLine, QueueFullError
+from numbering import DailyRollover, TicketSeries, parse_time_of_day
+from counter_index import FreeCounterIndex
+from dispatch import EVENTS, DispatchEngine
+from scheduler import APPOINTMENT, SECOND, PriorityScheduler
+from journal import Journal
+from estimator import WaitEstimator
+from metrics import QueueMetrics
+from no_show import NoShowMonitor
+from profiling import traced
+from timer_wheel import TimerWheel
+from status_view import CounterTable, status_block
+from categories import default_categories, load_categories, validate
 
 def clear_screen():
-    os.system('cls' if os.name == 'nt' else 'clear')
+    # An ANSI escape instead of os.system('clear'): no process fork per menu.
+    if os.name == 'nt':
+        os.system('cls')
+    else:
+        print("\033[H\033[2J", end="", flush=True)
 
 class Queue:
-    def __init__(self, prefix):
-        self.queue = []
+    def __init__(self, prefix, capacity=None, priority=False, width=3, wrap=None):
+        self.queue = PriorityScheduler(capacity) if priority else TicketLine(capacity)
         self.prefix = prefix
-        self.last_ticket = 0
+        self.series = TicketSeries(prefix, width, wrap)
+        self.skipped = {}       # number -> ticket of no-shows that can be recalled
 
-    def generate_ticket(self):
-        if self.queue:
-            last_number = int(self.queue[-1][1:])
-        else:
-            last_number = self.last_ticket
-        
-        new_number = last_number + 1
-        ticket = f"{self.prefix} {new_number:03}"
-        self.last_ticket = new_number
-        self.queue.append(ticket)
+    @property
+    def last_ticket(self):
+        return self.series.sequence
+
+    @last_ticket.setter
+    def last_ticket(self, number):
+        self.series.sequence = number
+
+    @traced
+    def generate_ticket(self, **options):
+        # The number comes from the series, never from the waiting line; it
+        # is only used up once the ticket is in line.
+        series = self.series
+        ticket = Ticket(self.prefix, series.upcoming(), series=series)
+        self.queue.enqueue(ticket, **options)
+        series.sequence = ticket.number
         return ticket
 
-class ServiceCounter(ABC):
+class ServiceCounter:
     def __init__(self, num_counters, counter_type):
         self.counters = [None] * num_counters
+        self.free_counters = FreeCounterIndex(num_counters)
         self.counter_type = counter_type
+        self.table = CounterTable(counter_type, num_counters)
 
-    @abstractmethod
+    def display_header(self):
+        print(f"\n=== Antrian {self.counter_type} ===")
+
+    def is_valid_counter(self, counter_id):
+        return 1 <= counter_id <= len(self.counters)
+
+    @traced
+    def release(self, counter_id):
+        """Free a counter and return the ticket it was serving, or None."""
+        ticket = self.counters[counter_id - 1]
+        if ticket is not None:
+            self.counters[counter_id - 1] = None
+            self.free_counters.release(counter_id - 1)
+        return ticket
+
+    @traced
     def process_queue(self, queue):
-        pass
+        """Assign waiting tickets to idle counters; returns (counter_id, ticket) pairs."""
+        # Only idle counters are visited, so assigning k tickets costs O(k).
+        assignments = []
+        free, line, counters = self.free_counters, queue.queue, self.counters
+        while free and line:
+            idx = free.acquire()
+            ticket = line.dequeue()
+            counters[idx] = ticket
+            assignments.append((idx + 1, ticket))
+        return assignments
 
-    @abstractmethod
-    def display_header(self):
-        pass
+    def display_status(self, queue):
+        # One cached, pre-formatted block: only changed counter rows are
+        # re-formatted and only the head of the line is shown.
+        print(status_block(self.table, self.counters, queue.queue))
+
+class BankQueueSystem:
+    def __init__(self, queue_capacity=None, num_tellers=4, num_cs=3, categories=None, priority=False,
+                 routing=None):
+        """`categories` is a list of categories.Category; without it the
+        system has the classic teller (A) and customer service (B) lines.
+        With priority=True the lines have priority lanes and appointments
+        (see scheduler.py) instead of plain FIFO, and each booking sets a
+        timer that calls the appointment once its slot is near; start()
+        runs those timers. With a skill_routing.SkillRouting the counters
+        are shared across categories (see skill_routing.py)."""
+        if categories is None:
+            categories = default_categories(num_tellers, num_cs)
+        self.categories = {c.key: c for c in validate(categories)}
+        self.queues = {c.key: Queue(c.prefix, queue_capacity, priority, c.number_width, c.number_wrap)
+                       for c in categories}
+        self.counters = {c.key: ServiceCounter(routing.size if routing else c.counters, c.label)
+                         for c in categories}
+        self.dispatcher = DispatchEngine({
+            key: (self.queues[key], self.counters[key]) for key in self.categories
+        }, routing)
+        self.estimator = None   # an estimator.WaitEstimator to print wait estimates
+        self.no_show = None     # a no_show.NoShowMonitor that skips absent customers
+        self.on_assign = None   # callback(assignments) for counters called by timers
+        self.appointment_timers = None
+        if priority:
+            self.appointment_timers = TimerWheel()
+            self.subscribe(self._on_booking, ("enqueue",))
+
+    def get_counter(self, queue_type):
+        return self.counters[queue_type]
 
-    def finish_service(self, counter_id):
-        if 1 <= counter_id <= len(self.counters):
-            if self.counters[counter_id - 1] is not None:
-                print(f"Nomor {self.counters[counter_id - 1]} telah selesai dilayani di Loket {counter_id}.")
-                self.counters[counter_id - 1] = None
+    def subscribe(self, listener, events=EVENTS):
+        self.dispatcher.subscribe(listener, events)
+
+    @contextmanager
+    def locked(self):
+        """Hold every category lock, always taken in the same order."""
+        with ExitStack() as stack:
+            for category in sorted(self.dispatcher.locks):
+                stack.enter_context(self.dispatcher.locks[category])
+            yield
+
+    def snapshot_state(self):
+        """Plain-data copy of every queue and counter (ticket numbers only)."""
+        state = {}
+        with self.locked():
+            for category, (queue, counter) in self.dispatcher.pools.items():
+                state[category] = {
+                    "last": queue.last_ticket,
+                    "waiting": [ticket.number for ticket in queue.queue],
+                    "counters": [ticket.number if ticket else None for ticket in counter.counters],
+                    "skipped": list(queue.skipped),
+                    "day": queue.series.day,
+                    "day_starts": list(queue.series.day_starts),
+                }
+                if isinstance(queue.queue, PriorityScheduler):
+                    # Lane and wall-clock time per waiting ticket, so lanes,
+                    # aging and appointments survive a restart.
+                    state[category]["places"] = [list(queue.queue.place(ticket.number))
+                                                 for ticket in queue.queue]
+        return state
+
+    def restore_state(self, state):
+        """Replace queues and counters with a state from snapshot_state()."""
+        # Rebuilding allocates a few objects per waiting ticket and creates
+        # no cycles; pausing the collector keeps it from rescanning them.
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            with self.locked():
+                self._restore_state(state)
+        finally:
+            if collecting:
+                gc.enable()
+
+    def _restore_state(self, state):
+        for category, saved in state.items():
+            queue, counter = self.dispatcher.pools[category]
+            if len(saved["counters"]) != len(counter.counters):
+                raise ValueError(f"Jumlah loket {category} tidak cocok dengan snapshot.")
+            series = queue.series
+            series.sequence = saved["last"]
+            series.day = saved.get("day")
+            series.day_starts = list(saved.get("day_starts", ()))
+            now = time.monotonic_ns()
+            tickets = [Ticket(queue.prefix, number, now, series) for number in saved["waiting"]]
+            line = queue.queue
+            line.clear()
+            if isinstance(line, TicketLine):
+                line.extend(tickets)        # one bulk index load, not n pushes
             else:
-                print(f"Loket {counter_id} sedang kosong.")
-        else:
-            print("ID Loket tidak valid.")
+                for ticket, place in zip(tickets, saved.get("places") or repeat(None)):
+                    if place is None:
+                        line.enqueue(ticket)
+                        continue
+                    line.restore(ticket, *place)
+                    slot = line.slot_of(ticket.number)
+                    if slot is not None and self.appointment_timers is not None:
+                        self._wake_at(category, line, slot)
+            queue.skipped = {number: Ticket(queue.prefix, number, series=series)
+                             for number in saved.get("skipped", ())}
+            counter.free_counters = FreeCounterIndex(len(counter.counters))
+            for idx, number in enumerate(saved["counters"]):
+                counter.counters[idx] = None if number is None else Ticket(queue.prefix, number, series=series)
+                if number is not None:
+                    counter.free_counters.mark_busy(idx)
+        if self.dispatcher.routing is not None:
+            self.dispatcher.routing.restore(self.counters.values())
 
-    def display_status(self, queue):
-        table = []
-        for idx, counter in enumerate(self.counters):
-            table.append([f"Loket {idx + 1}", counter if counter else "Kosong"])
-
-        print(tabulate(table, headers=[f"{self.counter_type} Counter", "Nomor Antrian"]))
-        print("\nAntrian Menunggu:")
-        if queue.queue:
-            for ticket in queue.queue:
-                print(ticket)
-        else:
-            print("Tidak ada antrian.")
+    def place(self, queue_type, number):
+        """Lane and wall-clock time of waiting ticket `number` in a priority
+        line (PriorityScheduler.place), or None in a FIFO line."""
+        line = self.queues[queue_type].queue
+        return line.place(number) if isinstance(line, PriorityScheduler) else None
 
-class TellerCounter(ServiceCounter):
-    def __init__(self):
-        super().__init__(num_counters=4, counter_type="Teller")
+    def lanes(self):
+        """Every lane place() can report; empty without priority lines."""
+        names = set()
+        for queue in self.queues.values():
+            if isinstance(queue.queue, PriorityScheduler):
+                names.update(queue.queue.boosts)
+                names.update((APPOINTMENT, RECALL))
+        return sorted(names)
 
-    def display_header(self):
-        print("\n=== Antrian Teller ===")
+    def _on_booking(self, event, category, ticket, counter_id):
+        # A booking becomes callable with time, not with an event, so a
+        # timer dispatches once its slot is within appointment_early.
+        if event == "enqueue":
+            line = self.queues[category].queue
+            slot = line.slot_of(ticket.number)
+            if slot is not None:
+                self._wake_at(category, line, slot)
 
-    def process_queue(self, queue):
-        self.display_header()
-        for i in range(len(self.counters)):
-            if self.counters[i] is None and queue.queue:
-                self.counters[i] = queue.queue.pop(0)
-        self.display_status(queue)
+    def _wake_at(self, category, line, slot):
+        wheel = self.appointment_timers
+        delay = max(slot - line.appointment_early - line.clock(), 0) / SECOND
+        # The wheel rounds to whole ticks; one tick late is never too early.
+        wheel.schedule(delay + wheel.tick, self.dispatch_due, category)
 
-class CustomerServiceCounter(ServiceCounter):
-    def __init__(self):
-        super().__init__(num_counters=3, counter_type="Customer Service")
+    def dispatch_due(self, category):
+        """Call waiting tickets that became callable with time (appointment
+        slots, see scheduler.py) and pass the assignments to on_assign."""
+        assignments = self.dispatcher.dispatch(category)
+        if assignments and self.on_assign is not None:
+            self.on_assign(assignments)
+        return assignments
 
-    def display_header(self):
-        print("\n=== Antrian Customer Service ===")
+    def start(self):
+        """Run the appointment timers from a background thread."""
+        if self.appointment_timers is not None:
+            self.appointment_timers.start()
 
-    def process_queue(self, queue):
-        self.display_header()
-        for i in range(len(self.counters)):
-            if self.counters[i] is None and queue.queue:
-                self.counters[i] = queue.queue.pop(0)
-        self.display_status(queue)
+    def close(self):
+        if self.appointment_timers is not None:
+            self.appointment_timers.close()
 
-class BankQueueSystem:
-    def __init__(self):
-        self.teller_queue = Queue("A")
-        self.cs_queue = Queue("B")
-        self.teller_counter = TellerCounter()
-        self.cs_counter = CustomerServiceCounter()
-
-    def add_to_queue(self, queue_type):
-        if queue_type == "teller":
-            ticket = self.teller_queue.generate_ticket()
-            print(f"Ticket {ticket} added to Teller Queue.")
+    def rollover(self, day):
+        """Start business day `day` in every category that is idle; returns
+        True if any category started it.
+
+        A category with tickets waiting or at a counter keeps the old day:
+        its display numbers would restart while the old ones are still on
+        screen. It rolls over on a later call, once it is idle (see
+        behind()). Skipped tickets of the old day can no longer be recalled.
+        """
+        rolled = False
+        with self.locked():
+            for queue, counter in self.dispatcher.pools.values():
+                if queue.series.day == day or not self._idle(queue, counter):
+                    continue
+                queue.series.rollover(day)
+                queue.skipped.clear()
+                rolled = True
+        return rolled
+
+    @staticmethod
+    def _idle(queue, counter):
+        return not len(queue.queue) and counter.counters.count(None) == len(counter.counters)
+
+    def behind(self, day):
+        """Keys of the categories that have not started business day `day`."""
+        with self.locked():
+            return [key for key, queue in self.queues.items() if queue.series.day != day]
+
+    def position(self, queue_type, number):
+        """1-based place in line of ticket `number`, or None if it is not waiting.
+
+        O(log n) through the line's index, however long the line is.
+        """
+        with self.dispatcher.locks[queue_type]:
+            return self.queues[queue_type].queue.position(number)
+
+    def issue(self, queue_type, **options):
+        """Issue a ticket; returns (ticket, assignments, ahead, estimate).
+
+        `ahead` (tickets called before it) and the wait estimate are read
+        under the category lock, so they describe the line the ticket
+        joined. Both are None if the ticket went straight to a counter or
+        is a booked appointment; the estimate also without an estimator.
+        """
+        with self.dispatcher.locks[queue_type]:
+            ticket, assignments = self.dispatcher.arrive(queue_type, **options)
+            ahead = self.queues[queue_type].queue.ahead(ticket.number)
+            estimate = None
+            if ahead is not None and self.estimator is not None:
+                estimate = self.estimator.predict(queue_type, ahead)
+        return ticket, assignments, ahead, estimate
+
+    @traced
+    def add_to_queue(self, queue_type, **options):
+        """Issue a ticket and print it; returns (ticket, ahead, estimate), or
+        None if the line is full."""
+        try:
+            ticket, assignments, ahead, estimate = self.issue(queue_type, **options)
+        except QueueFullError as e:
+            print(e)
+            return None
+        print(f"Ticket {ticket} added to {self.categories[queue_type].label} Queue.")
+        if estimate is not None:
+            print(f"Perkiraan waktu tunggu: {estimate}.")
+        self.announce(assignments)
+        return ticket, ahead, estimate
+
+    @traced
+    def finish_service(self, queue_type, counter_id):
+        if not self.get_counter(queue_type).is_valid_counter(counter_id):
+            print("ID Loket tidak valid.")
+            return
+        ticket, assignments = self.dispatcher.finish(queue_type, counter_id)
+        if ticket is None:
+            print(f"Loket {counter_id} sedang kosong.")
+            return
+        print(f"Nomor {ticket} telah selesai dilayani di Loket {counter_id}.")
+        self.announce(assignments)
+
+    def ticket_number(self, queue_type, shown):
+        """The ticket number behind display number `shown` today, or None."""
+        with self.dispatcher.locks[queue_type]:
+            return self.queues[queue_type].series.number_of(shown)
+
+    @traced
+    def cancel_ticket(self, queue_type, shown):
+        number = self.ticket_number(queue_type, shown)
+        ticket = None if number is None else self.dispatcher.cancel(queue_type, number)
+        if ticket is None:
+            print(f"Nomor antrian {shown} tidak sedang menunggu.")
+            return
+        print(f"Nomor {ticket} dibatalkan.")
+
+    @traced
+    def skip_no_show(self, queue_type, counter_id):
+        if not self.get_counter(queue_type).is_valid_counter(counter_id):
+            print("ID Loket tidak valid.")
+            return
+        ticket, assignments = self.dispatcher.skip(queue_type, counter_id)
+        if ticket is None:
+            print(f"Loket {counter_id} sedang kosong.")
+            return
+        print(f"Nomor {ticket} tidak hadir di Loket {counter_id} dan dilewati.")
+        self.announce(assignments)
+
+    @traced
+    def recall_ticket(self, queue_type, shown):
+        number = self.ticket_number(queue_type, shown)
+        ticket, assignments = (None, []) if number is None else self.dispatcher.recall(queue_type, number)
+        if ticket is None:
+            print(f"Nomor antrian {shown} tidak ada di daftar tidak hadir.")
+            return
+        print(f"Nomor {ticket} dipanggil ulang.")
+        self.announce(assignments)
+
+    def check_in(self, queue_type, counter_id):
+        if not self.get_counter(queue_type).is_valid_counter(counter_id):
+            print("ID Loket tidak valid.")
+            return
+        if self.no_show is not None and self.no_show.check_in(queue_type, counter_id):
+            print(f"Nasabah di Loket {counter_id} sudah hadir.")
         else:
-            ticket = self.cs_queue.generate_ticket()
-            print(f"Ticket {ticket} added to Customer Service Queue.")
+            print(f"Loket {counter_id} tidak sedang menunggu nasabah.")
 
-    def add_to_teller_queue(self):
-        self.add_to_queue("teller")
+    def announce(self, assignments):
+        for counter_id, ticket in assignments:
+            print(f"Nomor {ticket} silakan menuju Loket {counter_id}.")
 
-    def add_to_cs_queue(self):
-        self.add_to_queue("cs")
+    def show_queue(self, queue_type):
+        counter = self.counters[queue_type]
+        counter.display_header()
+        # Timers (no-show, appointments, rollover) change lines from other
+        # threads, so the block is rendered under the category lock.
+        with self.dispatcher.locks[queue_type]:
+            counter.display_status(self.queues[queue_type])
 
-    def show_teller_queue(self):
-        self.teller_counter.process_queue(self.teller_queue)
+    def ask_finish_service(self, queue_type):
+        num_counters = len(self.counters[queue_type].counters)
+        counter_id = int(input(f"Masukkan ID Loket yang ingin diselesaikan (1-{num_counters}): "))
+        self.finish_service(queue_type, counter_id)
 
-    def show_cs_queue(self):
-        self.cs_counter.process_queue(self.cs_queue)
+    def ask_cancel_ticket(self, queue_type):
+        self.cancel_ticket(queue_type, int(input("Masukkan nomor antrian yang dibatalkan: ")))
+
+    def ask_skip_no_show(self, queue_type):
+        num_counters = len(self.counters[queue_type].counters)
+        self.skip_no_show(queue_type, int(input(f"Masukkan ID Loket yang nasabahnya tidak hadir (1-{num_counters}): ")))
+
+    def ask_recall_ticket(self, queue_type):
+        self.recall_ticket(queue_type, int(input("Masukkan nomor antrian yang dipanggil ulang: ")))
+
+    def ask_check_in(self, queue_type):
+        num_counters = len(self.counters[queue_type].counters)
+        self.check_in(queue_type, int(input(f"Masukkan ID Loket yang nasabahnya sudah hadir (1-{num_counters}): ")))
+
+    def menu_actions(self):
+        """(label, action) per menu entry: every operation for every category.
+
+        "Nasabah Hadir" is only offered for categories a no-show monitor
+        watches."""
+        verbs = [("Tambah Antrian", self.add_to_queue),
+                 ("Lihat Antrian", self.show_queue),
+                 ("Selesaikan Layanan", self.ask_finish_service),
+                 ("Batalkan Antrian", self.ask_cancel_ticket),
+                 ("Tidak Hadir", self.ask_skip_no_show),
+                 ("Panggil Ulang", self.ask_recall_ticket)]
+        if self.no_show is not None:
+            verbs.append(("Nasabah Hadir", self.ask_check_in))
+        actions = []
+        for verb, method in verbs:
+            for key, category in self.categories.items():
+                if method == self.ask_check_in and key not in self.no_show.timeouts:
+                    continue
+                actions.append((f"{verb} {category.label}", partial(method, key)))
+        return actions
 
     def main_menu(self):
+        actions = self.menu_actions()
         while True:
             clear_screen()
             print("\n=== Sistem Antrian Bank ===")
-            print("1. Tambah Antrian Teller")
-            print("2. Tambah Antrian Customer Service")
-            print("3. Lihat Antrian Teller")
-            print("4. Lihat Antrian Customer Service")
-            print("5. Selesaikan Layanan Teller")
-            print("6. Selesaikan Layanan Customer Service")
-            print("7. Keluar")
+            for number, (label, _) in enumerate(actions, 1):
+                print(f"{number}. {label}")
+            print(f"{len(actions) + 1}. Keluar")
 
             try:
                 choice = int(input("Pilih menu: "))
-                if choice == 1:
-                    self.add_to_teller_queue()
-                elif choice == 2:
-                    self.add_to_cs_queue()
-                elif choice == 3:
-                    self.show_teller_queue()
-                elif choice == 4:
-                    self.show_cs_queue()
-                elif choice == 5:
-                    counter_id = int(input("Masukkan ID Loket yang ingin diselesaikan (1-4): "))
-                    self.teller_counter.finish_service(counter_id)
-                elif choice == 6:
-                    counter_id = int(input("Masukkan ID Loket yang ingin diselesaikan (1-3): "))
-                    self.cs_counter.finish_service(counter_id)
-                elif choice == 7:
+                if 1 <= choice <= len(actions):
+                    actions[choice - 1][1]()
+                elif choice == len(actions) + 1:
                     print("Keluar dari sistem.")
                     break
                 else:
@@ -153,5 +447,51 @@ class BankQueueSystem:
             input("\nTekan Enter untuk kembali ke menu...")
 
 if __name__ == "__main__":
-    system = BankQueueSystem()
-    system.main_menu()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Sistem Antrian Bank")
+    parser.add_argument("--journal", metavar="DIR",
+                        help="simpan antrian ke jurnal di DIR dan pulihkan saat start")
+    parser.add_argument("--categories", metavar="FILE",
+                        help="file JSON berisi kategori layanan, prefix dan jumlah loket")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help="sajikan metrik Prometheus di http://localhost:PORT/metrics")
+    parser.add_argument("--rollover", metavar="HH:MM", default="00:00",
+                        help="jam nomor antrian mulai lagi dari 1 setiap hari, begitu antrian kosong (default 00:00)")
+    args = parser.parse_args()
+    try:
+        parse_time_of_day(args.rollover)
+    except ValueError as e:
+        parser.error(str(e))
+
+    system = BankQueueSystem(categories=load_categories(args.categories) if args.categories else None)
+    system.estimator = WaitEstimator(system)
+    metrics = None
+    if args.metrics_port:
+        metrics = QueueMetrics(system)
+        metrics.serve(args.metrics_port)
+    journal = None
+    if args.journal:
+        journal = Journal(args.journal)
+        journal.recover(system)
+        journal.attach(system)
+    # Counters called by the no-show and appointment timers are announced
+    # like any other call.
+    system.on_assign = system.announce
+    if any(category.no_show_timeout for category in system.categories.values()):
+        system.no_show = NoShowMonitor(system)
+        system.no_show.start()
+    # With a journal the rollover is written as a snapshot before any ticket
+    # of the new day can be issued.
+    rollover = DailyRollover(system, args.rollover, on_rollover=journal.snapshot if journal else None)
+    rollover.start()
+    system.start()
+    try:
+        system.main_menu()
+    finally:
+        system.close()
+        rollover.close()
+        if system.no_show:
+            system.no_show.close()
+        if metrics:
+            metrics.close()
+        if journal:
+            journal.close()
\ No newline at end of file
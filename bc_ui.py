@@ -1,114 +1,110 @@
+import os
+
 import streamlit as st
-from tabulate import tabulate
-
-class BankQueueSystem:
-    def __init__(self):
-        self.teller_queue = []  # List for teller queue
-        self.cs_queue = []  # List for customer service queue
-        self.teller_counters = [None] * 4  # Represent 4 teller counters
-        self.cs_counters = [None] * 3  # Represent 3 customer service counters
-
-    def generate_ticket(self, queue, prefix):
-        """Generate a new ticket number"""
-        if queue:
-            last_number = int(queue[-1][1:])
-        else:
-            last_number = 0
-        new_number = f"{prefix} {last_number + 1:03}"
-        return new_number
-
-    def add_to_teller_queue(self):
-        ticket = self.generate_ticket(self.teller_queue, "A")
-        self.teller_queue.append(ticket)
-        return ticket
-
-    def add_to_cs_queue(self):
-        ticket = self.generate_ticket(self.cs_queue, "B")
-        self.cs_queue.append(ticket)
-        return ticket
-
-    def process_queue(self, queue, counters):
-        """Process a queue and assign tickets to counters."""
-        for i in range(len(counters)):
-            if counters[i] is None and queue:
-                counters[i] = queue.pop(0)
-        return counters
-
-    def finish_service(self, counters, counter_id):
-        """Mark the service as finished."""
-        if 1 <= counter_id <= len(counters):
-            if counters[counter_id - 1] is not None:
-                counters[counter_id - 1] = None
-                return True
-        return False
-
-    def get_queue_status(self, queue, counters):
-        """Get the current status of the queue and counters."""
-        waiting_tickets = queue
-        counter_status = [counter if counter else "Kosong" for counter in counters]
-        return waiting_tickets, counter_status
-
-# Initialize the system
-if 'bank_system' not in st.session_state:
-    st.session_state.bank_system = BankQueueSystem()
-
-bank_system = st.session_state.bank_system
+from bc import BankQueueSystem
+from categories import load_categories
+from metrics import QueueMetrics
+from queue_service import QueueService
+from ticket_queue import QueueFullError
+
+@st.cache_resource
+def get_queue_service():
+    """One QueueService per server process, shared by every browser session."""
+    config = os.environ.get("BANK_QUEUE_CATEGORIES")
+    system = BankQueueSystem(categories=load_categories(config) if config else None)
+    service = QueueService(system, journal_dir=os.environ.get("BANK_QUEUE_JOURNAL"),
+                           rollover_at=os.environ.get("BANK_QUEUE_ROLLOVER", "00:00"))
+    port = os.environ.get("BANK_QUEUE_METRICS_PORT")
+    if port:
+        QueueMetrics(system).serve(int(port))
+    return service
+
+bank_system = get_queue_service()
+CATEGORY = {c.label: c.key for c in bank_system.system.categories.values()}
 
 # Streamlit app UI
 st.title("Sistem Antrian Bank")
 
-menu = st.sidebar.radio("Menu", ["Tambah Antrian", "Lihat Antrian", "Selesaikan Layanan"])
+menu = st.sidebar.radio("Menu", ["Tambah Antrian", "Lihat Antrian", "Selesaikan Layanan",
+                                 "Batalkan / Panggil Ulang"])
 
 if menu == "Tambah Antrian":
     st.header("Tambah Antrian")
-    option = st.radio("Pilih jenis antrian:", ["Teller", "Customer Service"])
+    option = st.radio("Pilih jenis antrian:", list(CATEGORY))
 
     if st.button("Tambah Antrian"):
-        if option == "Teller":
-            ticket = bank_system.add_to_teller_queue()
-            st.success(f"Nomor antrian {ticket} ditambahkan ke Teller Queue.")
-        else:
-            ticket = bank_system.add_to_cs_queue()
-            st.success(f"Nomor antrian {ticket} ditambahkan ke Customer Service Queue.")
+        try:
+            ticket, estimate = bank_system.issue_with_estimate(CATEGORY[option])
+            st.success(f"Nomor antrian {ticket} ditambahkan ke {option} Queue.")
+            if estimate is not None:
+                st.info(f"Perkiraan waktu tunggu: {estimate}.")
+        except QueueFullError as e:
+            st.error(str(e))
 
 elif menu == "Lihat Antrian":
     st.header("Lihat Antrian")
-    option = st.radio("Pilih jenis antrian:", ["Teller", "Customer Service"])
-
-    if option == "Teller":
-        bank_system.process_queue(bank_system.teller_queue, bank_system.teller_counters)
-        queue, counters = bank_system.get_queue_status(bank_system.teller_queue, bank_system.teller_counters)
-    else:
-        bank_system.process_queue(bank_system.cs_queue, bank_system.cs_counters)
-        queue, counters = bank_system.get_queue_status(bank_system.cs_queue, bank_system.cs_counters)
-
-    st.subheader("Status Loket")
-    for idx, counter in enumerate(counters):
-        st.write(f"Loket {idx + 1}: {counter}")
-
-    st.subheader("Antrian Menunggu")
-    if queue:
-        for ticket in queue:
-            st.write(ticket)
-    else:
-        st.write("Tidak ada antrian.")
+    option = st.radio("Pilih jenis antrian:", list(CATEGORY))
+
+    # One pre-formatted block per refresh instead of a widget per ticket.
+    st.text(bank_system.status_text(CATEGORY[option]))
+
+    number = st.number_input("Cek posisi nomor antrian:", min_value=1, step=1)
+    if st.button("Cek Posisi"):
+        category = CATEGORY[option]
+        ticket_number = bank_system.ticket_number(category, int(number))
+        position = None if ticket_number is None else bank_system.position(category, ticket_number)
+        if position is None:
+            st.warning(f"Nomor {int(number)} tidak sedang menunggu.")
+        else:
+            st.info(f"Nomor {int(number)} berada di urutan ke-{position}.")
 
 elif menu == "Selesaikan Layanan":
     st.header("Selesaikan Layanan")
-    option = st.radio("Pilih jenis antrian:", ["Teller", "Customer Service"])
-
-    if option == "Teller":
-        counters = bank_system.teller_counters
-    else:
-        counters = bank_system.cs_counters
+    option = st.radio("Pilih jenis antrian:", list(CATEGORY))
+    category = CATEGORY[option]
 
     st.subheader("Status Loket")
-    for idx, counter in enumerate(counters):
-        st.write(f"Loket {idx + 1}: {counter if counter else 'Kosong'}")
+    st.text(bank_system.counter_table(category))
 
-    counter_id = st.number_input("Masukkan ID Loket yang ingin diselesaikan:", min_value=1, max_value=len(counters), step=1)
+    counter_id = st.number_input("Masukkan ID Loket yang ingin diselesaikan:", min_value=1,
+                                 max_value=bank_system.counter_count(category), step=1)
     if st.button("Selesaikan Layanan"):
-        if bank_system.finish_service(counters, int(counter_id)):
+        if bank_system.finish(category, int(counter_id)) is not None:
             st.success(f"Layanan di Loket {counter_id} selesai.")
         else:
-            st.error(f"Loket {counter_id} sedang kosong atau ID tidak valid.")
\ No newline at end of file
+            st.error(f"Loket {counter_id} sedang kosong atau ID tidak valid.")
+    if st.button("Tidak Hadir"):
+        ticket = bank_system.skip(category, int(counter_id))
+        if ticket is not None:
+            st.warning(f"Nomor {ticket} tidak hadir di Loket {counter_id} dan dilewati.")
+        else:
+            st.error(f"Loket {counter_id} sedang kosong atau ID tidak valid.")
+    if bank_system.system.no_show is not None and st.button("Nasabah Hadir"):
+        if bank_system.check_in(category, int(counter_id)):
+            st.success(f"Nasabah di Loket {counter_id} sudah hadir.")
+        else:
+            st.info(f"Loket {counter_id} tidak sedang menunggu nasabah.")
+
+elif menu == "Batalkan / Panggil Ulang":
+    st.header("Batalkan / Panggil Ulang")
+    option = st.radio("Pilih jenis antrian:", list(CATEGORY))
+    category = CATEGORY[option]
+
+    number = st.number_input("Nomor antrian:", min_value=1, step=1)
+    ticket_number = bank_system.ticket_number(category, int(number))
+    if st.button("Batalkan Antrian"):
+        ticket = None if ticket_number is None else bank_system.cancel(category, ticket_number)
+        if ticket is not None:
+            st.success(f"Nomor {ticket} dibatalkan.")
+        else:
+            st.error(f"Nomor antrian {int(number)} tidak sedang menunggu.")
+    if st.button("Panggil Ulang"):
+        ticket = None if ticket_number is None else bank_system.recall(category, ticket_number)
+        if ticket is not None:
+            st.success(f"Nomor {ticket} dipanggil ulang.")
+        else:
+            st.error(f"Nomor antrian {int(number)} tidak ada di daftar tidak hadir.")
+
+    skipped = bank_system.skipped(category)
+    st.subheader("Tidak Hadir")
+    st.text(", ".join(skipped) if skipped else "Tidak ada nomor yang dilewati.")
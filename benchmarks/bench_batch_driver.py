@@ -0,0 +1,60 @@
+"""Benchmark the batch driver on a payday command stream.
+
+The command stream is a payday workload (benchmarks/workloads.py) with a
+"status" every STATUS_EVERY commands.
+
+tests/test_batch_driver.py checks that the driver prints what the
+interactive menus print for the same commands.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_batch_driver --commands 1000000
+"""
+import argparse
+import contextlib
+import os
+import sys
+import time
+
+from batch_driver import build_engine, run
+from benchmarks.workloads import generate
+
+STATUS_EVERY = 1000
+
+
+def script(commands, seed=0):
+    """`commands` lines of driver input."""
+    lines = []
+    days = 1
+    while len(lines) < commands:
+        lines = []
+        for index, operation in enumerate(generate("payday", days=days, seed=seed), 1):
+            lines.append(" ".join(map(str, operation)) + "\n")
+            if index % STATUS_EVERY == 0:
+                lines.append(f"status {operation[1]}\n")
+        days *= 2
+    return lines[:commands]
+
+
+def bench(commands):
+    lines = script(commands)
+    for engine in ("bc", "tugas"):
+        _, table, categories = build_engine(engine)
+        with open(os.devnull, "w", buffering=1 << 20) as devnull, contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            rejected = run(lines, table, categories)
+            elapsed = time.perf_counter() - start
+        if rejected:
+            raise SystemExit(f"{engine}: {rejected:,} perintah ditolak")
+        print(f"{engine:<6} {len(lines):>10,} perintah  {elapsed:6.2f} s  "
+              f"{len(lines) / elapsed:>10,.0f} perintah/s", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commands", type=int, default=1_000_000)
+    args = parser.parse_args()
+    bench(args.commands)
+
+
+if __name__ == "__main__":
+    main()
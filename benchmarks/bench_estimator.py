@@ -0,0 +1,110 @@
+"""Benchmark: issue latency with the wait estimator, and estimate accuracy.
+
+Latency: the same issue/finish mix on QueueService with estimates off,
+with the estimator listening, and with issue_with_estimate(). Accuracy:
+a simulated day on simulated time. Every estimate given at issue is
+compared with the wait the ticket actually had.
+
+On a slow single-core VM, CPython 3.11, a plain issue takes 3.4-4.2 us.
+With the estimator listening it takes 3.7-4.4 us: the estimator only
+hears "finish" and "skip". issue_with_estimate() takes about 7.2 us. The
+extra 3 us pays for the estimate itself: the category lock held around
+the issue, the ticket's place in line and predict().
+
+Jalankan dari root repo: python -m benchmarks.bench_estimator
+"""
+import argparse
+import heapq
+import random
+import time
+
+from bc import BankQueueSystem
+from estimator import WaitEstimator
+from queue_service import QueueService
+from simulation import exponential, next_arrival
+
+ARRIVAL = 0
+FINISH = 1
+
+
+def latency(service, issue, requests, seed=0):
+    """Mean ns per issue; a finish follows most issues so the line stays short."""
+    rng = random.Random(seed)
+    counters = service.counter_count("teller")
+    finishes = [rng.randint(1, counters) if rng.random() < 0.97 else None for _ in range(requests)]
+    elapsed = 0
+    for counter_id in finishes:
+        start = time.perf_counter_ns()
+        issue("teller")
+        elapsed += time.perf_counter_ns() - start
+        if counter_id:
+            service.finish("teller", counter_id)
+    return elapsed / requests
+
+
+def accuracy(days, seed=0, rate=55, mean_service=4 * 60, tellers=4):
+    rng = random.Random(seed)
+    sample = exponential(mean_service)
+    errors, inside, count = [], 0, 0
+    for _ in range(days):
+        now = [0]
+        system = BankQueueSystem(num_tellers=tellers)
+        estimator = WaitEstimator(system, clock=lambda: now[0])
+        dispatcher = system.dispatcher
+        line = system.queues["teller"].queue
+        promised = {}
+        calendar = []
+        t = next_arrival(0.0, [rate] * 8, rng)
+        seq = 0
+        while t is not None:
+            calendar.append((t, seq, ARRIVAL, 0))
+            seq += 1
+            t = next_arrival(t, [rate] * 8, rng)
+        heapq.heapify(calendar)
+        while calendar:
+            at, _, kind, counter_id = heapq.heappop(calendar)
+            now[0] = round(at * 1e9)
+            if kind == ARRIVAL:
+                ticket, assignments = dispatcher.arrive("teller")
+                ticket.arrived_ns = now[0]
+                if not assignments:
+                    promised[ticket.number] = estimator.predict("teller", line.ahead(ticket.number))
+            else:
+                _, assignments = dispatcher.finish("teller", counter_id)
+            for assigned_id, ticket in assignments:
+                estimate = promised.pop(ticket.number, None)
+                if estimate is not None:
+                    actual = at - ticket.arrived_ns / 1e9
+                    errors.append(abs(actual - estimate.mean))
+                    inside += estimate.low <= actual <= estimate.high
+                    count += 1
+                heapq.heappush(calendar, (at + sample(rng), seq, FINISH, assigned_id))
+                seq += 1
+    return sum(errors) / len(errors), inside / count, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--days", type=int, default=20)
+    args = parser.parse_args()
+
+    plain = QueueService(estimate_waits=False)
+    listening = QueueService()
+    estimating = QueueService()
+    rows = [
+        ("tanpa estimator", latency(plain, plain.issue, args.requests)),
+        ("estimator aktif, issue()", latency(listening, listening.issue, args.requests)),
+        ("issue_with_estimate()", latency(estimating, estimating.issue_with_estimate, args.requests)),
+    ]
+    for label, ns in rows:
+        print(f"{label:<28} {ns:>8,.0f} ns/tiket")
+
+    mae, coverage, count = accuracy(args.days)
+    print(f"\nAkurasi ({args.days} hari, {count:,} tiket menunggu): "
+          f"galat absolut rata-rata {mae / 60:.1f} menit, "
+          f"{coverage:.0%} tunggu aktual di dalam rentang")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark: journal write overhead and recovery time.
+
+Jalankan dari root repo: python -m benchmarks.bench_journal --events 1000000
+"""
+import argparse
+import random
+import shutil
+import tempfile
+import time
+
+from bc import BankQueueSystem
+from journal import Journal
+
+
+def workload(system, events, seed=0):
+    """Drive `events` dispatcher events (enqueue/assign/finish) into system."""
+    rng = random.Random(seed)
+    dispatcher = system.dispatcher
+    produced = 0
+    while produced < events:
+        category = "teller" if rng.random() < 0.75 else "cs"
+        _, assignments = dispatcher.arrive(category)
+        produced += 1 + len(assignments)
+        counter = system.get_counter(category)
+        if rng.random() < 0.49:
+            ticket, assignments = dispatcher.finish(category, rng.randint(1, len(counter.counters)))
+            if ticket is not None:
+                produced += 1 + len(assignments)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--snapshot-every", type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="bench-journal-")
+    try:
+        plain = BankQueueSystem()
+        start = time.perf_counter()
+        workload(plain, args.events)
+        baseline = time.perf_counter() - start
+
+        system = BankQueueSystem()
+        journal = Journal(directory, snapshot_every=args.snapshot_every)
+        journal.attach(system)
+        start = time.perf_counter()
+        workload(system, args.events)
+        journal.close()
+        journaled = time.perf_counter() - start
+        written = journal.seq
+        print(f"Tanpa jurnal:  {baseline:.2f} detik")
+        print(f"Dengan jurnal: {journaled:.2f} detik "
+              f"(+{(journaled - baseline) / written * 1e9:.0f} ns/event, {written:,} event)")
+
+        restored = BankQueueSystem()
+        start = time.perf_counter()
+        recovered = Journal(directory).recover(restored)
+        elapsed = time.perf_counter() - start
+        if restored.snapshot_state() != system.snapshot_state():
+            raise SystemExit("keadaan hasil pemulihan berbeda dari sistem asal")
+        print(f"Pemulihan: {recovered:,} event dalam {elapsed:.3f} detik")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
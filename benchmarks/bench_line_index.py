@@ -0,0 +1,49 @@
+"""Benchmark position-in-line queries against a full scan.
+
+tests/test_line_index.py checks the positions against the line order.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_line_index
+"""
+import argparse
+import random
+import time
+
+from ticket_queue import Ticket, TicketLine
+
+
+def bench(sizes, queries):
+    rng = random.Random(0)
+    print(f"{'tiket menunggu':>15} {'scan (us)':>12} {'indeks (us)':>12}")
+    for size in sizes:
+        line = TicketLine()
+        for number in range(1, size + 1):
+            line.enqueue(Ticket("A", number))
+        # Some customers leave, so the index has holes to count.
+        for number in rng.sample(range(size // 2, size + 1), size // 10):
+            line.index.discard(number)
+        targets = [rng.randrange(size // 2, size) for _ in range(queries)]
+
+        scan_queries = max(1, queries * 1000 // size)
+        start = time.perf_counter()
+        for number in targets[:scan_queries]:
+            next(i for i, t in enumerate(line) if t.number == number)
+        scan = (time.perf_counter() - start) / scan_queries * 1e6
+
+        start = time.perf_counter()
+        for number in targets:
+            line.position(number)
+        indexed = (time.perf_counter() - start) / queries * 1e6
+        print(f"{size:>15,} {scan:>12,.1f} {indexed:>12,.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=20_000)
+    args = parser.parse_args()
+    bench(args.sizes, args.queries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Benchmark: per-event cost of QueueMetrics and the size of its sketches.
+
+The hot path is what a request pays: the dispatcher listener. It is timed
+directly, because end-to-end workload timings on a busy machine are
+noisier than the listener itself. The end-to-end runs keep the whole
+backlog pending (no drain while timing). They run with the garbage
+collector off, because otherwise GC passes over that unrealistically
+large backlog dominate. Draining into the histograms happens on the
+background thread and is timed separately.
+
+Jalankan dari root repo: python -m benchmarks.bench_metrics --events 500000
+"""
+import argparse
+import gc
+import random
+import time
+import timeit
+
+from bc import BankQueueSystem
+from metrics import QueueMetrics
+from ticket_queue import Ticket
+
+
+def workload(system, operations, seed=0):
+    """Issue/finish mix; returns (seconds, dispatcher events emitted)."""
+    rng = random.Random(seed)
+    dispatcher = system.dispatcher
+    plan = [("teller" if rng.random() < 0.75 else "cs", rng.random() < 0.5, rng.randint(1, 3))
+            for _ in range(operations)]
+    events = 0
+    start = time.perf_counter()
+    for category, issue, counter_id in plan:
+        if issue:
+            _, assignments = dispatcher.arrive(category)
+            events += 1 + len(assignments)
+        else:
+            ticket, assignments = dispatcher.finish(category, counter_id)
+            if ticket is not None:
+                events += 1 + len(assignments)
+    return time.perf_counter() - start, events
+
+
+def listener_cost(rounds=1_000_000):
+    """ns per event spent in the metrics listener, minus an empty call."""
+    metrics = QueueMetrics(BankQueueSystem(), interval=3600)
+    ticket = Ticket("A", 1)
+    on_event = metrics._on_event
+
+    def empty(event, category, ticket, counter_id):
+        pass
+
+    timed = min(timeit.repeat(lambda: on_event("assign", "teller", ticket, 1), number=rounds, repeat=5))
+    floor = min(timeit.repeat(lambda: empty("assign", "teller", ticket, 1), number=rounds, repeat=5))
+    metrics.close()
+    return (timed - floor) / rounds * 1e9, timed / rounds * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=500_000, help="jumlah operasi")
+    args = parser.parse_args()
+
+    gc.disable()
+    baseline, events = min(workload(BankQueueSystem(), args.events) for _ in range(3))
+
+    runs = []
+    for _ in range(3):
+        system = BankQueueSystem()
+        # No periodic drain while timing: measure the listener alone.
+        metrics = QueueMetrics(system, interval=3600)
+        elapsed, _ = workload(system, args.events)
+        start = time.perf_counter()
+        metrics.drain()
+        drain = time.perf_counter() - start
+        runs.append((elapsed, drain, metrics))
+    elapsed, drain, metrics = min(runs, key=lambda run: run[0])
+    gc.enable()
+
+    print(f"{events:,} event dispatcher")
+    print(f"Tanpa metrik: {baseline / events * 1e9:,.0f} ns/event")
+    print(f"Dengan metrik: {elapsed / events * 1e9:,.0f} ns/event "
+          f"(jalur request +{(elapsed - baseline) / events * 1e9:,.0f} ns/event)")
+    extra, total = listener_cost()
+    print(f"Listener metrik: {total:,.0f} ns/event termasuk panggilan, "
+          f"{extra:,.0f} ns/event di atas listener kosong")
+    print(f"Drain ke histogram (thread latar): {drain / events * 1e9:,.0f} ns/event")
+    buckets = max(len(h.buckets) for h in list(metrics.wait.values()) + list(metrics.counter_service.values()))
+    print(f"Bucket terbanyak per seri: {buckets} (dibatasi rentang nilai, bukan jumlah tiket)")
+    print()
+    print("\n".join(line for line in metrics.prometheus().splitlines()
+                    if 'category="teller"' in line and "counter=" not in line))
+    for _, _, m in runs:
+        m.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Benchmark ticket numbering: issuing and showing a ticket.
+
+Display numbers and the daily rollover are checked in
+tests/test_numbering.py.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_numbering
+"""
+import argparse
+import time
+
+from bc import BankQueueSystem
+
+
+def bench(sizes, issues):
+    print(f"{'tiket menunggu':>15} {'ambil nomor (ns)':>17} {'str(tiket) (ns)':>16}")
+    for size in sizes:
+        system = BankQueueSystem(num_tellers=1, num_cs=1)
+        queue = system.queues["teller"]
+        for _ in range(size):
+            queue.generate_ticket()
+        system.rollover("hari-2")
+        start = time.perf_counter()
+        tickets = [queue.generate_ticket() for _ in range(issues)]
+        issue = (time.perf_counter() - start) / issues * 1e9
+        start = time.perf_counter()
+        for ticket in tickets:
+            str(ticket)
+        shown = (time.perf_counter() - start) / issues * 1e9
+        print(f"{size:>15,} {issue:>17,.0f} {shown:>16,.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 10_000, 1_000_000])
+    parser.add_argument("--issues", type=int, default=200_000)
+    args = parser.parse_args()
+    bench(args.sizes, args.issues)
+
+
+if __name__ == "__main__":
+    main()
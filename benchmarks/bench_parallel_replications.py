@@ -0,0 +1,40 @@
+"""Benchmark: speedup of replication_runner at 1, 2, 4 and 8 workers.
+
+Jalankan dari root repo: python -m benchmarks.bench_parallel_replications
+"""
+import argparse
+import os
+import time
+
+from replication_runner import run_replications
+from simulation import exponential
+
+WORKERS = (1, 2, 4, 8)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--replications", type=int, default=64)
+    parser.add_argument("--teller-rate", type=float, default=400, help="nasabah per jam")
+    args = parser.parse_args()
+
+    kwargs = dict(
+        arrival_rates={"teller": args.teller_rate, "cs": args.teller_rate / 3},
+        service_times={"teller": exponential(240), "cs": exponential(600)},
+        num_tellers=max(1, int(args.teller_rate * 4 / 60 / 0.85)),
+        num_cs=max(1, int(args.teller_rate / 3 * 10 / 60 / 0.85)),
+    )
+    print(f"CPU tersedia: {os.cpu_count()}, replikasi: {args.replications}")
+    print(f"{'workers':>8}  {'detik':>8}  {'speedup':>8}  {'p95 teller (menit)':>18}")
+    baseline = None
+    for workers in WORKERS:
+        start = time.perf_counter()
+        summary = run_replications(args.replications, workers=workers, seed=1, **kwargs)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        p95 = summary.waits["teller"].quantile(0.95) / 60
+        print(f"{workers:>8}  {elapsed:>8.2f}  {baseline / elapsed:>7.2f}x  {p95:>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Benchmark: concurrent issue/status throughput of the shared QueueService.
+
+Simulates many UI sessions (threads) issuing tickets and polling status.
+
+Jalankan dari root repo: python -m benchmarks.bench_queue_service --sessions 32
+"""
+import argparse
+import threading
+import time
+
+from queue_service import QueueService
+
+
+def session(service, requests, status_ratio, issued):
+    mine = []
+    for i in range(requests):
+        category = "cs" if i // status_ratio % 4 == 0 else "teller"
+        if i % status_ratio == 0:
+            mine.append(service.issue(category))
+        else:
+            service.status(category)
+    issued.extend(mine)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=5_000, help="per sesi")
+    parser.add_argument("--status-ratio", type=int, default=2,
+                        help="1 dari N request adalah ambil tiket, sisanya lihat status")
+    args = parser.parse_args()
+
+    service = QueueService()
+    # Keep the waiting line short and realistic: tellers finish continuously.
+    issued = []
+    threads = [threading.Thread(target=session, args=(service, args.requests, args.status_ratio, issued))
+               for _ in range(args.sessions)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    total = args.sessions * args.requests
+    for category in ("teller", "cs"):
+        numbers = sorted(t.number for t in issued if t.category == ("A" if category == "teller" else "B"))
+        if numbers != list(range(1, len(numbers) + 1)):
+            raise SystemExit(f"nomor {category} ganda/loncat")
+    print(f"{args.sessions} sesi, {total:,} request dalam {elapsed:.2f} detik "
+          f"({total / elapsed:,.0f} request/detik), {len(issued):,} tiket unik")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Benchmark PriorityScheduler dispatch cost.
+
+The ordering rules are checked in tests/test_scheduler.py.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_scheduler
+"""
+import argparse
+import random
+import time
+
+from scheduler import SECOND, PriorityScheduler
+from ticket_queue import Ticket
+
+LANES = ["normal"] * 85 + ["elderly"] * 7 + ["disabled"] * 3 + ["vip"] * 5
+
+
+def bench(sizes, rounds):
+    rng = random.Random(0)
+    print(f"{'tiket menunggu':>15} {'ns/dispatch':>12}")
+    for size in sizes:
+        line = PriorityScheduler()
+        number = 0
+        for _ in range(size):
+            number += 1
+            line.enqueue(Ticket("A", number, arrived_ns=number * SECOND), lane=rng.choice(LANES))
+        # Steady state: one ticket in, one ticket out, line length constant.
+        arrivals = [(rng.choice(LANES), (size + i) * SECOND) for i in range(rounds)]
+        start = time.perf_counter()
+        for lane, arrived in arrivals:
+            number += 1
+            line.enqueue(Ticket("A", number, arrived_ns=arrived), lane=lane)
+            line.dequeue()
+        elapsed = time.perf_counter() - start
+        print(f"{size:>15,} {elapsed / rounds * 1e9:>12,.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=100_000)
+    args = parser.parse_args()
+    bench((1_000, 10_000, 100_000, 1_000_000), args.rounds)
+
+
+if __name__ == "__main__":
+    main()
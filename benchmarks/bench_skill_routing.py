@@ -0,0 +1,130 @@
+"""Benchmark: waits with skill-based counter sharing vs the strict split.
+
+Each simulated day is generated once (arrival times and service times per
+customer). The same day is then replayed through the strict per-category
+BankQueueSystem and through a BankQueueSystem with SkillRouting for each
+policy, so every engine serves exactly the same customers.
+
+Jalankan dari root repo: python -m benchmarks.bench_skill_routing --days 50
+"""
+import argparse
+import heapq
+import random
+
+from bc import BankQueueSystem
+from categories import default_categories
+from simulation import exponential, next_arrival, percentile
+from skill_routing import LONGEST_WAIT, WEIGHTED_FAIR, SkillRouting
+
+ARRIVAL = 0
+FINISH = 1
+
+# Lunchtime rush at the teller line; CS load is flat.
+TELLER_RATES = [40, 50, 70, 95, 80, 50, 40, 30]
+CS_RATES = [15] * 8
+SERVICE = {"teller": exponential(4 * 60), "cs": exponential(10 * 60)}
+PREFIX = {c.prefix: c.key for c in default_categories()}
+
+# Same seven counters as the strict split (4 teller, 3 CS), but two CS
+# counters and one teller counter are cross-trained.
+SKILLS = [("teller",), ("teller",), ("teller",), ("teller", "cs"),
+          ("cs", "teller"), ("cs", "teller"), ("cs",)]
+
+
+def generate_day(rng):
+    customers = []
+    for category, rates in (("teller", TELLER_RATES), ("cs", CS_RATES)):
+        t = next_arrival(0.0, rates, rng)
+        while t is not None:
+            customers.append((t, category, SERVICE[category](rng)))
+            t = next_arrival(t, rates, rng)
+    customers.sort()
+    return customers
+
+
+def replay_day(customers, arrive, finish):
+    """Feed one day to an engine; returns waits per category."""
+    calendar = [(t, i, ARRIVAL, i) for i, (t, _, _) in enumerate(customers)]
+    heapq.heapify(calendar)
+    seq = len(calendar)
+    service_of = {}
+    waits = {"teller": [], "cs": []}
+    while calendar:
+        now, _, kind, payload = heapq.heappop(calendar)
+        if kind == ARRIVAL:
+            t, category, service = customers[payload]
+            ticket, assignments = arrive(category)
+            ticket.arrived_ns = round(t * 1e9)
+            service_of[ticket.category, ticket.number] = service
+        else:
+            _, assignments = finish(payload)
+        for counter_key, ticket in assignments:
+            waits[PREFIX[ticket.category]].append(now - ticket.arrived_ns / 1e9)
+            service = service_of.pop((ticket.category, ticket.number))
+            heapq.heappush(calendar, (now + service, seq, FINISH, counter_key))
+            seq += 1
+    return waits
+
+
+def through(system, customers):
+    dispatcher = system.dispatcher
+
+    # A counter is finished in the category of the ticket it serves, which
+    # with shared counters need not be the category that arrived.
+    def arrive(category):
+        ticket, assignments = dispatcher.arrive(category)
+        return ticket, [((PREFIX[t.category], c), t) for c, t in assignments]
+
+    def finish(key):
+        category, counter_id = key
+        ticket, assignments = dispatcher.finish(category, counter_id)
+        return ticket, [((PREFIX[t.category], c), t) for c, t in assignments]
+
+    return replay_day(customers, arrive, finish)
+
+
+def strict(customers):
+    return through(BankQueueSystem(), customers)
+
+
+def routed(policy, weights=None):
+    def run(customers):
+        categories = default_categories()
+        routing = SkillRouting(categories, SKILLS, policy=policy, weights=weights)
+        return through(BankQueueSystem(categories=categories, routing=routing), customers)
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    engines = {
+        "strict split": strict,
+        "longest wait": routed(LONGEST_WAIT),
+        "weighted 3:1": routed(WEIGHTED_FAIR, {"teller": 3, "cs": 1}),
+    }
+    totals = {name: {"teller": [], "cs": []} for name in engines}
+    rng = random.Random(args.seed)
+    for _ in range(args.days):
+        customers = generate_day(rng)
+        for name, engine in engines.items():
+            for category, waits in engine(customers).items():
+                totals[name][category].extend(waits)
+
+    print(f"{args.days} hari, tunggu dalam menit")
+    print(f"{'mesin':<14} {'kategori':<8} {'rata-rata':>10} {'p95':>8} {'semua rata2':>12} {'semua p95':>10}")
+    for name, waits in totals.items():
+        everyone = sorted(waits["teller"] + waits["cs"])
+        overall = sum(everyone) / len(everyone) / 60
+        for category in ("teller", "cs"):
+            values = sorted(waits[category])
+            mean = sum(values) / len(values) / 60
+            print(f"{name:<14} {category:<8} {mean:>10.1f} {percentile(values, 95) / 60:>8.1f} "
+                  f"{overall:>12.1f} {percentile(everyone, 95) / 60:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
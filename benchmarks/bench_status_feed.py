@@ -0,0 +1,84 @@
+"""Benchmark: status feed fan-out to thousands of subscribers.
+
+Part of the subscribers consume slowly; the benchmark checks that their
+buffers stay bounded (backlog coalesced into snapshots) while fast
+subscribers see every diff.
+
+Jalankan dari root repo: python -m benchmarks.bench_status_feed --subscribers 5000
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from bc import BankQueueSystem
+from status_feed import StatusFeed
+
+
+async def consume(subscription, received, delay):
+    async for message in subscription:
+        received.append(message["type"])
+        if delay:
+            await asyncio.sleep(delay)
+
+
+async def run(subscribers, events, slow_fraction, buffer_size):
+    system = BankQueueSystem()
+    feed = StatusFeed(system, buffer_size=buffer_size)
+    subscriptions, received, tasks = [], [], []
+    for i in range(subscribers):
+        slow = i < subscribers * slow_fraction
+        subscription = feed.subscribe()
+        log = []
+        subscriptions.append((slow, subscription))
+        received.append(log)
+        tasks.append(asyncio.create_task(consume(subscription, log, 0.01 if slow else 0)))
+    await asyncio.sleep(0)
+
+    rng = random.Random(0)
+    dispatcher = system.dispatcher
+    published = 0
+    peak = 0
+    start = time.perf_counter()
+    for i in range(events):
+        category = "teller" if rng.random() < 0.75 else "cs"
+        _, assignments = dispatcher.arrive(category)
+        published += 1 + len(assignments)
+        if rng.random() < 0.5:
+            counters = len(system.get_counter(category).counters)
+            ticket, assignments = dispatcher.finish(category, rng.randint(1, counters))
+            if ticket is not None:
+                published += 1 + len(assignments)
+        if i % 100 == 0:
+            peak = max(peak, max(len(s.buffer) for _, s in subscriptions))
+            await asyncio.sleep(0)   # let consumers run, as a real server would
+    elapsed = time.perf_counter() - start
+    await asyncio.sleep(0.05)
+
+    fast_diffs = min(log.count("diff") for (slow, _), log in zip(subscriptions, received) if not slow)
+    coalesced = sum(s.coalesced for slow, s in subscriptions if slow)
+    for task in tasks:
+        task.cancel()
+
+    deliveries = published * subscribers
+    print(f"{subscribers:,} subscriber, {published:,} diff, {deliveries:,} pengiriman "
+          f"dalam {elapsed:.2f} detik ({deliveries / elapsed:,.0f} pengiriman/detik)")
+    print(f"Buffer terbesar: {peak} (batas {buffer_size}); "
+          f"subscriber cepat menerima >= {fast_diffs:,} diff; "
+          f"backlog subscriber lambat digabung {coalesced:,} kali")
+    if peak > buffer_size:
+        raise SystemExit(f"buffer {peak} melewati batas {buffer_size}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subscribers", type=int, default=5_000)
+    parser.add_argument("--events", type=int, default=2_000)
+    parser.add_argument("--slow-fraction", type=float, default=0.2)
+    parser.add_argument("--buffer", type=int, default=256)
+    args = parser.parse_args()
+    asyncio.run(run(args.subscribers, args.events, args.slow_fraction, args.buffer))
+
+
+if __name__ == "__main__":
+    main()
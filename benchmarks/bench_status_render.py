@@ -0,0 +1,61 @@
+"""Benchmark status rendering against the old tabulate + full-list output.
+
+tests/test_status_render.py checks that CounterTable renders what
+tabulate rendered.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_status_render
+"""
+import argparse
+import time
+
+from tabulate import tabulate
+
+from bc import BankQueueSystem
+from status_view import status_block
+
+
+def legacy_block(counter, line):
+    """What ServiceCounter.display_status printed before the render cache."""
+    table = [[f"Loket {idx + 1}", str(t) if t else "Kosong"] for idx, t in enumerate(counter.counters)]
+    lines = [tabulate(table, headers=[f"{counter.counter_type} Counter", "Nomor Antrian"]),
+             "", "Antrian Menunggu:"]
+    if line:
+        lines.extend(str(ticket) for ticket in line)
+    else:
+        lines.append("Tidak ada antrian.")
+    return "\n".join(lines)
+
+
+def bench(sizes, refreshes):
+    print(f"{'tiket menunggu':>15} {'lama (us)':>12} {'cache (us)':>12}")
+    for size in sizes:
+        system = BankQueueSystem()
+        for _ in range(size + 4):
+            system.dispatcher.arrive("teller")
+        queue = system.queues["teller"].queue
+        counter = system.get_counter("teller")
+        timings = []
+        for render in (lambda: legacy_block(counter, queue),
+                       lambda: status_block(counter.table, counter.counters, queue)):
+            # A finish and an arrival between refreshes, as on a busy floor.
+            rounds = max(3, refreshes // max(1, size // 100))
+            start = time.perf_counter()
+            for i in range(rounds):
+                system.dispatcher.finish("teller", i % 4 + 1)
+                system.dispatcher.arrive("teller")
+                render()
+            timings.append((time.perf_counter() - start) / rounds * 1e6)
+        print(f"{size:>15,} {timings[0]:>12,.1f} {timings[1]:>12,.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1_000, 10_000, 100_000])
+    parser.add_argument("--refreshes", type=int, default=2_000)
+    args = parser.parse_args()
+    bench(args.sizes, args.refreshes)
+
+
+if __name__ == "__main__":
+    main()
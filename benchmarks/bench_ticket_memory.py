@@ -0,0 +1,75 @@
+"""Memory benchmark: bytes per waiting customer, old vs. compact records.
+
+Jalankan dari root repo: python -m benchmarks.bench_ticket_memory
+"""
+import argparse
+import gc
+import tracemalloc
+import uuid
+from datetime import datetime
+
+from ticket_queue import Ticket, TicketQueue
+from tugas import Nasabah
+
+
+class NasabahLama:
+    """Nasabah as it was before: uuid string, datetime and a __dict__."""
+
+    def __init__(self, nama, nomor_antrian):
+        self.id = str(uuid.uuid4())
+        self.nama = nama
+        self.nomor_antrian = nomor_antrian
+        self.waktu_kedatangan = datetime.now()
+
+
+def measure(build, count):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    line = build(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del line
+    return (after - before) / count
+
+
+def string_tickets(count):
+    queue = TicketQueue()
+    for i in range(1, count + 1):
+        queue.enqueue(f"A {i:03}")
+    return queue
+
+
+def compact_tickets(count):
+    queue = TicketQueue()
+    for i in range(1, count + 1):
+        queue.enqueue(Ticket("A", i))
+    return queue
+
+
+def nasabah_lama(count):
+    return [NasabahLama("Budi", i) for i in range(1, count + 1)]
+
+
+def nasabah_baru(count):
+    return [Nasabah("Budi", i) for i in range(1, count + 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rows = [
+        ("bc.py ticket (str, tanpa waktu)", string_tickets),
+        ("bc.py ticket (Ticket + ns)", compact_tickets),
+        ("tugas.py Nasabah (lama)", nasabah_lama),
+        ("tugas.py Nasabah (__slots__)", nasabah_baru),
+    ]
+    print(f"{'record':<30}  {'bytes/nasabah':>14}  (n={args.count:,})")
+    for name, build in rows:
+        print(f"{name:<30}  {measure(build, args.count):>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Micro-benchmark: per-operation cost of TicketQueue vs. waiting-line length.
+
+Jalankan dari root repo: python -m benchmarks.bench_ticket_queue
+"""
+import argparse
+import time
+
+from ticket_queue import TicketQueue
+
+SIZES = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+
+
+def bench_steady_state(size, ops):
+    """Enqueue+dequeue pairs on a line kept at `size` tickets; ns per pair."""
+    queue = TicketQueue()
+    for i in range(size):
+        queue.enqueue(i)
+    enqueue, dequeue = queue.enqueue, queue.dequeue
+    start = time.perf_counter_ns()
+    for i in range(ops):
+        enqueue(i)
+        dequeue()
+    elapsed = time.perf_counter_ns() - start
+    return elapsed / ops
+
+
+def bench_list_pop0(size, ops):
+    """The old list + pop(0) line, for comparison."""
+    queue = list(range(size))
+    start = time.perf_counter_ns()
+    for i in range(ops):
+        queue.append(i)
+        queue.pop(0)
+    elapsed = time.perf_counter_ns() - start
+    return elapsed / ops
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=200_000)
+    parser.add_argument("--compare-list", action="store_true",
+                        help="juga ukur list.pop(0) (lambat untuk antrian besar)")
+    args = parser.parse_args()
+
+    header = f"{'antrian':>10}  {'TicketQueue ns/op':>18}"
+    if args.compare_list:
+        header += f"  {'list.pop(0) ns/op':>18}"
+    print(header)
+    for size in SIZES:
+        row = f"{size:>10}  {bench_steady_state(size, args.ops):>18.1f}"
+        if args.compare_list:
+            list_ops = max(100, args.ops * 1000 // max(size, 1000))
+            row += f"  {bench_list_pop0(size, list_ops):>18.1f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Stress test: issue, assign and finish from many threads at once.
+
+Checks that ticket numbers stay unique and gap-free per category, that every
+issued ticket is finished exactly once, and reports throughput. Exits with
+status 1 when an invariant is broken.
+
+Jalankan dari root repo: python -m benchmarks.stress_concurrency --threads 16
+"""
+import argparse
+import contextlib
+import os
+import random
+import sys
+import threading
+import time
+
+from queue_service import QueueService
+from tugas import SistemAntrianBank
+
+CATEGORIES = ("teller", "cs")
+
+
+def run_threads(threads, target):
+    """Run target(seed) on `threads` threads; returns (seconds, exceptions)."""
+    crashes = []
+
+    def guarded(seed):
+        try:
+            target(seed)
+        except Exception as e:
+            crashes.append(f"thread {seed}: {e!r}")
+
+    workers = [threading.Thread(target=guarded, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start, crashes
+
+
+def check_numbers(name, category, issued, finished):
+    errors = []
+    if sorted(issued) != list(range(1, len(issued) + 1)):
+        errors.append(f"{name}/{category}: nomor tiket ganda atau loncat")
+    if len(finished) != len(set(finished)):
+        errors.append(f"{name}/{category}: tiket selesai lebih dari sekali")
+    if sorted(finished) != sorted(issued):
+        errors.append(f"{name}/{category}: tiket yang selesai != tiket yang diterbitkan")
+    return errors
+
+
+def stress_service(threads, ops):
+    service = QueueService()
+    issued = {c: [] for c in CATEGORIES}
+    finished = {c: [] for c in CATEGORIES}
+
+    def worker(seed):
+        rng = random.Random(seed)
+        mine_issued = {c: [] for c in CATEGORIES}
+        mine_finished = {c: [] for c in CATEGORIES}
+        for _ in range(ops):
+            category = rng.choice(CATEGORIES)
+            if rng.random() < 0.5:
+                mine_issued[category].append(service.issue(category).number)
+            else:
+                ticket = service.finish(category, rng.randint(1, service.counter_count(category)))
+                if ticket is not None:
+                    mine_finished[category].append(ticket.number)
+        for c in CATEGORIES:
+            issued[c].extend(mine_issued[c])
+            finished[c].extend(mine_finished[c])
+
+    elapsed, errors = run_threads(threads, worker)
+
+    # Drain what is still waiting or being served.
+    for category in CATEGORIES:
+        while True:
+            done = [service.finish(category, i + 1) for i in range(service.counter_count(category))]
+            done = [t.number for t in done if t is not None]
+            if not done:
+                break
+            finished[category].extend(done)
+
+    for category in CATEGORIES:
+        errors += check_numbers("BankQueueSystem", category, issued[category], finished[category])
+    return threads * ops / elapsed, errors
+
+
+def stress_tugas(threads, ops):
+    sistem = SistemAntrianBank()
+    issued = {c: [] for c in CATEGORIES}
+    finished = {c: [] for c in CATEGORIES}
+    jumlah_loket = {c: len(sistem.layanan[c].loket) for c in CATEGORIES}
+
+    def worker(seed):
+        rng = random.Random(seed)
+        for _ in range(ops):
+            category = rng.choice(CATEGORIES)
+            if rng.random() < 0.5:
+                issued[category].append(sistem.tambah_nasabah(f"n{seed}", category))
+            else:
+                nasabah = sistem.selesaikan_layanan(category, rng.randint(1, jumlah_loket[category]))
+                if nasabah is not None:
+                    finished[category].append(nasabah.nomor_antrian)
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        elapsed, errors = run_threads(threads, worker)
+        for category in CATEGORIES:
+            while True:
+                done = [sistem.selesaikan_layanan(category, i + 1) for i in range(jumlah_loket[category])]
+                done = [n.nomor_antrian for n in done if n is not None]
+                if not done:
+                    break
+                finished[category].extend(done)
+
+    for category in CATEGORIES:
+        errors += check_numbers("SistemAntrianBank", category, issued[category], finished[category])
+    return threads * ops / elapsed, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--ops", type=int, default=20_000, help="operasi per thread")
+    parser.add_argument("--switch-interval", type=float, default=1e-6,
+                        help="sys.setswitchinterval; kecil = lebih banyak pergantian thread")
+    args = parser.parse_args()
+
+    sys.setswitchinterval(args.switch_interval)
+    failures = []
+    for name, stress in (("BankQueueSystem", stress_service), ("SistemAntrianBank", stress_tugas)):
+        throughput, errors = stress(args.threads, args.ops)
+        status = "OK" if not errors else "GAGAL"
+        print(f"{name:<18} {args.threads} thread: {throughput:>10,.0f} operasi/detik  {status}")
+        failures += errors
+
+    for error in failures:
+        print(error)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
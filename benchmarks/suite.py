@@ -0,0 +1,183 @@
+"""Reproducible benchmark suite: every engine x every workload, saved as JSON.
+
+Engines are driven headlessly through the calls their UIs make:
+
+* tugas:   SistemAntrianBank.tambah_nasabah / selesaikan_layanan (console
+           output goes to a null writer);
+* bc:      BankQueueSystem's DispatchEngine.arrive / finish;
+* service: QueueService.issue / finish, the engine behind bc_ui.py.
+
+Each (engine, workload) pair runs in a fresh process, so peak RSS belongs to
+that pair alone. The workload is generated inside the process, before the
+clock starts. Latency is measured per operation with perf_counter_ns into a
+LogHistogram. Each case runs `--repeat` times and the fastest run is kept,
+which filters out most scheduler noise.
+
+Jalankan dari root repo:
+    python -m benchmarks.suite run --out hasil.json
+    python -m benchmarks.suite compare lama.json baru.json --threshold 0.10
+"""
+import argparse
+import contextlib
+import json
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.workloads import WORKLOADS, generate
+from sketch import LogHistogram
+
+ENGINES = ("tugas", "bc", "service")
+
+
+class _NullWriter:
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def _engine(name):
+    """(issue(category), finish(category, counter_id)) for an engine."""
+    if name == "tugas":
+        from tugas import SistemAntrianBank
+        sistem = SistemAntrianBank()
+        return (lambda category: sistem.tambah_nasabah("nasabah", category),
+                sistem.selesaikan_layanan)
+    if name == "bc":
+        from bc import BankQueueSystem
+        dispatcher = BankQueueSystem().dispatcher
+        return dispatcher.arrive, dispatcher.finish
+    if name == "service":
+        from queue_service import QueueService
+        service = QueueService()
+        return service.issue, service.finish
+    raise ValueError(f"Mesin tidak dikenal: {name!r}")
+
+
+def run_case(engine, workload, days, seed):
+    """Runs in a worker process; returns one result row."""
+    operations = generate(workload, days=days, seed=seed)
+    issue, finish = _engine(engine)
+    latency = LogHistogram()
+    record = latency.record
+    clock = time.perf_counter_ns
+
+    with contextlib.redirect_stdout(_NullWriter()):
+        start = time.perf_counter()
+        for operation in operations:
+            began = clock()
+            if operation[0] == "issue":
+                issue(operation[1])
+            else:
+                finish(operation[1], operation[2])
+            record((clock() - began) / 1e3)
+        elapsed = time.perf_counter() - start
+
+    return {
+        "engine": engine,
+        "workload": workload,
+        "operations": len(operations),
+        "ops_per_sec": len(operations) / elapsed,
+        "p50_us": latency.quantile(0.5),
+        "p90_us": latency.quantile(0.9),
+        "p99_us": latency.quantile(0.99),
+        "max_us": latency.max,
+        # ru_maxrss is KiB on Linux, bytes on macOS.
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                       / (1024 * 1024 if sys.platform == "darwin" else 1024),
+    }
+
+
+def run(engines, workloads, days, seed, repeat=3):
+    results = []
+    for workload in workloads:
+        for engine in engines:
+            runs = []
+            for _ in range(repeat):
+                # One process per run: peak RSS is not shared between cases.
+                with ProcessPoolExecutor(max_workers=1) as pool:
+                    runs.append(pool.submit(run_case, engine, workload, days, seed).result())
+            row = max(runs, key=lambda r: r["ops_per_sec"])
+            print(f"{engine:<8} {workload:<10} {row['operations']:>9,} op "
+                  f"{row['ops_per_sec']:>10,.0f} op/s  p50={row['p50_us']:.1f}us "
+                  f"p99={row['p99_us']:.1f}us  RSS={row['peak_rss_mb']:.1f} MB")
+            results.append(row)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "days": days,
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+# metric -> True if higher is better
+METRICS = {"ops_per_sec": True, "p50_us": False, "p99_us": False, "peak_rss_mb": False}
+
+
+def compare(old, new, threshold):
+    """Print a comparison; returns the list of regressions."""
+    before = {(r["engine"], r["workload"]): r for r in old["results"]}
+    regressions = []
+    print(f"{'mesin':<8} {'workload':<10} " + " ".join(f"{m:>14}" for m in METRICS))
+    for row in new["results"]:
+        key = (row["engine"], row["workload"])
+        if key not in before:
+            continue
+        cells = []
+        for metric, higher_is_better in METRICS.items():
+            change = row[metric] / before[key][metric] - 1 if before[key][metric] else 0.0
+            worse = -change if higher_is_better else change
+            flag = " !" if worse > threshold else "  "
+            if worse > threshold:
+                regressions.append((key, metric, change))
+            cells.append(f"{change:>+12.1%}{flag}")
+        print(f"{key[0]:<8} {key[1]:<10} " + " ".join(cells))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="jalankan suite dan simpan JSON")
+    run_parser.add_argument("--out", default="benchmark-results.json")
+    run_parser.add_argument("--engines", nargs="+", choices=ENGINES, default=list(ENGINES))
+    run_parser.add_argument("--workloads", nargs="+", choices=WORKLOADS, default=list(WORKLOADS))
+    run_parser.add_argument("--days", type=int, default=50, help="hari simulasi per workload")
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--repeat", type=int, default=3, help="ulangi tiap kasus, ambil yang tercepat")
+    compare_parser = commands.add_parser("compare", help="bandingkan dua hasil")
+    compare_parser.add_argument("old")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=0.10,
+                                help="perubahan relatif yang dianggap regresi")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        report = run(args.engines, args.workloads, args.days, args.seed, args.repeat)
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nHasil disimpan di {args.out}")
+        return
+
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    regressions = compare(old, new, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regresi melewati ambang {args.threshold:.0%}.")
+        sys.exit(1)
+    print("\nTidak ada regresi.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Synthetic branch workloads shared by the benchmark suite.
+
+A workload is a list of operations:
+
+    ("issue", category)
+    ("finish", category, counter_id)
+
+It comes from a discrete-event run of one branch day through the real
+dispatcher. Every engine assigns the lowest idle counter, so replaying the
+list against any engine finishes tickets at counters that really are busy.
+
+Profiles (hourly arrival rates over an 8-hour day, 08:00-16:00):
+
+* poisson:   flat rate all day;
+* lunchtime: a burst around 12:00-13:00;
+* payday:    every hour about 3x busier, peaking in the morning;
+* longtail:  flat arrivals with lognormal (heavy-tailed) service times.
+"""
+import heapq
+import math
+import random
+
+from bc import BankQueueSystem
+from simulation import exponential, lognormal, next_arrival
+
+HOURS = 8
+BASE_RATE = {"teller": 50.0, "cs": 15.0}     # base customers per hour
+MEAN_SERVICE = {"teller": 4 * 60.0, "cs": 10 * 60.0}
+
+
+def _flat(rate):
+    return [rate] * HOURS
+
+
+def _lunchtime(rate):
+    return [rate * (1 + 1.5 * math.exp(-0.5 * ((hour - 4.5) / 0.8) ** 2)) for hour in range(HOURS)]
+
+
+def _payday(rate):
+    return [rate * (4.0 if hour < 3 else 2.5) for hour in range(HOURS)]
+
+
+def _heavy_tail(mean):
+    return lognormal(mean, 1.2)
+
+
+PROFILES = {
+    "poisson": (_flat, exponential),
+    "lunchtime": (_lunchtime, exponential),
+    "payday": (_payday, exponential),
+    "longtail": (_flat, _heavy_tail),
+}
+WORKLOADS = tuple(PROFILES)
+
+ARRIVAL = 0
+FINISH = 1
+
+
+def generate(name, days=1, seed=0, num_tellers=4, num_cs=3):
+    """Operations for `days` consecutive days of workload `name`.
+
+    Every day ends with all tickets finished, so days chain on one engine.
+    """
+    rates_for, sampler = PROFILES[name]
+    rng = random.Random(seed)
+    service = {c: sampler(MEAN_SERVICE[c]) for c in BASE_RATE}
+    rates = {c: rates_for(base) for c, base in BASE_RATE.items()}
+    system = BankQueueSystem(num_tellers=num_tellers, num_cs=num_cs)
+    dispatcher = system.dispatcher
+
+    operations = []
+    for _ in range(days):
+        calendar = []
+        seq = 0
+        for category in BASE_RATE:
+            t = next_arrival(0.0, rates[category], rng)
+            while t is not None:
+                calendar.append((t, seq, ARRIVAL, category, 0))
+                seq += 1
+                t = next_arrival(t, rates[category], rng)
+        heapq.heapify(calendar)
+
+        while calendar:
+            now, _, kind, category, counter_id = heapq.heappop(calendar)
+            if kind == ARRIVAL:
+                operations.append(("issue", category))
+                _, assignments = dispatcher.arrive(category)
+            else:
+                operations.append(("finish", category, counter_id))
+                _, assignments = dispatcher.finish(category, counter_id)
+            for assigned_id, _ in assignments:
+                heapq.heappush(calendar, (now + service[category](rng), seq, FINISH, category, assigned_id))
+                seq += 1
+    return operations
@@ -0,0 +1,76 @@
+"""Service categories (teller, CS, loans, forex, ...) loaded from configuration.
+
+A category has a key used in code and URLs, a ticket prefix, a display
+label and a number of counters. The configuration file is JSON:
+
+    {"categories": [
+        {"key": "teller", "prefix": "A", "label": "Teller", "counters": 4,
+         "no_show_timeout": 120, "number_width": 3, "number_wrap": 999},
+        {"key": "cs", "prefix": "B", "label": "Customer Service", "counters": 3},
+        {"key": "kredit", "prefix": "C", "label": "Kredit", "counters": 2}
+    ]}
+
+The order of the list is the order of menus and tables. no_show_timeout is
+optional: the seconds a called customer has to reach the counter before
+no_show.NoShowMonitor skips the ticket. Without it tickets are only
+skipped by hand. number_width (default 3) and number_wrap (default none)
+set how ticket numbers are shown; see numbering.py.
+"""
+import json
+
+
+class Category:
+    __slots__ = ("key", "prefix", "label", "counters", "no_show_timeout", "number_width", "number_wrap")
+
+    def __init__(self, key, prefix, label, counters, no_show_timeout=None, number_width=3, number_wrap=None):
+        self.key = key
+        self.prefix = prefix
+        self.label = label
+        self.counters = counters
+        self.no_show_timeout = no_show_timeout
+        self.number_width = number_width
+        self.number_wrap = number_wrap
+
+    def __repr__(self):
+        timeout = "" if self.no_show_timeout is None else f", no_show_timeout={self.no_show_timeout}"
+        return f"Category({self.key!r}, {self.prefix!r}, {self.label!r}, {self.counters}{timeout})"
+
+
+def default_categories(num_tellers=4, num_cs=3):
+    return [
+        Category("teller", "A", "Teller", num_tellers),
+        Category("cs", "B", "Customer Service", num_cs),
+    ]
+
+
+def validate(categories):
+    """Raise ValueError unless keys and prefixes are unique and counts positive."""
+    if not categories:
+        raise ValueError("Minimal satu kategori layanan harus dikonfigurasi.")
+    keys, prefixes = set(), set()
+    for category in categories:
+        if category.key in keys:
+            raise ValueError(f"Kategori {category.key!r} didefinisikan lebih dari sekali.")
+        if category.prefix in prefixes:
+            raise ValueError(f"Prefix {category.prefix!r} dipakai lebih dari satu kategori.")
+        if category.counters < 1:
+            raise ValueError(f"Kategori {category.key!r} harus punya minimal satu loket.")
+        if category.no_show_timeout is not None and category.no_show_timeout <= 0:
+            raise ValueError(f"no_show_timeout kategori {category.key!r} harus lebih dari 0.")
+        if category.number_width < 1 or category.number_wrap is not None and category.number_wrap < 1:
+            raise ValueError(f"number_width dan number_wrap kategori {category.key!r} harus lebih dari 0.")
+        keys.add(category.key)
+        prefixes.add(category.prefix)
+    return categories
+
+
+def load_categories(path):
+    with open(path) as f:
+        config = json.load(f)
+    return validate([
+        Category(entry["key"], entry["prefix"], entry.get("label", entry["key"]), int(entry["counters"]),
+                 None if entry.get("no_show_timeout") is None else float(entry["no_show_timeout"]),
+                 int(entry.get("number_width", 3)),
+                 None if entry.get("number_wrap") is None else int(entry["number_wrap"]))
+        for entry in config["categories"]
+    ])
@@ -1,13 +1,14 @@
 import os
 from tabulate import tabulate
 from abc import ABC, abstractmethod
+from ticket_queue import TicketQueue, QueueFullError
 
 def clear_screen():
     os.system('cls' if os.name == 'nt' else 'clear')
 
 class Queue:
-    def __init__(self, prefix):
-        self.queue = []
+    def __init__(self, prefix, capacity=None):
+        self.queue = TicketQueue(capacity)
         self.prefix = prefix
         self.last_ticket = 0
 
@@ -19,8 +20,8 @@ class Queue:
         
         new_number = last_number + 1
         ticket = f"{self.prefix} {new_number:03}"
+        self.queue.enqueue(ticket)
         self.last_ticket = new_number
-        self.queue.append(ticket)
         return ticket
 
 class ServiceCounter(ABC):
@@ -51,7 +52,7 @@ class TellerCounter(ServiceCounter):
     def process_queue(self, queue):
         for i in range(len(self.counters)):
             if self.counters[i] is None and queue.queue:
-                self.counters[i] = queue.queue.pop(0)
+                self.counters[i] = queue.queue.dequeue()
 
         table = []
         for idx, counter in enumerate(self.counters):
@@ -69,7 +70,7 @@ class CustomerServiceCounter(ServiceCounter):
     def process_queue(self, queue):
         for i in range(len(self.counters)):
             if self.counters[i] is None and queue.queue:
-                self.counters[i] = queue.queue.pop(0)
+                self.counters[i] = queue.queue.dequeue()
 
         table = []
         for idx, counter in enumerate(self.counters):
@@ -84,19 +85,25 @@ class CustomerServiceCounter(ServiceCounter):
             print("Tidak ada antrian.")
 
 class BankQueueSystem:
-    def __init__(self):
-        self.teller_queue = Queue("A")
-        self.cs_queue = Queue("B")
+    def __init__(self, queue_capacity=None):
+        self.teller_queue = Queue("A", queue_capacity)
+        self.cs_queue = Queue("B", queue_capacity)
         self.teller_counter = TellerCounter(4)
         self.cs_counter = CustomerServiceCounter(3)
 
     def add_to_teller_queue(self):
-        ticket = self.teller_queue.generate_ticket()
-        print(f"Ticket {ticket} added to Teller Queue.")
+        try:
+            ticket = self.teller_queue.generate_ticket()
+            print(f"Ticket {ticket} added to Teller Queue.")
+        except QueueFullError as e:
+            print(e)
 
     def add_to_cs_queue(self):
-        ticket = self.cs_queue.generate_ticket()
-        print(f"Ticket {ticket} added to Customer Service Queue.")
+        try:
+            ticket = self.cs_queue.generate_ticket()
+            print(f"Ticket {ticket} added to Customer Service Queue.")
+        except QueueFullError as e:
+            print(e)
 
     def show_teller_queue(self):
         print("\n=== Antrian Teller ===")
@@ -0,0 +1,46 @@
+class FreeCounterIndex:
+    """Bitmap of idle counters.
+
+    Bit i is set while counter i is free. The lowest free counter is found
+    with a single bit trick instead of scanning every counter, so callers
+    keep the old "first empty counter wins" order.
+    """
+
+    def __init__(self, num_counters):
+        self.size = num_counters
+        self._free = (1 << num_counters) - 1
+
+    def acquire(self):
+        """Mark the lowest free counter busy and return its index, or None."""
+        free = self._free
+        if not free:
+            return None
+        lowest = free & -free
+        self._free = free ^ lowest
+        return lowest.bit_length() - 1
+
+    def acquire_from(self, mask):
+        """Like acquire(), but only among the counters whose bit is set in mask."""
+        free = self._free & mask
+        if not free:
+            return None
+        lowest = free & -free
+        self._free ^= lowest
+        return lowest.bit_length() - 1
+
+    def mark_busy(self, index):
+        self._free &= ~(1 << index)
+
+    def release(self, index):
+        if not 0 <= index < self.size:
+            raise IndexError(f"loket {index} di luar jangkauan")
+        self._free |= 1 << index
+
+    def is_free(self, index):
+        return bool(self._free >> index & 1)
+
+    def __len__(self):
+        return self._free.bit_count()
+
+    def __bool__(self):
+        return self._free != 0
@@ -0,0 +1,221 @@
+import threading
+from contextlib import ExitStack, contextmanager
+
+from profiling import traced
+
+EVENTS = ("enqueue", "assign", "finish", "cancel", "skip", "recall")
+
+
+class DispatchEngine:
+    """Moves tickets to counters on arrival and service-finished events.
+
+    `pools` maps a category (e.g. "teller") to a (queue, counter) pair, where
+    the queue issues tickets via generate_ticket() and the counter exposes
+    process_queue() and release(). Nothing on the read path calls into the
+    engine, so viewing a queue never changes it.
+
+    cancel(), skip() and recall() also need the line (queue.queue) to have
+    cancel() and recall() and the queue to have a `skipped` dict
+    (bc.Queue).
+
+    Each category has its own lock, held for the whole event (numbering,
+    queue, counters and listeners), so ticket numbers are issued atomically
+    and teller traffic never waits on CS traffic. Readers that need a
+    consistent view of one category can hold `locks[category]` themselves.
+
+    With a skill_routing.SkillRouting, counters are shared: every pool has
+    all counters, an arrival may take any idle counter with its skill, and
+    a freed counter takes the next ticket of any line it serves. Freeing a
+    counter then holds the locks of all its categories (counter_locked()).
+    """
+
+    def __init__(self, pools, routing=None):
+        self.pools = pools
+        self.locks = {category: threading.RLock() for category in pools}
+        # One lookup per event on the hot path: category -> (queue, counter, lock).
+        self._slots = {category: (queue, counter, self.locks[category])
+                       for category, (queue, counter) in pools.items()}
+        self.listeners = []
+        self.listening = {event: [] for event in EVENTS}     # event -> its listeners
+        self.routing = routing
+
+    @contextmanager
+    def counter_locked(self, category, counter_id):
+        """Hold every lock finish() and skip() of this counter take.
+
+        That is the category lock, plus, with shared counters, the locks of
+        every category the counter serves, in sorted order.
+        """
+        routing = self.routing
+        if routing is None or not 1 <= counter_id <= routing.size:
+            with self.locks[category]:
+                yield
+            return
+        with ExitStack() as stack:
+            for key in sorted({category, *routing.lock_order[counter_id - 1]}):
+                stack.enter_context(self.locks[key])
+            yield
+
+    def subscribe(self, listener, events=EVENTS):
+        """Call listener(event, category, ticket, counter_id) on every event
+        in `events`.
+
+        Events are "enqueue", "assign", "finish", "cancel" (left the line),
+        "skip" (did not show up at the counter) and "recall" (a skipped
+        ticket back in line). counter_id is None for "enqueue", "cancel" and
+        "recall". Listeners run under the category lock, so they see the
+        events of one category in order. An event nobody listens to costs
+        one dict lookup.
+        """
+        unknown = set(events) - set(EVENTS)
+        if unknown:
+            raise ValueError(f"Jenis event tidak dikenal: {sorted(unknown)}")
+        self.listeners.append(listener)
+        for event in events:
+            self.listening[event].append(listener)
+
+    @traced
+    def arrive(self, category, **options):
+        """Issue a ticket and assign it straight away if a counter is idle.
+
+        options (e.g. lane="vip" or appointment_ns=...) are passed on to the
+        queue and need a line that supports them (scheduler.PriorityScheduler).
+        """
+        queue, counter, lock = self._slots[category]
+        with lock:
+            if self.routing is not None and not queue.queue:
+                self.routing.waking(category)
+            ticket = queue.generate_ticket(**options)
+            if self.listening["enqueue"]:
+                self._emit("enqueue", category, ticket, None)
+            return ticket, self._dispatch(category, queue, counter)
+
+    @traced
+    def finish(self, category, counter_id):
+        """Free a counter and give it the next waiting ticket.
+
+        Returns the finished ticket (None if the counter was idle) and the
+        list of (counter_id, ticket) assignments made as a result. With
+        shared counters the new ticket may belong to another category.
+        """
+        if self.routing is not None:
+            return self._free_shared(category, counter_id, "finish")
+        queue, counter, lock = self._slots[category]
+        with lock:
+            ticket = counter.release(counter_id)
+            if ticket is None:
+                return None, []
+            if self.listening["finish"]:
+                self._emit("finish", category, ticket, counter_id)
+            return ticket, self._dispatch(category, queue, counter)
+
+    @traced
+    def cancel(self, category, number):
+        """Take waiting ticket `number` out of the line; returns it or None."""
+        queue, _ = self.pools[category]
+        with self.locks[category]:
+            ticket = queue.queue.cancel(number)
+            if ticket is not None and self.listening["cancel"]:
+                self._emit("cancel", category, ticket, None)
+            return ticket
+
+    @traced
+    def skip(self, category, counter_id):
+        """Mark the ticket at a counter as a no-show and call the next one.
+
+        The skipped ticket can be recalled later. Returns it (None if the
+        counter was idle) and the resulting assignments.
+        """
+        if self.routing is not None:
+            return self._free_shared(category, counter_id, "skip")
+        queue, counter = self.pools[category]
+        with self.locks[category]:
+            ticket = counter.release(counter_id)
+            if ticket is None:
+                return None, []
+            queue.skipped[ticket.number] = ticket
+            if self.listening["skip"]:
+                self._emit("skip", category, ticket, counter_id)
+            return ticket, self._dispatch(category, queue, counter)
+
+    @traced
+    def recall(self, category, number):
+        """Put skipped ticket `number` back at the front of the line.
+
+        Returns the ticket (None if it was not skipped) and the resulting
+        assignments.
+        """
+        queue, counter = self.pools[category]
+        with self.locks[category]:
+            ticket = queue.skipped.pop(number, None)
+            if ticket is None:
+                return None, []
+            queue.queue.recall(ticket)
+            if self.listening["recall"]:
+                self._emit("recall", category, ticket, None)
+            return ticket, self._dispatch(category, queue, counter)
+
+    def dispatch(self, category):
+        """Assign waiting tickets to idle counters without any other event.
+
+        Needed when tickets become callable with time, e.g. appointments
+        whose slot comes due while counters are idle.
+        """
+        queue, counter = self.pools[category]
+        with self.locks[category]:
+            return self._dispatch(category, queue, counter)
+
+    def _free_shared(self, category, counter_id, event):
+        queue, counter = self.pools[category]
+        routing = self.routing
+        with self.counter_locked(category, counter_id):
+            ticket = counter.release(counter_id)
+            if ticket is None:
+                return None, []
+            if event == "skip":
+                queue.skipped[ticket.number] = ticket
+            if self.listening[event]:
+                self._emit(event, category, ticket, counter_id)
+            idx = counter_id - 1
+            # The counter takes the line its policy picks, or becomes free;
+            # every line it serves is locked, so none can change meanwhile.
+            chosen = routing.pick(idx, self.pools)
+            if chosen is None:
+                routing.release(idx)
+                return ticket, []
+            return ticket, [self._assign(chosen, idx)]
+
+    def _assign(self, category, idx):
+        queue, counter = self.pools[category]
+        ticket = queue.queue.dequeue()
+        counter.counters[idx] = ticket
+        counter.free_counters.mark_busy(idx)
+        self.routing.charge(category)
+        if self.listening["assign"]:
+            self._emit("assign", category, ticket, idx + 1)
+        return idx + 1, ticket
+
+    def _dispatch(self, category, queue, counter):
+        routing = self.routing
+        if routing is not None:
+            # Idle counters have no waiting line among their skills, so an
+            # idle skilled counter can take this line's head directly.
+            assignments = []
+            while queue.queue:
+                idx = routing.acquire(category)
+                if idx is None:
+                    break
+                assignments.append(self._assign(category, idx))
+            return assignments
+        if not counter.free_counters:
+            return []       # the usual arrival on a busy floor
+        assignments = counter.process_queue(queue)
+        if self.listening["assign"]:
+            for counter_id, ticket in assignments:
+                self._emit("assign", category, ticket, counter_id)
+        return assignments
+
+    @traced
+    def _emit(self, event, category, ticket, counter_id):
+        for listener in self.listening[event]:
+            listener(event, category, ticket, counter_id)
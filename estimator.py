@@ -0,0 +1,111 @@
+"""Online wait-time estimate shown to a customer when a ticket is issued.
+
+WaitEstimator listens to the dispatcher's "finish" and "skip" events only.
+A ticket starts service at the later of its arrival and the previous
+finish at the same counter, so only the finish needs a clock read, and
+issuing a ticket does not call the estimator at all. Each service time is folded into
+exponentially decayed statistics: a mean and variance per category and a
+mean per counter. Every update is O(1).
+
+The per-counter means give each category a service rate: the sum over its
+counters of 1 / mean service time. With skill routing these are the
+counters that can serve the category, not every shared counter. A ticket with `ahead` tickets in front
+of it, with every counter busy, waits for ahead + 1 departures:
+
+    mean = (ahead + 1) / rate
+    sd   = sqrt(ahead + 1) * cv / rate
+
+cv is the category's coefficient of variation. For exponential service
+this is exact. The band is mean +/- z * sd, which is about 80% for the
+default z.
+
+    estimator = WaitEstimator(system)
+    print(estimator.predict("teller", ahead=5))
+"""
+import math
+import time
+
+MIN_SERVICE = 1.0   # seconds; keeps 1/mean finite after a run of instant finishes
+
+
+class Estimate:
+    __slots__ = ("mean", "low", "high")
+
+    def __init__(self, mean, low, high):
+        self.mean = mean
+        self.low = low
+        self.high = high
+
+    def __str__(self):
+        if self.high < 60:
+            return "kurang dari 1 menit"
+        low, mean, high = (round(v / 60) for v in (self.low, self.mean, self.high))
+        return f"sekitar {mean} menit ({low}-{high} menit)"
+
+    def __repr__(self):
+        return f"Estimate(mean={self.mean:.0f}, low={self.low:.0f}, high={self.high:.0f})"
+
+
+class WaitEstimator:
+    def __init__(self, system, alpha=0.05, prior=300.0, z=1.28, clock=time.monotonic_ns):
+        """alpha is the weight of each new service time; prior is the mean
+        service time in seconds assumed before anything has finished."""
+        self.alpha = alpha
+        self.z = z
+        self.clock = clock
+        self.mean, self.var, self.rate, self.spread = {}, {}, {}, {}
+        self.counter_mean, self.freed = {}, {}
+        routing = system.dispatcher.routing
+        for category in system.categories:
+            size = len(system.get_counter(category).counters)
+            # Shared counters (skill_routing) only add to the rate of the
+            # categories they can serve.
+            serving = size if routing is None else routing.skill_mask[category].bit_count()
+            self.mean[category] = prior
+            self.var[category] = prior * prior     # exponential prior: cv = 1
+            self.counter_mean[category] = [prior] * size
+            self.rate[category] = serving / prior
+            self.freed[category] = [0] * size    # last finish per counter (ns)
+            self._update_spread(category)
+        # Issuing a ticket ("enqueue", "assign") does not call the estimator.
+        system.subscribe(self._on_event, ("finish", "skip"))
+
+    def _on_event(self, event, category, ticket, counter_id):
+        # Runs under the category lock, which also guards this category's stats.
+        if event == "finish":
+            now = self.clock()
+            freed = self.freed[category]
+            start = max(ticket.arrived_ns, freed[counter_id - 1])
+            freed[counter_id - 1] = now
+            self.observe(category, counter_id, (now - start) / 1e9)
+        elif event == "skip":
+            # No service happened, but the next one starts from now.
+            self.freed[category][counter_id - 1] = self.clock()
+
+    def observe(self, category, counter_id, seconds):
+        """Fold one service time into the category and counter statistics."""
+        seconds = max(seconds, MIN_SERVICE)
+        alpha = self.alpha
+        diff = seconds - self.mean[category]
+        increment = alpha * diff
+        self.mean[category] += increment
+        self.var[category] = (1 - alpha) * (self.var[category] + diff * increment)
+
+        means = self.counter_mean[category]
+        old = means[counter_id - 1]
+        new = old + alpha * (seconds - old)
+        means[counter_id - 1] = new
+        self.rate[category] += 1 / new - 1 / old
+        self._update_spread(category)
+
+    def _update_spread(self, category):
+        # z * cv / rate changes only on finish, so predict() doesn't redo it.
+        cv = math.sqrt(self.var[category]) / self.mean[category]
+        self.spread[category] = self.z * cv / self.rate[category]
+
+    def predict(self, category, ahead):
+        """Estimate for a ticket with `ahead` waiting tickets in front of it."""
+        departures = ahead + 1
+        mean = departures / self.rate[category]
+        spread = self.spread[category] * math.sqrt(departures)
+        return Estimate(mean, max(0.0, mean - spread), mean + spread)
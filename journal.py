@@ -0,0 +1,315 @@
+"""Write-ahead journal with periodic snapshots for BankQueueSystem.
+
+Every dispatcher event (enqueue, assign, finish, cancel, skip, recall) is
+appended to the current journal segment as a fixed-size binary record.
+Writes are buffered and fsync'ed in batches, either when `batch_size`
+events are pending or by a background flusher every `durability_window`
+seconds, whichever comes first; that bounds what a crash can lose
+(durability_window=0 syncs every event). Every `snapshot_every` events the
+full state is written to a snapshot and a new segment is started, so
+recovery only has to load the latest snapshot and replay the tail behind
+it. A daily rollover (numbering.DailyRollover) has no event of its own; it
+calls snapshot(), and the snapshot carries the business day.
+
+A ticket in a priority line (scheduler.PriorityScheduler) also has a
+lane and an arrival or slot time. The system reports them through
+place(), and each enqueue or recall of such a ticket is followed by a
+PLACE record. That record holds the lane's index in the segment header
+and the wall-clock time. Snapshots carry the same data as "places".
+
+A system needs categories, subscribe(), snapshot_state(), restore_state()
+and locked() to be journaled, plus lanes() and place() for priority lines
+(see bc.BankQueueSystem). Snapshots are taken by the
+background thread while it holds locked(), so no event can be half-applied
+while the state is copied; record() itself never waits for a snapshot.
+
+    journal = Journal("data/antrian")
+    journal.recover(system)
+    journal.attach(system)
+    ...
+    journal.close()
+"""
+import json
+import os
+import struct
+import threading
+
+ENQUEUE = 0
+ASSIGN = 1
+FINISH = 2
+CANCEL = 3
+SKIP = 4
+RECALL = 5
+PLACE = 6       # not an event: lane and time of the ticket in the record before
+EVENT_CODES = {"enqueue": ENQUEUE, "assign": ASSIGN, "finish": FINISH,
+               "cancel": CANCEL, "skip": SKIP, "recall": RECALL}
+
+# event code, category index, counter id (0 if none), ticket number;
+# PLACE: code, category index, lane index, wall-clock ns
+RECORD = struct.Struct("<BBHQ")
+_pack = RECORD.pack
+
+
+def _segment_name(seq):
+    return f"journal-{seq:012d}.log"
+
+
+def _snapshot_name(seq):
+    return f"snapshot-{seq:012d}.json"
+
+
+def _seq_of(name):
+    return int(name.split("-")[1].split(".")[0])
+
+
+def _fsync_dir(directory):
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class Journal:
+    def __init__(self, directory, batch_size=256, durability_window=0.05, snapshot_every=100_000):
+        self.directory = directory
+        self.batch_size = batch_size
+        self.durability_window = durability_window
+        self.snapshot_every = snapshot_every
+        os.makedirs(directory, exist_ok=True)
+
+        self.system = None
+        self.categories = []
+        self._category_index = {}
+        self.lanes = []
+        self._lane_index = {}
+        self._place = None
+        self.seq = 0                 # events written since the beginning of time
+        self._segment_seq = 0
+        self._file = None
+        self._buffer = bytearray()
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._flusher = None
+        self._snapshot_due = False
+
+    # -- recovery ---------------------------------------------------------
+
+    def _listing(self, prefix):
+        return sorted(
+            (_seq_of(name), name) for name in os.listdir(self.directory) if name.startswith(prefix)
+        )
+
+    def load_state(self):
+        """Return (state, seq) from the latest snapshot plus the journal tail."""
+        state, seq = {}, 0
+        snapshots = self._listing("snapshot-")
+        if snapshots:
+            seq, name = snapshots[-1]
+            with open(os.path.join(self.directory, name)) as f:
+                state = json.load(f)
+
+        # Waiting lines are dicts (ticket -> None): ordered, with O(1) removal
+        # of whichever ticket an assign or cancel event names. Recalled
+        # tickets wait in front of the rest, so they get their own dict.
+        working = {
+            category: {
+                "last": saved["last"],
+                "recalled": {},
+                "waiting": dict.fromkeys(saved["waiting"]),
+                "counters": list(saved["counters"]),
+                "skipped": dict.fromkeys(saved.get("skipped", ())),
+                "day": saved.get("day"),
+                "day_starts": saved.get("day_starts", []),
+                "places": dict(zip(saved["waiting"], saved.get("places", ()))),
+            }
+            for category, saved in state.items()
+        }
+
+        for segment_seq, name in self._listing("journal-"):
+            if segment_seq < seq:
+                continue
+            with open(os.path.join(self.directory, name), "rb") as f:
+                header = json.loads(f.readline())
+                data = f.read()
+            categories = header["categories"]
+            lanes = header.get("lanes", [])
+            for category in categories:
+                working.setdefault(category, {"last": 0, "recalled": {}, "waiting": {},
+                                              "counters": [], "skipped": {},
+                                              "day": None, "day_starts": [], "places": {}})
+            recalled = [working[c]["recalled"] for c in categories]
+            waiting = [working[c]["waiting"] for c in categories]
+            counters = [working[c]["counters"] for c in categories]
+            skipped = [working[c]["skipped"] for c in categories]
+            last = [working[c]["last"] for c in categories]
+            places = [working[c]["places"] for c in categories]
+            placing = 0         # ticket of the last enqueue or recall
+            extra = 0           # PLACE records, which are not events
+            # A crash can leave a partial record at the end; ignore it.
+            usable = len(data) - len(data) % RECORD.size
+            for event, category, counter_id, number in RECORD.iter_unpack(memoryview(data)[:usable]):
+                if event == ENQUEUE:
+                    waiting[category][number] = None
+                    last[category] = number
+                    placing = number
+                elif event == ASSIGN:
+                    # Values are None, so pop() gives 0 only if the ticket
+                    # was not recalled and must be in the main line.
+                    if recalled[category].pop(number, 0) is not None:
+                        waiting[category].pop(number, None)
+                    lane = counters[category]
+                    if counter_id > len(lane):
+                        lane.extend([None] * (counter_id - len(lane)))
+                    lane[counter_id - 1] = number
+                elif event == FINISH:
+                    counters[category][counter_id - 1] = None
+                elif event == CANCEL:
+                    if recalled[category].pop(number, 0) is not None:
+                        waiting[category].pop(number, None)
+                elif event == SKIP:
+                    counters[category][counter_id - 1] = None
+                    skipped[category][number] = None
+                elif event == RECALL:
+                    skipped[category].pop(number, None)
+                    recalled[category][number] = None
+                    placing = number
+                else:
+                    # Places of tickets that left are never looked up again.
+                    places[category][placing] = [lanes[counter_id], number]
+                    extra += 1
+            for category, number in zip(categories, last):
+                working[category]["last"] = number
+            seq = segment_seq + usable // RECORD.size - extra
+
+        for lane in working.values():
+            lane["waiting"] = list(lane.pop("recalled")) + list(lane["waiting"])
+            lane["skipped"] = list(lane["skipped"])
+            places = lane.pop("places")
+            if places:
+                lane["places"] = [places.get(number) for number in lane["waiting"]]
+        return working, seq
+
+    def recover(self, system):
+        """Restore `system` from disk; returns the number of events recovered."""
+        state, seq = self.load_state()
+        if state:
+            current = system.snapshot_state()
+            for category, lane in state.items():
+                # A counter that never saw an event is absent from the journal.
+                size = len(current[category]["counters"])
+                lane["counters"] = (lane["counters"] + [None] * size)[:size]
+            system.restore_state(state)
+        self.seq = seq
+        return seq
+
+    # -- writing ------------------------------------------------------------
+
+    def attach(self, system):
+        """Start journaling every event of `system` into a fresh segment."""
+        self.system = system
+        self.categories = list(system.categories)
+        self._category_index = {c: i for i, c in enumerate(self.categories)}
+        self.lanes = list(system.lanes()) if hasattr(system, "lanes") else []
+        self._lane_index = {lane: i for i, lane in enumerate(self.lanes)}
+        self._place = system.place if self.lanes else None
+        self._open_segment(self.seq)
+        system.subscribe(self.record)
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher.start()
+
+    def record(self, event, category, ticket, counter_id):
+        index = self._category_index[category]
+        data = _pack(EVENT_CODES[event], index, counter_id or 0, ticket.number)
+        if self._place is not None and (event == "enqueue" or event == "recall"):
+            place = self._place(category, ticket.number)
+            if place is not None:
+                # Written together, so the PLACE record always follows its ticket's.
+                data += _pack(PLACE, index, self._lane_index[place[0]], place[1])
+        with self._lock:
+            self._buffer += data
+            self._pending += 1
+            self.seq += 1
+            # The time-based bound is enforced by the flusher thread, which
+            # keeps the clock read off this path.
+            if self._pending >= self.batch_size or not self.durability_window:
+                self._sync_locked()
+            if self.seq - self._segment_seq >= self.snapshot_every:
+                self._snapshot_due = True
+
+    def sync(self):
+        with self._lock:
+            self._sync_locked()
+
+    def snapshot(self):
+        # Lock order is category locks, then the journal lock, the same as
+        # an event being recorded from inside the dispatcher.
+        with self.system.locked():
+            with self._lock:
+                self._snapshot_locked()
+
+    def close(self):
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        with self._lock:
+            self._sync_locked()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.durability_window or 0.05):
+            if self._snapshot_due:
+                self.snapshot()
+            elif self._pending:
+                self.sync()
+
+    def _sync_locked(self):
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def _open_segment(self, seq):
+        path = os.path.join(self.directory, _segment_name(seq))
+        # A segment that already exists (restart without new snapshot) is
+        # replaced: its events are already in the recovered state, which the
+        # snapshot written below captures.
+        if os.path.exists(path) or seq:
+            self._write_snapshot(seq)
+        self._file = open(path, "wb")
+        header = {"categories": self.categories, "lanes": self.lanes}
+        self._file.write(json.dumps(header).encode() + b"\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        _fsync_dir(self.directory)
+        self._segment_seq = seq
+        self._prune(seq)
+
+    def _snapshot_locked(self):
+        self._snapshot_due = False
+        self._sync_locked()
+        self._file.close()
+        self._open_segment(self.seq)
+
+    def _write_snapshot(self, seq):
+        path = os.path.join(self.directory, _snapshot_name(seq))
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.system.snapshot_state(), f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        _fsync_dir(self.directory)
+
+    def _prune(self, seq):
+        """Drop snapshots and segments that the newest snapshot supersedes."""
+        for prefix in ("snapshot-", "journal-"):
+            for old_seq, name in self._listing(prefix):
+                if old_seq < seq:
+                    os.remove(os.path.join(self.directory, name))
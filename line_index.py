@@ -0,0 +1,249 @@
+"""Ticket lookup and position-in-line index for waiting lines.
+
+LineIndex maps an item id (ticket number, customer id) to its entry and
+answers "how many are ahead of me?" in O(log n) for every line in this repo.
+
+A line is split into runs: stretches of items, added in order, whose
+priority keys never decrease. A line that orders by priority calls the
+items of a run in the order they were added. The runs in this repo:
+
+* TicketLine (FIFO) has a single run;
+* PriorityScheduler and tugas.SistemAntrianBank call tickets in order of
+  arrived_ns - LANE_BOOST[lane]. Arrivals are issued in time order, so
+  each lane is one run. Promoted appointments are keyed by slot time. A
+  slot booked earlier than one already promoted starts a new run.
+
+Each run is an append-only array, a head pointer past the called items,
+and a Fenwick tree that counts items removed from the middle (cancelled).
+So the normal path, adding at the tail and calling at the head, is O(1)
+and never touches the tree. Position within an item's own run is an index
+difference minus a Fenwick range count. Every other run contributes the
+items whose (key, order) is smaller, found by bisection. A query is
+O(runs * log n).
+"""
+from bisect import bisect_left, bisect_right
+from itertools import count, repeat
+
+COMPACT_MIN = 1024     # drop the called prefix of a run once it is this long
+
+
+class Fenwick:
+    """Prefix sums over positions 0..size-1 with O(log n) update and query."""
+
+    __slots__ = ("tree",)
+
+    def __init__(self, values):
+        # O(n) construction: push every node's sum to its parent once.
+        tree = [0]
+        tree.extend(values)
+        size = len(tree)
+        for i in range(1, size):
+            parent = i + (i & -i)
+            if parent < size:
+                tree[parent] += tree[i]
+        self.tree = tree
+
+    def __len__(self):
+        return len(self.tree) - 1
+
+    def add(self, index, delta):
+        tree = self.tree
+        index += 1
+        size = len(tree)
+        while index < size:
+            tree[index] += delta
+            index += index & -index
+
+    def prefix(self, index):
+        """Sum of positions [0, index)."""
+        tree = self.tree
+        total = 0
+        while index > 0:
+            total += tree[index]
+            index &= index - 1
+        return total
+
+
+class _Run:
+    __slots__ = ("lane", "keys", "orders", "removed", "head", "offset", "holes", "cancelled")
+
+    def __init__(self, lane, fifo):
+        self.lane = lane
+        self.keys = []           # priority key per slot, non-decreasing
+        # Insertion order per slot, the tie-breaker; a FIFO run is keyed by
+        # insertion order, so it shares the list.
+        self.orders = self.keys if fifo else []
+        self.removed = bytearray()   # 1 = cancelled; only as long as needed
+        self.head = 0            # first slot that may still be waiting
+        self.offset = 0          # absolute slot number of keys[0]
+        self.holes = 0           # cancelled slots at or after head
+        self.cancelled = None    # Fenwick over `removed`, built on demand
+
+    def _tree(self):
+        tree = self.cancelled
+        if tree is None or len(tree) < len(self.keys):
+            # Leave room to grow, so the O(n) rebuild amortises to O(1).
+            size = 2 * len(self.keys)
+            tree = self.cancelled = Fenwick(self.removed + bytes(size - len(self.removed)))
+        return tree
+
+    def waiting_before(self, slot):
+        """Items still waiting in slots [head, slot)."""
+        if slot <= self.head:
+            return 0
+        if not self.holes:
+            return slot - self.head
+        tree = self._tree()
+        return slot - self.head - (tree.prefix(slot) - tree.prefix(self.head))
+
+    def cancel(self, slot):
+        # Build the tree before flagging the slot so a rebuild does not
+        # count it twice.
+        self._tree().add(slot, 1)
+        removed = self.removed
+        if slot >= len(removed):
+            removed.extend(bytes(slot + 1 - len(removed)))
+        removed[slot] = 1
+        self.holes += 1
+
+    def advance(self):
+        """Move head past the item just called and any cancelled run behind it."""
+        head = self.head + 1
+        if self.holes:
+            removed = self.removed
+            size = len(removed)
+            while head < size and removed[head]:
+                head += 1
+                self.holes -= 1
+        self.head = head
+        if head >= COMPACT_MIN and head * 2 >= len(self.keys):
+            self._compact()
+
+    def _compact(self):
+        head = self.head
+        del self.keys[:head]
+        if self.orders is not self.keys:
+            del self.orders[:head]
+        del self.removed[:head]
+        self.offset += head
+        self.head = 0
+        self.cancelled = None
+
+
+class LineIndex:
+    def __init__(self):
+        self._tails = {}          # lane -> run new items of that lane go to
+        self._runs = []           # every run that may still hold items
+        self._where = {}          # item id -> (run, absolute slot, item)
+        self._order = count()
+
+    def __len__(self):
+        return len(self._where)
+
+    def __contains__(self, item_id):
+        return item_id in self._where
+
+    def get(self, item_id, default=None):
+        """The waiting item with this id, or default."""
+        entry = self._where.get(item_id)
+        return default if entry is None else entry[2]
+
+    def lane_of(self, item_id):
+        """The lane a waiting item was added to, or None."""
+        entry = self._where.get(item_id)
+        return None if entry is None else entry[0].lane
+
+    def push(self, item_id, item, lane="normal", key=None):
+        """Add an item at the tail of its lane.
+
+        `key` is the priority the line orders by; leave it out for a FIFO
+        line. A key below the lane's last one starts a new run.
+        """
+        order = next(self._order)
+        run = self._tails.get(lane)
+        if key is None:
+            if run is None or run.orders is not run.keys:
+                run = self._new_run(lane, True)
+            key = order
+        elif run is None or run.orders is run.keys or run.keys and key < run.keys[-1]:
+            run = self._new_run(lane, False)
+        keys = run.keys
+        entry = (run, run.offset + len(keys), item)
+        if self._where.setdefault(item_id, entry) is not entry:
+            raise KeyError(f"item {item_id!r} sudah ada di indeks")
+        keys.append(key)
+        if run.orders is not keys:
+            run.orders.append(order)
+
+    def extend(self, item_ids, items, lane="normal"):
+        """Add items at the tail of a FIFO lane in one pass.
+
+        Same result as push(item_id, item, lane) for each pair, but the
+        run's keys and the id map are filled by list and dict operations, so
+        loading a restored line of n items is O(n) with a small constant.
+        """
+        size = len(items)
+        if not size:
+            return
+        where = self._where
+        if not where.keys().isdisjoint(item_ids) or len(set(item_ids)) != size:
+            raise KeyError("item sudah ada di indeks")
+        run = self._tails.get(lane)
+        if run is None or run.orders is not run.keys:
+            run = self._new_run(lane, True)
+        first = next(self._order)
+        self._order = count(first + size)
+        keys = run.keys
+        slot = run.offset + len(keys)
+        where.update(zip(item_ids, zip(repeat(run), range(slot, slot + size), items)))
+        keys.extend(range(first, first + size))
+
+    def _new_run(self, lane, fifo):
+        run = self._tails[lane] = _Run(lane, fifo)
+        self._runs.append(run)
+        return run
+
+    def discard(self, item_id):
+        """Forget an item that was called or left the line; returns it or None."""
+        entry = self._where.pop(item_id, None)
+        if entry is None:
+            return None
+        run, slot, item = entry
+        slot -= run.offset
+        if slot == run.head:
+            run.advance()
+            if run.head == len(run.keys) and self._tails.get(run.lane) is not run:
+                self._runs.remove(run)
+        else:
+            run.cancel(slot)
+        return item
+
+    def ahead(self, item_id):
+        """How many waiting items are called before this one, or None."""
+        entry = self._where.get(item_id)
+        if entry is None:
+            return None
+        run, slot, _ = entry
+        slot -= run.offset
+        key, order = run.keys[slot], run.orders[slot]
+        count = run.waiting_before(slot)
+        for other in self._runs:
+            if other is run or other.head == len(other.keys):
+                continue
+            keys = other.keys
+            low = bisect_left(keys, key, other.head)
+            high = bisect_right(keys, key, low)
+            # Equal keys: the heap breaks ties by insertion order.
+            cut = low if low == high else bisect_left(other.orders, order, low, high)
+            count += other.waiting_before(cut)
+        return count
+
+    def position(self, item_id):
+        """1-based position in line, or None if the item is not waiting."""
+        ahead = self.ahead(item_id)
+        return None if ahead is None else ahead + 1
+
+    def clear(self):
+        self._tails.clear()
+        self._runs.clear()
+        self._where.clear()
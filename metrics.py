@@ -0,0 +1,183 @@
+"""Streaming queue telemetry with percentile sketches and Prometheus export.
+
+QueueMetrics listens to the dispatcher and turns every ticket into three
+timestamps. Arrival is Ticket.arrived_ns. The call time is taken on
+"assign" and the finish time on "finish". From these it derives:
+
+* wait time (arrival -> call) and service time (call -> finish), per
+  category and per counter, each series a sketch.LogHistogram, so memory
+  per series is bounded by the value range, never by the ticket count;
+* issued, called and finished counters per category, and counts of
+  cancelled, no-show (skipped) and recalled tickets.
+
+The dispatcher listener only reads the clock and appends a tuple to a
+deque. A background thread folds pending events into the histograms every
+`interval` seconds, and so does every export. The request path pays one
+append per event, and the pending buffer holds at most one interval of
+events.
+
+    metrics = QueueMetrics(system)
+    metrics.serve(9464)                # GET /metrics
+    metrics.write("antrian.prom")      # textfile collector
+    metrics.close()
+"""
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from sketch import LogHistogram
+
+QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+class QueueMetrics:
+    def __init__(self, system, interval=1.0, clock=time.monotonic_ns):
+        self.system = system
+        self.interval = interval
+        self.clock = clock
+        self._pending = deque()
+        self._append = self._pending.append
+        self._drain_lock = threading.Lock()
+        self._stop = threading.Event()
+
+        self.issued, self.called, self.finished = {}, {}, {}
+        self.cancelled, self.skipped, self.recalled = {}, {}, {}
+        self.wait, self.service = {}, {}          # category -> LogHistogram
+        self.counter_wait, self.counter_service = {}, {}   # (category, id) -> LogHistogram
+        self._called_at = {}                      # (category, id) -> call time (ns)
+        for category in system.categories:
+            self.issued[category] = self.called[category] = self.finished[category] = 0
+            self.cancelled[category] = self.skipped[category] = self.recalled[category] = 0
+            self.wait[category] = LogHistogram()
+            self.service[category] = LogHistogram()
+            for counter_id in range(1, len(system.get_counter(category).counters) + 1):
+                self.counter_wait[category, counter_id] = LogHistogram()
+                self.counter_service[category, counter_id] = LogHistogram()
+        system.subscribe(self._on_event)
+        self._drainer = threading.Thread(target=self._drain_loop, daemon=True)
+        self._drainer.start()
+
+    def close(self):
+        self._stop.set()
+        self._drainer.join()
+        self.drain()
+
+    def _drain_loop(self):
+        while not self._stop.wait(self.interval):
+            self.drain()
+
+    def _on_event(self, event, category, ticket, counter_id):
+        self._append((event, category, counter_id, ticket.arrived_ns, self.clock()))
+
+    def drain(self):
+        """Fold pending events into the histograms."""
+        with self._drain_lock:
+            self._drain_locked()
+
+    def _drain_locked(self):
+        pending = self._pending
+        called_at = self._called_at
+        while pending:
+            event, category, counter_id, arrived_ns, now = pending.popleft()
+            if event == "enqueue":
+                self.issued[category] += 1
+            elif event == "assign":
+                self.called[category] += 1
+                wait = (now - arrived_ns) / 1e9
+                self.wait[category].record(wait)
+                self.counter_wait[category, counter_id].record(wait)
+                called_at[category, counter_id] = now
+            elif event == "finish":
+                self.finished[category] += 1
+                start = called_at.pop((category, counter_id), None)
+                if start is not None:
+                    service = (now - start) / 1e9
+                    self.service[category].record(service)
+                    self.counter_service[category, counter_id].record(service)
+            elif event == "skip":
+                self.skipped[category] += 1
+                called_at.pop((category, counter_id), None)
+            elif event == "cancel":
+                self.cancelled[category] += 1
+            elif event == "recall":
+                self.recalled[category] += 1
+
+    # -- export -------------------------------------------------------------
+
+    def prometheus(self):
+        """Prometheus text exposition format (version 0.0.4)."""
+        # Render under the drain lock so no histogram changes mid-export.
+        with self._drain_lock:
+            self._drain_locked()
+            return self._render()
+
+    def _render(self):
+        lines = []
+        for name, kind, help_text, values in (
+            ("bank_queue_tickets_issued_total", "counter", "Tickets issued.", self.issued),
+            ("bank_queue_tickets_called_total", "counter", "Tickets called to a counter.", self.called),
+            ("bank_queue_tickets_finished_total", "counter", "Services finished.", self.finished),
+            ("bank_queue_tickets_cancelled_total", "counter", "Tickets cancelled while waiting.", self.cancelled),
+            ("bank_queue_tickets_no_show_total", "counter", "Called tickets skipped as no-shows.", self.skipped),
+            ("bank_queue_tickets_recalled_total", "counter", "Skipped tickets recalled.", self.recalled),
+            ("bank_queue_waiting", "gauge", "Tickets waiting right now.", self._waiting()),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for category, value in values.items():
+                lines.append(f'{name}{{category="{category}"}} {value}')
+
+        for name, help_text, by_category, by_counter in (
+            ("bank_queue_wait_seconds", "Time from ticket issue to call.", self.wait, self.counter_wait),
+            ("bank_queue_service_seconds", "Time from call to finish.", self.service, self.counter_service),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} summary")
+            for category, histogram in by_category.items():
+                _summary(lines, name, f'category="{category}"', histogram)
+            for (category, counter_id), histogram in by_counter.items():
+                if histogram.count:
+                    _summary(lines, name, f'category="{category}",counter="{counter_id}"', histogram)
+        return "\n".join(lines) + "\n"
+
+    def _waiting(self):
+        return {category: len(queue.queue) for category, (queue, _) in self.system.dispatcher.pools.items()}
+
+    def write(self, path):
+        """Write the exposition atomically (for a node_exporter textfile collector)."""
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(self.prometheus())
+        os.replace(tmp, path)
+
+    def serve(self, port, host=""):
+        """Serve GET /metrics from a daemon thread; returns the server."""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+def _summary(lines, name, labels, histogram):
+    for q in QUANTILES:
+        lines.append(f'{name}{{{labels},quantile="{q}"}} {histogram.quantile(q):.6g}')
+    lines.append(f"{name}_sum{{{labels}}} {histogram.total:.6g}")
+    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
@@ -0,0 +1,90 @@
+"""Skip called customers who do not reach their counter in time.
+
+NoShowMonitor listens to the dispatcher. Every "assign" in a category with
+a no-show timeout starts a timer on a timer_wheel.TimerWheel. check_in()
+(the customer arrived), "finish" and "skip" cancel it. When a timer runs
+out and the counter still holds the same ticket, the monitor calls
+DispatchEngine.skip(): the ticket moves to the skipped list, where it can
+be recalled, and the counter calls the next ticket. Those calls go to the
+system's on_assign callback, so the front end announces them like any
+other call (the CLI registers BankQueueSystem.announce).
+
+Scheduling and cancelling are O(1) and nothing polls the counters, so the
+cost does not grow with the number of counters or waiting tickets.
+
+    monitor = NoShowMonitor(system)            # timeouts from the categories
+    monitor.start()
+    monitor.check_in("teller", 2)
+    monitor.close()
+"""
+import time
+
+from timer_wheel import TimerWheel
+
+
+class NoShowMonitor:
+    def __init__(self, system, timeouts=None, tick=1.0, clock=time.monotonic):
+        """timeouts maps category -> seconds; by default each category's
+        no_show_timeout. Categories without one are not watched."""
+        if timeouts is None:
+            timeouts = {key: category.no_show_timeout for key, category in system.categories.items()}
+        self.timeouts = {key: seconds for key, seconds in timeouts.items() if seconds}
+        self.system = system
+        self.dispatcher = system.dispatcher
+        self.wheel = TimerWheel(tick, clock=clock)
+        self._timers = {}       # (category, counter_id) -> running Timer
+        self.skipped = 0
+        system.subscribe(self._on_event, ("assign", "finish", "skip"))
+
+    def _on_event(self, event, category, ticket, counter_id):
+        # Runs under the category lock, which also guards this category's timers.
+        timeout = self.timeouts.get(category)
+        if timeout is None or counter_id is None:
+            return
+        if event == "assign":
+            self._timers[category, counter_id] = self.wheel.schedule(
+                timeout, self._expire, category, counter_id, ticket)
+        elif event == "finish" or event == "skip":
+            timer = self._timers.pop((category, counter_id), None)
+            if timer is not None:
+                self.wheel.cancel(timer)
+
+    def check_in(self, category, counter_id):
+        """The customer called to this counter has arrived; returns False if
+        no timer was running for it."""
+        with self.dispatcher.locks[category]:
+            timer = self._timers.pop((category, counter_id), None)
+            if timer is None:
+                return False
+            # The timer may already have fired; _expire then finds no entry.
+            self.wheel.cancel(timer)
+            return True
+
+    def _expire(self, category, counter_id, ticket):
+        # Called from the wheel without its lock. The customer may have
+        # checked in, or the counter moved on, since the timer fired.
+        dispatcher = self.dispatcher
+        # skip() takes these locks too; taking them in its order up front
+        # keeps shared counters from deadlocking.
+        with dispatcher.counter_locked(category, counter_id):
+            counter = dispatcher.pools[category][1]
+            if counter.counters[counter_id - 1] is not ticket:
+                return
+            if self._timers.pop((category, counter_id), None) is None:
+                return          # checked in after the timer fired
+            _, assignments = dispatcher.skip(category, counter_id)
+            self.skipped += 1
+        # Announced outside the lock, so a slow front end never holds it.
+        on_assign = self.system.on_assign
+        if assignments and on_assign is not None:
+            on_assign(assignments)
+
+    def advance(self, now=None):
+        """Fire due timers now; for callers that drive the clock themselves."""
+        return self.wheel.advance(now)
+
+    def start(self):
+        self.wheel.start()
+
+    def close(self):
+        self.wheel.close()
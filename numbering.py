@@ -0,0 +1,184 @@
+"""Ticket numbering: one 64-bit sequence per category, shown per day.
+
+Every category has a TicketSeries. Its sequence only goes up, and
+Ticket.number is the sequence, so a number names one ticket for good. The
+position index, cancel/recall and the journal key on it and never meet a
+duplicate, not even across days.
+
+What a customer sees is the display number: the count since the start of
+the business day, wrapped after `wrap` (999 -> 1 with wrap=999) and padded
+to `width` digits. It is worked out from the sequence only when a ticket
+is shown, by bisecting the first sequence of each recent day. Issuing a
+ticket is one increment and never looks at the waiting line.
+
+DailyRollover starts a new business day at a fixed local time from a
+background thread. It also catches up on start, so a system restored
+after midnight starts a new day before anything is issued. A rollover
+takes every category lock, and the journal snapshot passed as
+`on_rollover` is written before those locks are released. Recovery
+therefore never sees a ticket of the new day without the rollover.
+
+A category only rolls over once its line is empty and none of its counters
+is serving (see bc.BankQueueSystem.rollover); until then it keeps issuing
+the old day's numbers. Tickets of two days are therefore never on screen
+together, and number_of() only needs the current day. While a category is
+behind, DailyRollover retries every RETRY_SECONDS.
+
+The wrap does not look at the line. With wrap=999 the 1,000th ticket of
+the day is shown as 001 again even while ticket 001 still waits, so two
+tickets on screen share a display number whenever more than `wrap`
+tickets are issued before the oldest of them is served. number_of() then
+finds the newer one. Choose `wrap` well above the longest line a
+category sees.
+
+The rollover time is wall-clock time in `tz` (default: the local zone).
+The next rollover is found as a point in time, so a day with a daylight
+saving change is 23 or 25 hours long.
+
+    rollover = DailyRollover(system, at="05:00", on_rollover=journal.snapshot)
+    rollover.start()
+    ...
+    rollover.close()
+"""
+import threading
+import time
+from bisect import bisect_right
+from datetime import datetime, timedelta
+
+MAX_SEQUENCE = (1 << 64) - 1    # the journal stores numbers as uint64
+KEEP_DAYS = 8                   # day starts kept to show tickets of earlier days
+RETRY_SECONDS = 10              # retry interval while a category defers its rollover
+
+
+class TicketSeries:
+    __slots__ = ("prefix", "width", "wrap", "sequence", "day", "day_starts")
+
+    def __init__(self, prefix, width=3, wrap=None):
+        self.prefix = prefix
+        self.width = width
+        self.wrap = wrap
+        self.sequence = 0        # last number issued
+        self.day = None          # current business day, "YYYY-MM-DD"
+        self.day_starts = []     # first number of each recent day; empty = 1
+
+    def upcoming(self):
+        """The number the next ticket gets."""
+        if self.sequence >= MAX_SEQUENCE:
+            raise OverflowError(f"Nomor antrian {self.prefix} sudah mencapai batas 64 bit.")
+        return self.sequence + 1
+
+    def display(self, number):
+        """The number shown for ticket `number`: count within its day, wrapped.
+
+        Wrapped numbers can repeat within a day; see the module docstring.
+        """
+        starts = self.day_starts
+        if starts and number >= starts[0]:
+            number -= starts[bisect_right(starts, number) - 1] - 1
+        wrap = self.wrap
+        return number if wrap is None else (number - 1) % wrap + 1
+
+    def number_of(self, shown):
+        """The latest number of the current day shown as `shown`, or None.
+
+        This is what a customer or teller types in; with a wrap the most
+        recent ticket with that display number wins.
+        """
+        start = self.day_starts[-1] if self.day_starts else 1
+        number = start + shown - 1
+        wrap = self.wrap
+        if wrap is not None:
+            if not 1 <= shown <= wrap:
+                return None
+            if self.sequence > number:
+                number += (self.sequence - number) // wrap * wrap
+        return number if start <= number <= self.sequence else None
+
+    def format(self, number):
+        return f"{self.prefix} {self.display(number):0{self.width}}"
+
+    def rollover(self, day):
+        """Start business day `day`; returns False if it already started."""
+        if day == self.day:
+            return False
+        self.day = day
+        first = self.sequence + 1
+        starts = self.day_starts
+        if first != (starts[-1] if starts else 1):
+            starts.append(first)
+            del starts[:-KEEP_DAYS]
+        return True
+
+
+def parse_time_of_day(text):
+    """"HH:MM" -> (hour, minute); raises ValueError."""
+    try:
+        hour, minute = (int(part) for part in text.split(":"))
+    except ValueError:
+        raise ValueError(f"Jam pergantian hari harus berformat HH:MM, bukan {text!r}.") from None
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        raise ValueError(f"Jam pergantian hari tidak valid: {text!r}.")
+    return hour, minute
+
+
+class DailyRollover:
+    def __init__(self, system, at="00:00", on_rollover=None, clock=time.time, tz=None):
+        """system needs locked(), rollover(day) and behind(day)
+        (bc.BankQueueSystem). on_rollover runs under the system lock after
+        each rollover. tz is a tzinfo, e.g. zoneinfo.ZoneInfo("Asia/Jakarta");
+        None is the local zone."""
+        hour, minute = parse_time_of_day(at)
+        self.system = system
+        self.hour = hour
+        self.minute = minute
+        self.offset = timedelta(hours=hour, minutes=minute)
+        self.on_rollover = on_rollover
+        self.clock = clock
+        self.tz = tz
+        self.pending = False     # some category deferred the current day
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _day_at(self, now):
+        # Wall-clock arithmetic: the business day starts at `at` on the clock.
+        return (datetime.fromtimestamp(now, self.tz) - self.offset).date()
+
+    def business_day(self, now=None):
+        """The business day at `now`: the calendar day that started at `at`."""
+        return self._day_at(self.clock() if now is None else now).isoformat()
+
+    def seconds_left(self, now=None):
+        """Seconds until the next rollover."""
+        now = self.clock() if now is None else now
+        day = self._day_at(now) + timedelta(days=1)
+        # timestamp() applies the zone's offset at the boundary itself (for a
+        # naive datetime, the local zone's), so DST changes are counted.
+        boundary = datetime(day.year, day.month, day.day, self.hour, self.minute, tzinfo=self.tz)
+        return boundary.timestamp() - now
+
+    def check(self):
+        """Roll over if the business day has changed; returns True if any
+        category did. Sets `pending` while a category is still behind."""
+        day = self.business_day()
+        with self.system.locked():
+            rolled = self.system.rollover(day)
+            self.pending = bool(self.system.behind(day))
+            if rolled and self.on_rollover is not None:
+                self.on_rollover()
+            return rolled
+
+    def start(self):
+        self.check()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        # Waking a little early is harmless: check() sees the same day.
+        while not self._stop.wait(min(self.seconds_left(), RETRY_SECONDS) if self.pending
+                                  else self.seconds_left()):
+            self.check()
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,253 @@
+"""Opt-in profiling spans around the queue engines' core operations.
+
+Core methods are marked with @traced. The decorator only tags the function
+and returns it unchanged, so there is no cost at all while profiling is off.
+enable() swaps every tagged function in the given modules for a timing
+wrapper, and disable() puts the originals back.
+
+Each wrapper counts calls. With sample_every=N, about one in N top-level
+spans in a thread is timed, together with everything nested inside it, so
+sampled trees stay consistent. The gap between samples is random with mean
+N, so a workload that alternates operations is not aliased onto one of them. Timed spans feed:
+
+* a sketch.LogHistogram of latency per operation;
+* collapsed stacks ("outer;inner self_ns"), the input format of
+  flamegraph.pl and speedscope.
+
+Contoh (replay a workload and dump a flamegraph input):
+    python profiling.py --operations 200000 --collapsed antrian.folded --report antrian.json
+"""
+import argparse
+import contextlib
+import functools
+import importlib
+import json
+import os
+import random
+import threading
+import time
+
+from sketch import LogHistogram
+
+DEFAULT_MODULES = ("bc", "dispatch", "tugas", "queue_service")
+
+_active = None
+_patched = []   # (owner, attribute, original)
+
+
+def traced(func=None, *, name=None):
+    """Mark a function or method as a profiling span; returns it unchanged."""
+    def mark(f):
+        f.__traced__ = name or f"{f.__module__}.{f.__qualname__}"
+        return f
+    return mark(func) if func is not None else mark
+
+
+class _ThreadState(threading.local):
+    def __init__(self):
+        self.depth = 0
+        self.countdown = 1
+        self.sampled = False
+        self.stack = []
+        self.child_ns = []
+        self.calls = {}
+        self.latency = {}
+        self.stacks = {}
+        self.registered = False
+
+
+class Profiler:
+    def __init__(self, sample_every=1):
+        self.sample_every = sample_every
+        self._rng = random.Random()
+        self._local = _ThreadState()
+        self._threads = []           # every thread's state, merged in report()
+        self._lock = threading.Lock()
+
+    def _state(self):
+        state = self._local
+        if not state.registered:
+            state.registered = True
+            with self._lock:
+                self._threads.append(state.__dict__)
+        return state
+
+    def _enter(self, name):
+        """Start a span; returns its start time, or None if not sampled."""
+        state = self._state()
+        calls = state.calls
+        calls[name] = calls.get(name, 0) + 1
+        if not state.depth:
+            state.countdown -= 1
+            state.sampled = not state.countdown
+            if state.sampled:
+                state.countdown = self._rng.randrange(1, 2 * self.sample_every)
+        state.depth += 1
+        if not state.sampled:
+            return None
+        state.stack.append(name)
+        state.child_ns.append(0)
+        return time.perf_counter_ns()
+
+    def _exit(self, name, start):
+        state = self._local
+        state.depth -= 1
+        if start is None:
+            return
+        elapsed = time.perf_counter_ns() - start
+        stack, child_ns = state.stack, state.child_ns
+        key = ";".join(stack)
+        state.stacks[key] = state.stacks.get(key, 0) + elapsed - child_ns.pop()
+        stack.pop()
+        if child_ns:
+            child_ns[-1] += elapsed
+        histogram = state.latency.get(name)
+        if histogram is None:
+            histogram = state.latency[name] = LogHistogram()
+        histogram.record(elapsed / 1e9)
+
+    def wrap(self, func, name):
+        enter, exit_ = self._enter, self._exit
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = enter(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                exit_(name, start)
+
+        return wrapper
+
+    @contextlib.contextmanager
+    def span(self, name):
+        """Time an ad-hoc block as if it were a traced call."""
+        start = self._enter(name)
+        try:
+            yield
+        finally:
+            self._exit(name, start)
+
+    def report(self):
+        """Merge every thread's data; returns (calls, latency, stacks) dicts."""
+        calls, latency, stacks = {}, {}, {}
+        with self._lock:
+            states = list(self._threads)
+        for state in states:
+            for name, count in state["calls"].items():
+                calls[name] = calls.get(name, 0) + count
+            for name, histogram in state["latency"].items():
+                latency.setdefault(name, LogHistogram()).merge(histogram)
+            for key, ns in state["stacks"].items():
+                stacks[key] = stacks.get(key, 0) + ns
+        return calls, latency, stacks
+
+    def write_report(self, path):
+        """Call counts and latency histograms as JSON (times in microseconds)."""
+        calls, latency, _ = self.report()
+        result = {}
+        for name, count in sorted(calls.items()):
+            entry = {"calls": count, "sampled": 0}
+            histogram = latency.get(name)
+            if histogram is not None:
+                gamma = (1 + histogram.precision) / (1 - histogram.precision)
+                entry.update({
+                    "sampled": histogram.count,
+                    "mean_us": histogram.mean * 1e6,
+                    **{f"p{round(q * 100)}_us": histogram.quantile(q) * 1e6 for q in (0.5, 0.9, 0.99)},
+                    "max_us": histogram.max * 1e6,
+                    # (upper bound in us, count) per occupied bucket
+                    "histogram": [[gamma ** index * 1e6, n] for index, n in sorted(histogram.buckets.items())],
+                })
+            result[name] = entry
+        with open(path, "w") as f:
+            json.dump({"sample_every": self.sample_every, "operations": result}, f, indent=2)
+
+    def write_collapsed(self, path):
+        """Collapsed stacks with self time in ns, for flamegraph.pl."""
+        _, _, stacks = self.report()
+        with open(path, "w") as f:
+            for key, ns in sorted(stacks.items()):
+                f.write(f"{key} {ns}\n")
+
+
+def enable(sample_every=1, modules=DEFAULT_MODULES):
+    """Wrap every @traced function in `modules`; returns the Profiler."""
+    global _active
+    if _active is not None:
+        raise RuntimeError("profiling sudah aktif")
+    profiler = Profiler(sample_every)
+    for module_name in modules:
+        module = importlib.import_module(module_name)
+        owners = [module] + [value for value in vars(module).values()
+                             if isinstance(value, type) and value.__module__ == module_name]
+        for owner in owners:
+            for attribute, value in list(vars(owner).items()):
+                name = getattr(value, "__traced__", None)
+                if name is not None and callable(value):
+                    _patched.append((owner, attribute, value))
+                    setattr(owner, attribute, profiler.wrap(value, name))
+    _active = profiler
+    return profiler
+
+
+def disable():
+    """Restore the original functions; the last Profiler keeps its data."""
+    global _active
+    while _patched:
+        owner, attribute, original = _patched.pop()
+        setattr(owner, attribute, original)
+    _active = None
+
+
+def replay(operations, seed=0):
+    """Drive the CLI engines through their public operations, output muted."""
+    from bc import BankQueueSystem
+    from tugas import SistemAntrianBank
+
+    rng = random.Random(seed)
+    bank = BankQueueSystem()
+    sistem = SistemAntrianBank()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(operations):
+            category = "teller" if rng.random() < 0.75 else "cs"
+            counters = len(bank.get_counter(category).counters)
+            if rng.random() < 0.51:
+                bank.add_to_queue(category)
+                sistem.tambah_nasabah("nasabah", category)
+            else:
+                counter_id = rng.randint(1, counters)
+                bank.finish_service(category, counter_id)
+                sistem.selesaikan_layanan(category, counter_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profil operasi inti antrian dari workload replay.")
+    parser.add_argument("--operations", type=int, default=100_000)
+    parser.add_argument("--sample-every", type=int, default=1, help="ukur 1 dari N span teratas")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--collapsed", metavar="FILE", default="antrian.folded",
+                        help="collapsed stacks untuk flamegraph.pl")
+    parser.add_argument("--report", metavar="FILE", help="jumlah panggilan dan histogram latensi (JSON)")
+    args = parser.parse_args()
+
+    profiler = enable(args.sample_every)
+    try:
+        replay(args.operations, args.seed)
+    finally:
+        disable()
+    profiler.write_collapsed(args.collapsed)
+    if args.report:
+        profiler.write_report(args.report)
+
+    calls, latency, _ = profiler.report()
+    for name, count in sorted(calls.items()):
+        histogram = latency.get(name)
+        timing = (f"p50={histogram.quantile(0.5) * 1e6:.1f}us p99={histogram.quantile(0.99) * 1e6:.1f}us"
+                  if histogram else "tidak disampel")
+        print(f"{name:<50} {count:>9,} panggilan  {timing}")
+    print(f"\nCollapsed stacks: {args.collapsed}")
+
+
+if __name__ == "__main__":
+    main()
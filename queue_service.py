@@ -0,0 +1,163 @@
+"""Shared, thread-safe queue service for every UI session in a process.
+
+Streamlit runs each browser session in its own thread, so the kiosk, the
+teller screens and the lobby display all reach the same QueueService when it
+is created once per process (bc_ui.py does this with st.cache_resource).
+Every operation runs under the dispatcher's per-category lock, so issuing a
+ticket is atomic, readers see a consistent snapshot of one category, and
+teller and CS requests never block each other.
+"""
+from itertools import islice
+
+from bc import BankQueueSystem
+from estimator import WaitEstimator
+from journal import Journal
+from no_show import NoShowMonitor
+from numbering import DailyRollover
+from profiling import traced
+from status_view import WAITING_WINDOW, status_block
+
+STATUS_LIMIT = 50
+
+
+class QueueService:
+    def __init__(self, system=None, journal_dir=None, estimate_waits=True, rollover_at=None):
+        """rollover_at ("HH:MM") starts ticket numbers from 1 again every
+        day at that time, per category once its line is empty (see
+        numbering.DailyRollover)."""
+        self.system = system or BankQueueSystem()
+        if estimate_waits and self.system.estimator is None:
+            self.system.estimator = WaitEstimator(self.system)
+        self.estimator = self.system.estimator if estimate_waits else None
+        self.journal = None
+        if journal_dir:
+            self.journal = Journal(journal_dir)
+            self.journal.recover(self.system)
+            self.journal.attach(self.system)
+        if self.system.no_show is None and any(
+                category.no_show_timeout for category in self.system.categories.values()):
+            self.system.no_show = NoShowMonitor(self.system)
+            self.system.no_show.start()
+        self.rollover = None
+        if rollover_at:
+            self.rollover = DailyRollover(self.system, rollover_at,
+                                          on_rollover=self.journal.snapshot if self.journal else None)
+            self.rollover.start()
+        self.system.start()
+
+    def counter_count(self, category):
+        return len(self.system.get_counter(category).counters)
+
+    @traced
+    def issue(self, category, **options):
+        """Issue a ticket; raises QueueFullError if the line is at capacity.
+
+        options such as lane="vip" need a system built with priority=True.
+        """
+        ticket, _ = self.system.dispatcher.arrive(category, **options)
+        return ticket
+
+    @traced
+    def issue_with_estimate(self, category, **options):
+        """Issue a ticket; returns (ticket, Estimate), or (ticket, None) if
+        the ticket went straight to a counter or estimates are off."""
+        ticket, _, _, estimate = self.system.issue(category, **options)
+        return ticket, estimate if self.estimator is not None else None
+
+    @traced
+    def finish(self, category, counter_id):
+        """Finish service at a counter; returns the finished ticket or None."""
+        if not self.system.get_counter(category).is_valid_counter(counter_id):
+            return None
+        ticket, _ = self.system.dispatcher.finish(category, counter_id)
+        return ticket
+
+    @traced
+    def cancel(self, category, number):
+        """Take waiting ticket `number` out of the line; returns it or None."""
+        return self.system.dispatcher.cancel(category, number)
+
+    @traced
+    def skip(self, category, counter_id):
+        """Skip the no-show at a counter and call the next ticket; returns
+        the skipped ticket or None."""
+        if not self.system.get_counter(category).is_valid_counter(counter_id):
+            return None
+        ticket, _ = self.system.dispatcher.skip(category, counter_id)
+        return ticket
+
+    @traced
+    def recall(self, category, number):
+        """Put skipped ticket `number` back at the front of the line; returns it or None."""
+        ticket, _ = self.system.dispatcher.recall(category, number)
+        return ticket
+
+    def skipped(self, category):
+        """Skipped tickets that can be recalled, oldest first, as shown."""
+        dispatcher = self.system.dispatcher
+        with dispatcher.locks[category]:
+            return [str(ticket) for ticket in dispatcher.pools[category][0].skipped.values()]
+
+    def ticket_number(self, category, shown):
+        """The ticket number behind display number `shown` today, or None.
+
+        cancel(), recall() and position() take ticket numbers; this turns
+        what is printed on a ticket into one.
+        """
+        return self.system.ticket_number(category, shown)
+
+    def check_in(self, category, counter_id):
+        """The customer called to this counter has arrived; False if no
+        no-show timer was running for it."""
+        no_show = self.system.no_show
+        return no_show is not None and no_show.check_in(category, counter_id)
+
+    @traced
+    def position(self, category, number):
+        """1-based place in line of ticket `number`, or None if it is not waiting."""
+        return self.system.position(category, number)
+
+    @traced
+    def status(self, category, limit=STATUS_LIMIT):
+        """Return (first `limit` waiting tickets, counter labels, total waiting).
+
+        Only the head of the line is copied, so a status request costs the
+        same however long the line is. limit=None returns the whole line.
+        """
+        dispatcher = self.system.dispatcher
+        queue, counter = dispatcher.pools[category]
+        with dispatcher.locks[category]:
+            waiting = list(islice(queue.queue, limit))
+            serving = list(counter.counters)
+            total = len(queue.queue)
+        return ([str(ticket) for ticket in waiting],
+                [str(ticket) if ticket else "Kosong" for ticket in serving],
+                total)
+
+    @traced
+    def status_text(self, category, window=WAITING_WINDOW):
+        """Counter table and head of the line as one pre-formatted block.
+
+        The table is cached on the counter and only rows whose ticket
+        changed are re-formatted, so a refresh costs O(counters + window).
+        """
+        dispatcher = self.system.dispatcher
+        queue, counter = dispatcher.pools[category]
+        with dispatcher.locks[category]:
+            return status_block(counter.table, counter.counters, queue.queue, window)
+
+    def counter_table(self, category):
+        """Only the cached counter table of status_text()."""
+        dispatcher = self.system.dispatcher
+        counter = dispatcher.pools[category][1]
+        with dispatcher.locks[category]:
+            return counter.table.render(counter.counters)
+
+    def close(self):
+        self.system.close()
+        if self.rollover:
+            self.rollover.close()
+        if self.system.no_show:
+            self.system.no_show.close()
+        if self.journal:
+            self.journal.close()
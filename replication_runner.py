@@ -0,0 +1,131 @@
+"""Run independent simulation replications in parallel and merge the results.
+
+Each replication is a full simulation.Simulation day on a BankQueueSystem.
+Replications are split into chunks and sent to a ProcessPoolExecutor. Each
+worker sends back only mergeable summaries (a LogHistogram of waits plus
+busy-time totals per category), never raw wait lists.
+
+Seeds are derived per replication from the base seed, so results are the
+same for any number of workers.
+
+Contoh: python replication_runner.py --replications 200 --workers 4
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from simulation import Simulation, exponential
+from sketch import LogHistogram
+
+
+def replication_seed(seed, index):
+    return seed * 1_000_003 + index
+
+
+class ReplicationSummary:
+    """Mergeable statistics for a set of replications."""
+
+    def __init__(self):
+        self.replications = 0
+        self.customers = 0
+        self.horizon = 0.0
+        self.waits = {}   # category -> LogHistogram
+        self.busy = {}    # category -> busy seconds per counter, summed
+
+    def add_report(self, report):
+        self.replications += 1
+        self.customers += report.customers
+        self.horizon += report.horizon
+        for category, waits in report.waits.items():
+            histogram = self.waits.setdefault(category, LogHistogram())
+            for wait in waits:
+                histogram.record(wait)
+            busy = self.busy.setdefault(category, [0.0] * len(report.busy[category]))
+            for i, seconds in enumerate(report.busy[category]):
+                busy[i] += seconds
+
+    def merge(self, other):
+        self.replications += other.replications
+        self.customers += other.customers
+        self.horizon += other.horizon
+        for category, histogram in other.waits.items():
+            self.waits.setdefault(category, LogHistogram()).merge(histogram)
+        for category, busy in other.busy.items():
+            total = self.busy.setdefault(category, [0.0] * len(busy))
+            for i, seconds in enumerate(busy):
+                total[i] += seconds
+        return self
+
+    def utilisation(self, category):
+        return [b / self.horizon if self.horizon else 0.0 for b in self.busy[category]]
+
+    def format(self):
+        lines = [f"Replikasi: {self.replications:,}, nasabah: {self.customers:,}"]
+        for category, histogram in self.waits.items():
+            lines.append(f"\n=== {category} ===")
+            lines.append(f"Tunggu rata-rata: {histogram.mean / 60:.1f} menit")
+            lines.append("Persentil tunggu (menit): " + ", ".join(
+                f"p{p}={histogram.quantile(p / 100) / 60:.1f}" for p in (50, 90, 95, 99)))
+            lines.append("Utilisasi loket: " + ", ".join(
+                f"Loket {i + 1}={u:.0%}" for i, u in enumerate(self.utilisation(category))))
+        return "\n".join(lines)
+
+
+def run_chunk(simulation_kwargs, seeds):
+    """Worker entry point: run one replication per seed and summarise them."""
+    summary = ReplicationSummary()
+    for seed in seeds:
+        summary.add_report(Simulation(seed=seed, **simulation_kwargs).run())
+    return summary
+
+
+def run_replications(replications, workers=None, seed=0, chunks_per_worker=4, **simulation_kwargs):
+    """Run `replications` simulated days over `workers` processes.
+
+    simulation_kwargs are passed to Simulation (arrival_rates, service_times,
+    hours, num_tellers, num_cs). With workers=1 everything runs in-process.
+    """
+    workers = workers or os.cpu_count() or 1
+    seeds = [replication_seed(seed, i) for i in range(replications)]
+    if workers == 1:
+        return run_chunk(simulation_kwargs, seeds)
+
+    num_chunks = min(replications, workers * chunks_per_worker)
+    chunks = [seeds[i::num_chunks] for i in range(num_chunks)]
+    summary = ReplicationSummary()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for partial_summary in pool.map(run_chunk, [simulation_kwargs] * len(chunks), chunks):
+            summary.merge(partial_summary)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replikasi simulasi antrian secara paralel.")
+    parser.add_argument("--replications", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--hours", type=int, default=8)
+    parser.add_argument("--tellers", type=int, default=4)
+    parser.add_argument("--cs", type=int, default=3)
+    parser.add_argument("--teller-rate", type=float, default=50, help="nasabah per jam")
+    parser.add_argument("--cs-rate", type=float, default=15, help="nasabah per jam")
+    parser.add_argument("--teller-service", type=float, default=4, help="rata-rata menit")
+    parser.add_argument("--cs-service", type=float, default=10, help="rata-rata menit")
+    args = parser.parse_args()
+
+    summary = run_replications(
+        args.replications,
+        workers=args.workers,
+        seed=args.seed,
+        arrival_rates={"teller": args.teller_rate, "cs": args.cs_rate},
+        service_times={"teller": exponential(args.teller_service * 60),
+                       "cs": exponential(args.cs_service * 60)},
+        hours=args.hours,
+        num_tellers=args.tellers,
+        num_cs=args.cs,
+    )
+    print(summary.format())
+
+
+if __name__ == "__main__":
+    main()
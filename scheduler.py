@@ -0,0 +1,217 @@
+"""Multi-level ticket scheduler: priority lanes, aging and appointments.
+
+PriorityScheduler is a drop-in replacement for TicketQueue in bc.Queue, so
+DispatchEngine and ServiceCounter use it unchanged. Tickets are called in
+order of an effective arrival time:
+
+    arrived_ns - LANE_BOOST[lane]
+
+A VIP ticket is treated as if it arrived ten minutes earlier, and an
+elderly or disabled customer five minutes earlier. This is aging with a
+fixed head start. Every waiting ticket gets older at the same rate, so a
+normal ticket that has waited longer than the boost is called before a VIP
+who just arrived, and no lane can starve another. All lanes share one
+indexed heap, so a dispatch is O(log n) whatever the number of lanes.
+
+Appointments wait in their own heap, ordered by slot time. When a slot is
+less than `appointment_early` away, the ticket moves to the ready heap with
+an effective time of slot - APPOINTMENT_BOOST, so it is called near its
+slot ahead of walk-ins. Nothing else happens when a slot comes due, so
+bc.BankQueueSystem sets a timer per booking that calls
+DispatchEngine.dispatch() once the slot is that close.
+
+The ready tickets are also kept in a line_index.LineIndex, one lane per
+priority lane plus one for promoted appointments, so position() is
+O(lanes * log n). A booked appointment has no position until it is
+promoted.
+
+cancel() removes a ready ticket from the indexed heap in O(log n). A
+booked appointment is only dropped from the number -> entry map; its heap
+entry becomes a tombstone that promotion skips, and the heap is rebuilt
+once tombstones outnumber live bookings. recall() puts a ticket ahead of
+every lane, behind earlier recalls.
+
+place() reports where a waiting ticket stands (its lane and its arrival
+or slot time) in wall-clock nanoseconds, and restore() puts it back
+there. The scheduler clock is monotonic and restarts with the process,
+so the journal and snapshots store wall-clock times.
+"""
+import heapq
+import time
+
+from line_index import LineIndex
+from ticket_queue import COMPACT_MIN, RECALL, RECALL_KEY, IndexedPriorityQueue, QueueFullError
+
+SECOND = 1_000_000_000
+NORMAL = "normal"
+LANE_BOOST = {
+    NORMAL: 0,
+    "elderly": 5 * 60 * SECOND,
+    "disabled": 5 * 60 * SECOND,
+    "vip": 10 * 60 * SECOND,
+}
+APPOINTMENT_BOOST = 30 * 60 * SECOND
+APPOINTMENT = "appointment"     # index lane of promoted appointments
+
+
+class PriorityScheduler:
+    def __init__(self, capacity=None, boosts=None, appointment_early=5 * 60 * SECOND,
+                 clock=time.monotonic_ns):
+        if capacity is not None and capacity < 1:
+            raise ValueError("capacity harus lebih dari 0")
+        self.capacity = capacity
+        self.boosts = dict(LANE_BOOST if boosts is None else boosts)
+        self.appointment_early = appointment_early
+        self.clock = clock
+        self._ready = IndexedPriorityQueue()   # keyed by ticket number
+        self._booked = []                      # (slot_ns, number, ticket), may hold tombstones
+        self._appointments = {}                # number -> _booked entry of live bookings
+        self.index = LineIndex()               # ready tickets by number
+        self._recalls = 0
+        self.wall_offset = time.time_ns() - clock()    # clock time -> wall-clock time
+
+    def is_full(self):
+        return self.capacity is not None and len(self) >= self.capacity
+
+    def enqueue(self, ticket, lane=NORMAL, appointment_ns=None):
+        if self.is_full():
+            raise QueueFullError(f"Antrian penuh (kapasitas {self.capacity}).")
+        if appointment_ns is not None:
+            entry = (appointment_ns, ticket.number, ticket)
+            heapq.heappush(self._booked, entry)
+            self._appointments[ticket.number] = entry
+        else:
+            boost = self.boosts.get(lane)
+            if boost is None:
+                raise ValueError(f"Jalur antrian tidak dikenal: {lane!r}")
+            key = ticket.arrived_ns - boost
+            self._ready.push(ticket.number, key, ticket)
+            self.index.push(ticket.number, ticket, lane, key)
+
+    def _promote(self):
+        # Clock is only read while appointments are pending.
+        booked = self._booked
+        if booked:
+            horizon = self.clock() + self.appointment_early
+            while booked and booked[0][0] <= horizon:
+                entry = heapq.heappop(booked)
+                slot_ns, number, ticket = entry
+                if self._appointments.get(number) is not entry:
+                    continue    # cancelled
+                del self._appointments[number]
+                self._ready.push(number, slot_ns - APPOINTMENT_BOOST, ticket)
+                self.index.push(number, ticket, APPOINTMENT, slot_ns - APPOINTMENT_BOOST)
+
+    def dequeue(self):
+        """Remove and return the ticket to call next."""
+        self._promote()
+        if not self._ready:
+            raise IndexError("dequeue dari antrian kosong")
+        ticket = self._ready.pop()
+        self.index.discard(ticket.number)
+        return ticket
+
+    def peek(self):
+        self._promote()
+        if not self._ready:
+            raise IndexError("peek dari antrian kosong")
+        return self._ready.peek()
+
+    def cancel(self, number):
+        """Remove ticket `number`, ready or booked; returns it, or None."""
+        if number in self._ready:
+            self.index.discard(number)
+            return self._ready.remove(number)
+        entry = self._appointments.pop(number, None)
+        if entry is None:
+            return None
+        booked = self._booked
+        if len(booked) >= COMPACT_MIN and 2 * len(self._appointments) < len(booked):
+            appointments = self._appointments
+            self._booked = [e for e in booked if appointments.get(e[1]) is e]
+            heapq.heapify(self._booked)
+        return entry[2]
+
+    def recall(self, ticket):
+        """Put a ticket ahead of every lane, behind earlier recalls."""
+        self._recalls += 1
+        key = RECALL_KEY + self._recalls
+        self._ready.push(ticket.number, key, ticket)
+        self.index.push(ticket.number, ticket, RECALL, key)
+
+    def clear(self):
+        self._ready = IndexedPriorityQueue()
+        self._booked = []
+        self._appointments = {}
+        self.index.clear()
+
+    def find(self, number):
+        """The ticket with this number, waiting or booked, or None."""
+        ticket = self.index.get(number)
+        if ticket is None:
+            entry = self._appointments.get(number)
+            ticket = None if entry is None else entry[2]
+        return ticket
+
+    def slot_of(self, number):
+        """Slot time of booked appointment `number` (scheduler clock), or None."""
+        entry = self._appointments.get(number)
+        return None if entry is None else entry[0]
+
+    def place(self, number):
+        """(lane, wall-clock ns) of waiting ticket `number`, or None.
+
+        The time is the arrival for a priority lane, the slot for an
+        appointment (booked or promoted) and 0 for a recall.
+        """
+        entry = self._appointments.get(number)
+        if entry is not None:
+            return APPOINTMENT, entry[0] + self.wall_offset
+        lane = self.index.lane_of(number)
+        if lane is None:
+            return None
+        if lane == RECALL:
+            return RECALL, 0
+        if lane == APPOINTMENT:
+            return APPOINTMENT, self._ready.priority(number) + APPOINTMENT_BOOST + self.wall_offset
+        return lane, self.index.get(number).arrived_ns + self.wall_offset
+
+    def restore(self, ticket, lane, wall_ns):
+        """Put a ticket back where place() found it, e.g. after a restart."""
+        if lane == RECALL:
+            self.recall(ticket)
+        elif lane == APPOINTMENT:
+            self.enqueue(ticket, appointment_ns=wall_ns - self.wall_offset)
+        else:
+            ticket.arrived_ns = wall_ns - self.wall_offset
+            self.enqueue(ticket, lane)
+
+    def ahead(self, number):
+        """Ready tickets called before ticket `number`, or None if it is not ready."""
+        self._promote()
+        return self.index.ahead(number)
+
+    def position(self, number):
+        """1-based place in the ready line of ticket `number`, or None."""
+        ahead = self.ahead(number)
+        return None if ahead is None else ahead + 1
+
+    def __bool__(self):
+        # True only if a ticket can be called now; future appointments wait.
+        self._promote()
+        return len(self._ready) > 0
+
+    def __len__(self):
+        return len(self._ready) + len(self._appointments)
+
+    def __iter__(self):
+        """Ready tickets in call order, then appointments by slot."""
+        self._promote()
+        yield from self._ready
+        appointments = self._appointments
+        for entry in sorted(self._booked):
+            if appointments.get(entry[1]) is entry:
+                yield entry[2]
+
+    def __repr__(self):
+        return f"PriorityScheduler({list(self)!r}, capacity={self.capacity})"
@@ -0,0 +1,73 @@
+import math
+
+
+class LogHistogram:
+    """Mergeable HDR-style histogram with bounded relative error.
+
+    Positive values land in logarithmic buckets, so any quantile is returned
+    within `precision` relative error while memory stays bounded by the value
+    range rather than the number of samples. Values at or below zero_threshold
+    (e.g. a wait of zero) are counted separately. Two histograms with the same
+    precision can be merged, which is how per-worker results are combined.
+    """
+
+    def __init__(self, precision=0.01, zero_threshold=1e-9):
+        self.precision = precision
+        self.zero_threshold = zero_threshold
+        self._gamma = (1 + precision) / (1 - precision)
+        self._inv_log_gamma = 1 / math.log(self._gamma)
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def record(self, value):
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value <= self.zero_threshold:
+            self.zero_count += 1
+        else:
+            index = math.ceil(math.log(value) * self._inv_log_gamma)
+            buckets = self.buckets
+            buckets[index] = buckets.get(index, 0) + 1
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError("histogram dengan presisi berbeda tidak bisa digabung")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q):
+        """Nearest-rank quantile (0 <= q <= 1); 0.0 for an empty histogram."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        if rank <= self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                # Midpoint (in relative terms) of (gamma^(i-1), gamma^i].
+                value = 2 * self._gamma ** index / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def __len__(self):
+        return self.count
@@ -0,0 +1,126 @@
+"""Skill-based routing: counters shared across service categories.
+
+Each counter declares the categories it can serve, so an idle CS counter
+that also knows teller work picks up the teller line instead of sitting
+empty. Counter ids are global (1..N): every category's ServiceCounter has
+all N counters and only fills the ones serving its own tickets.
+
+SkillRouting plugs into DispatchEngine, which keeps its per-category locks,
+listeners and journal path. Two indexes keep every decision independent
+of the number of queues:
+
+* per category, a bitmask of the counters with that skill; an arrival
+  finds an idle, skilled counter with one AND on the shared free-counter
+  bitmap;
+* per counter, the tuple of its skills; a counter that becomes free only
+  looks at the heads of the lines it can serve.
+
+Freeing a shared counter takes the locks of every category it serves, in
+the same sorted order as BankQueueSystem.locked(), so the counter either
+takes a waiting ticket or is marked free before any of those lines can
+change. An arrival then only needs its own category lock. The routing's
+own lock guards the shared bitmap and is always taken last.
+
+When a freed counter could serve several lines, the policy chooses:
+
+* LONGEST_WAIT: the line whose head ticket has waited longest;
+* WEIGHTED_FAIR: the line with the least service given relative to its
+  weight (start-time fair queuing), so e.g. teller:cs = 3:1 holds under
+  sustained load and no line starves.
+
+    routing = SkillRouting(default_categories(), [
+        ("teller",), ("teller",), ("teller", "cs"), ("teller", "cs"), ("cs",),
+    ])
+    system = BankQueueSystem(routing=routing)
+    ticket, assignments = system.dispatcher.arrive("teller")
+    ticket, assignments = system.dispatcher.finish("teller", 3)
+"""
+import threading
+
+from counter_index import FreeCounterIndex
+from categories import validate
+
+LONGEST_WAIT = "longest_wait"
+WEIGHTED_FAIR = "weighted_fair"
+
+
+class SkillRouting:
+    def __init__(self, categories, counter_skills, policy=LONGEST_WAIT, weights=None):
+        """counter_skills holds one iterable of category keys per counter."""
+        validate(categories)
+        if policy not in (LONGEST_WAIT, WEIGHTED_FAIR):
+            raise ValueError(f"Kebijakan routing tidak dikenal: {policy!r}")
+        keys = [c.key for c in categories]
+        self.skills = [tuple(skills) for skills in counter_skills]
+        self.skill_mask = dict.fromkeys(keys, 0)
+        for idx, skills in enumerate(self.skills):
+            for key in skills:
+                if key not in self.skill_mask:
+                    raise ValueError(f"Loket {idx + 1} melayani kategori tidak dikenal: {key!r}")
+                self.skill_mask[key] |= 1 << idx
+        for key, mask in self.skill_mask.items():
+            if not mask:
+                raise ValueError(f"Tidak ada loket yang melayani kategori {key!r}.")
+        # Lock order per counter: its skills, sorted like BankQueueSystem.locked().
+        self.lock_order = [tuple(sorted(set(skills))) for skills in self.skills]
+        self.size = len(self.skills)
+        self.free = FreeCounterIndex(self.size)
+        self.policy = policy
+        self.weights = dict.fromkeys(keys, 1.0)
+        self.weights.update(weights or {})
+        # Fair-queuing virtual time: service given to each line divided by
+        # its weight, and the tag of the last line served.
+        self.virtual = dict.fromkeys(keys, 0.0)
+        self.now_virtual = 0.0
+        self._lock = threading.Lock()
+
+    def waking(self, category):
+        # Called under the category lock before a ticket joins an empty
+        # line: a line that was empty does not bank credit for later.
+        with self._lock:
+            self.virtual[category] = max(self.virtual[category], self.now_virtual)
+
+    def acquire(self, category):
+        """Mark the lowest idle counter with this skill busy; its index or None."""
+        with self._lock:
+            return self.free.acquire_from(self.skill_mask[category])
+
+    def release(self, idx):
+        with self._lock:
+            self.free.release(idx)
+
+    def charge(self, category):
+        """Account one service to `category` (weighted fair queuing)."""
+        with self._lock:
+            self.now_virtual = self.virtual[category]
+            self.virtual[category] += 1.0 / self.weights[category]
+
+    def pick(self, idx, pools):
+        """The line freed counter idx serves next, or None if all are empty.
+
+        The caller holds the lock of every category in lock_order[idx].
+        """
+        best = None
+        if self.policy == LONGEST_WAIT:
+            oldest = None
+            for key in self.skills[idx]:
+                line = pools[key][0].queue
+                if line:
+                    arrived = line.peek().arrived_ns
+                    if oldest is None or arrived < oldest:
+                        best, oldest = key, arrived
+        else:
+            virtual = self.virtual
+            for key in self.skills[idx]:
+                if pools[key][0].queue and (best is None or virtual[key] < virtual[best]):
+                    best = key
+        return best
+
+    def restore(self, counters):
+        """Rebuild the shared bitmap from every category's ServiceCounter."""
+        with self._lock:
+            self.free = FreeCounterIndex(self.size)
+            for counter in counters:
+                for idx, ticket in enumerate(counter.counters):
+                    if ticket is not None:
+                        self.free.mark_busy(idx)
@@ -0,0 +1,167 @@
+"""Asyncio pub/sub feed that pushes incremental queue updates to displays.
+
+Lobby displays and teller screens subscribe once and then receive small
+diffs ("A 042 -> Loket 3", "B 007 selesai di Loket 2") instead of
+re-rendering the whole table. Every subscriber starts with one snapshot
+message. Each subscriber has a bounded buffer. When a slow consumer
+overflows it, the backlog is dropped and replaced by one fresh snapshot.
+That coalesces the stale diffs, and memory stays bounded no matter how far
+behind a display falls.
+
+A snapshot is the board a lobby display shows: per category, the ticket
+at each counter and how many are waiting. The feed keeps that board
+itself, updated by every event under the feed's own lock, so a snapshot
+never takes a dispatcher lock on the event-loop thread. Every event gets
+a per-category sequence number, carried by diffs and by the snapshot.
+Diffs raised on other threads can still be queued on the loop when a
+snapshot is taken. A subscription drops every diff whose sequence the
+snapshot already covers, so no event is applied twice. Clients that keep
+their own state can apply the same rule.
+
+    feed = StatusFeed(service.system)
+    async for message in feed.subscribe():
+        ...
+"""
+import asyncio
+import threading
+from collections import deque
+
+DEFAULT_BUFFER = 256
+
+
+def describe(event, ticket, counter_id):
+    if event == "enqueue":
+        return f"{ticket} menunggu"
+    if event == "assign":
+        return f"{ticket} → Loket {counter_id}"
+    if event == "cancel":
+        return f"{ticket} dibatalkan"
+    if event == "skip":
+        return f"{ticket} tidak hadir di Loket {counter_id}"
+    if event == "recall":
+        return f"{ticket} dipanggil ulang"
+    return f"{ticket} selesai di Loket {counter_id}"
+
+
+class Subscription:
+    def __init__(self, feed, maxsize):
+        self.feed = feed
+        self.maxsize = maxsize
+        self.buffer = deque()
+        self.resync = True      # first message is always a snapshot
+        self.coalesced = 0      # how many times the backlog was replaced
+        self.seen = {}          # category -> last sequence the client has
+        self._wakeup = asyncio.Event()
+
+    def _push(self, message):
+        if self.resync or message["seq"] <= self.seen.get(message["category"], 0):
+            return
+        if len(self.buffer) >= self.maxsize:
+            self.buffer.clear()
+            self.resync = True
+            self.coalesced += 1
+        else:
+            self.buffer.append(message)
+        self._wakeup.set()
+
+    async def get(self):
+        while not self.buffer and not self.resync:
+            self._wakeup.clear()
+            await self._wakeup.wait()
+        if self.resync:
+            self.resync = False
+            self.buffer.clear()
+            state = self.feed.snapshot()
+            self.seen = {category: board["seq"] for category, board in state.items()}
+            return {"type": "snapshot", "state": state}
+        message = self.buffer.popleft()
+        self.seen[message["category"]] = message["seq"]
+        return message
+
+    def close(self):
+        self.feed.unsubscribe(self)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.get()
+
+
+class StatusFeed:
+    def __init__(self, system, buffer_size=DEFAULT_BUFFER):
+        """Create the feed after the system is recovered: the board starts
+        from the system's state and then follows its events."""
+        self.system = system
+        self.buffer_size = buffer_size
+        self.subscribers = set()
+        self.loop = None
+        self._loop_thread = None
+        self._lock = threading.Lock()
+        self._board = {}
+        dispatcher = system.dispatcher
+        with system.locked():
+            for category, (queue, counter) in dispatcher.pools.items():
+                self._board[category] = {
+                    "serving": [None if ticket is None else str(ticket) for ticket in counter.counters],
+                    "waiting": len(queue.queue),
+                    "seq": 0,
+                }
+            system.subscribe(self._on_event)
+
+    def snapshot(self):
+        """Per category: the ticket at each counter, the number waiting and
+        the sequence of the last event included."""
+        with self._lock:
+            return {category: {"serving": list(board["serving"]), "waiting": board["waiting"],
+                               "seq": board["seq"]}
+                    for category, board in self._board.items()}
+
+    def subscribe(self, maxsize=None):
+        """Create a subscription; must be called from the running event loop."""
+        if self.loop is None:
+            self.loop = asyncio.get_running_loop()
+            self._loop_thread = threading.get_ident()
+        subscription = Subscription(self, maxsize or self.buffer_size)
+        self.subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        self.subscribers.discard(subscription)
+
+    def _on_event(self, event, category, ticket, counter_id):
+        # Called by the dispatcher under the category lock, possibly from a
+        # request thread, so the events of one category arrive in order.
+        shown = str(ticket)
+        with self._lock:
+            board = self._board[category]
+            if event == "enqueue" or event == "recall":
+                board["waiting"] += 1
+            elif event == "assign":
+                board["waiting"] -= 1
+                board["serving"][counter_id - 1] = shown
+            elif event == "cancel":
+                board["waiting"] -= 1
+            else:
+                board["serving"][counter_id - 1] = None
+            board["seq"] += 1
+            seq = board["seq"]
+        if self.loop is None or not self.subscribers:
+            return
+        message = {
+            "type": "diff",
+            "seq": seq,
+            "event": event,
+            "category": category,
+            "ticket": shown,
+            "counter": counter_id,
+            "text": describe(event, ticket, counter_id),
+        }
+        if threading.get_ident() == self._loop_thread:
+            self.publish(message)
+        else:
+            self.loop.call_soon_threadsafe(self.publish, message)
+
+    def publish(self, message):
+        for subscription in self.subscribers:
+            subscription._push(message)
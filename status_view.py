@@ -0,0 +1,82 @@
+"""Cached status rendering shared by the CLI and the Streamlit page.
+
+A status view is one pre-formatted text block: the counter table, then the
+head of the waiting line.
+
+* CounterTable keeps the formatted row of every counter and the joined
+  table. On render it compares each counter's ticket by identity with the
+  ticket it last formatted, and re-formats only the rows that changed. The
+  request path pays nothing: there are no listeners or hooks, and a state
+  restored from a journal is picked up the same way. The layout is
+  tabulate's "simple" format, which the CLI has always printed, without
+  the call into tabulate.
+* waiting_block() shows the first `window` waiting tickets and a count of
+  the rest, so rendering costs the same whatever the length of the line.
+"""
+from itertools import islice
+
+WAITING_WINDOW = 20
+EMPTY = "Kosong"
+PADDING = 2          # tabulate pads header columns by two spaces
+
+
+class CounterTable:
+    """Counter table of one category; the caller holds the category lock."""
+
+    def __init__(self, counter_type, size):
+        self.headers = (f"{counter_type} Counter", "Nomor Antrian")
+        self.labels = [f"Loket {i}" for i in range(1, size + 1)]
+        self.cells = [EMPTY] * size
+        self._tickets = [None] * size     # ticket each row was formatted for
+        self._rows = [None] * size        # formatted row, None = stale
+        self._label_width = max(len(self.headers[0]) + PADDING, *map(len, self.labels))
+        self._cell_width = len(self.headers[1]) + PADDING
+        self._text = None
+
+    def render(self, counters):
+        """The table for `counters` (ServiceCounter.counters)."""
+        tickets, cells, rows = self._tickets, self.cells, self._rows
+        changed = False
+        for idx, ticket in enumerate(counters):
+            if ticket is not tickets[idx]:
+                tickets[idx] = ticket
+                cells[idx] = EMPTY if ticket is None else str(ticket)
+                rows[idx] = None
+                changed = True
+        if changed:
+            # Like tabulate, the ticket column is as wide as its widest cell.
+            width = max(len(self.headers[1]) + PADDING, *map(len, cells))
+            if width != self._cell_width:
+                self._cell_width = width
+                rows[:] = [None] * len(rows)
+            self._text = None
+        if self._text is None:
+            self._text = self._format()
+        return self._text
+
+    def _format(self):
+        label_width, cell_width = self._label_width, self._cell_width
+        rows = self._rows
+        for idx, row in enumerate(rows):
+            if row is None:
+                rows[idx] = f"{self.labels[idx]:<{label_width}}  {self.cells[idx]}".rstrip()
+        header = f"{self.headers[0]:<{label_width}}  {self.headers[1]}"
+        rule = f"{'-' * label_width}  {'-' * cell_width}"
+        return "\n".join([header, rule, *rows])
+
+
+def waiting_block(line, window=WAITING_WINDOW):
+    """The first `window` tickets of `line` and how many more are waiting."""
+    total = len(line)
+    if not total:
+        return "Antrian Menunggu:\nTidak ada antrian."
+    lines = ["Antrian Menunggu:"]
+    lines.extend(str(ticket) for ticket in islice(line, window))
+    if total > window:
+        lines.append(f"... dan {total - window} antrian lainnya.")
+    return "\n".join(lines)
+
+
+def status_block(table, counters, line, window=WAITING_WINDOW):
+    """Counter table and waiting window as one block, laid out as the CLI prints it."""
+    return f"{table.render(counters)}\n\n{waiting_block(line, window)}"
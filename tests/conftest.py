@@ -0,0 +1,36 @@
+"""Inputs shared by several test modules."""
+import random
+
+import pytest
+
+from bc import BankQueueSystem
+
+
+@pytest.fixture(scope="module")
+def driver_commands():
+    """2,000 lines of batch driver input: issues, and finishes only at busy
+    counters, so most commands call a ticket or free a counter."""
+    rng = random.Random(0)
+    system = BankQueueSystem()
+    lines = []
+    while len(lines) < 2_000:
+        category = "teller" if rng.random() < 0.75 else "cs"
+        busy = [i for i, ticket in enumerate(system.get_counter(category).counters, 1) if ticket is not None]
+        if busy and rng.random() < 0.45:
+            counter_id = rng.choice(busy)
+            system.dispatcher.finish(category, counter_id)
+            lines.append(f"finish {category} {counter_id}\n")
+        else:
+            system.dispatcher.arrive(category)
+            lines.append(f"issue {category}\n")
+    return lines
+
+
+@pytest.fixture
+def hourly_profiles():
+    """Three random 8-hour arrival profiles with a lunchtime bump (per hour)."""
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(42)
+    base = rng.uniform(20, 60, size=(3, 1))
+    lunch = np.exp(-0.5 * ((np.arange(8) - 4) / 1.2) ** 2)
+    return base * (0.7 + 0.6 * lunch) * rng.uniform(0.8, 1.2, size=(3, 8))
@@ -0,0 +1,100 @@
+"""The batch driver prints exactly what the interactive menus print.
+
+The same commands are fed as keystrokes to the menus (bc.BankQueueSystem.main_menu
+and tugas.main). Menus, prompts and screen clears are stripped from their
+output, and the rest must equal the driver's output byte for byte.
+"""
+import contextlib
+import io
+from unittest import mock
+
+import pytest
+
+import bc
+import tugas
+from batch_driver import build_engine, run
+
+
+def driver_output(engine, lines):
+    _, commands, categories = build_engine(engine)
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        run(lines, commands, categories)
+    return out.getvalue()
+
+
+def menu_output(engine, lines):
+    """Output of the interactive menu fed the same commands as keystrokes."""
+    keys = []
+    out = io.StringIO()
+    if engine == "bc":
+        system = bc.BankQueueSystem()
+        system.estimator = bc.WaitEstimator(system)
+        actions = [label for label, _ in system.menu_actions()]
+        labels = {key: c.label for key, c in system.categories.items()}
+        verbs = {"issue": "Tambah Antrian", "status": "Lihat Antrian", "finish": "Selesaikan Layanan",
+                 "cancel": "Batalkan Antrian", "skip": "Tidak Hadir", "recall": "Panggil Ulang"}
+        for line in lines:
+            verb, category, *args = line.split()
+            keys.append(str(actions.index(f"{verbs[verb]} {labels[category]}") + 1))
+            keys.extend(args)
+            keys.append("")                                  # Tekan Enter
+        keys.append(str(len(actions) + 1))
+        with mock.patch("sys.stdin", io.StringIO("\n".join(keys) + "\n")), contextlib.redirect_stdout(out):
+            system.main_menu()
+        menu = "\033[H\033[2J\n=== Sistem Antrian Bank ===\n" + "".join(
+            f"{n}. {label}\n" for n, label in enumerate(actions + ["Keluar"], 1)) + "Pilih menu: "
+        chrome = [menu, "\nTekan Enter untuk kembali ke menu...", "Keluar dari sistem.\n"]
+        for c in system.counters.values():
+            chrome += [f"Masukkan ID Loket yang ingin diselesaikan (1-{len(c.counters)}): ",
+                       f"Masukkan ID Loket yang nasabahnya tidak hadir (1-{len(c.counters)}): "]
+        chrome += ["Masukkan nomor antrian yang dibatalkan: ", "Masukkan nomor antrian yang dipanggil ulang: "]
+    else:
+        categories = list(tugas.default_categories())
+        keys_of = [c.key for c in categories]
+        options = {"issue": "1", "status": "2", "finish": "3"}
+        for line in lines:
+            verb, category, *args = line.split()
+            keys.append(str(keys_of.index(category) + 1))
+            keys.append(options[verb])
+            if verb != "status":
+                keys.append(" ".join(args))
+            keys.append("4")
+        keys.append(str(len(categories) + 1))
+        with mock.patch("sys.stdin", io.StringIO("\n".join(keys) + "\n")), contextlib.redirect_stdout(out):
+            tugas.main()
+        exit_key = len(categories) + 1
+        chrome = ["\n--- SISTEM ANTRIAN BANK ---\n" + "".join(
+            f"{n}. {c.label}\n" for n, c in enumerate(categories, 1)) + f"{exit_key}. Keluar\n"
+            + f"Pilih layanan (1-{exit_key}): "]
+        chrome += [f"\n--- MENU {c.key.upper()} ---\n1. Ambil Nomor Antrian\n2. Lihat Status Antrian\n"
+                   "3. Selesaikan Layanan\n4. Kembali ke Menu Utama\nPilih opsi: " for c in categories]
+        chrome += ["Masukkan nama Anda: ", "Masukkan nomor loket: ", "Terima kasih. Selamat tinggal!\n"]
+    transcript = out.getvalue()
+    for text in chrome:
+        transcript = transcript.replace(text, "")
+    return transcript
+
+
+def bank_only(lines):
+    """cancel/skip/recall commands (bc only) for the state `lines` leave behind."""
+    system, commands, categories = build_engine("bc")
+    with contextlib.redirect_stdout(io.StringIO()):
+        run(lines, commands, categories)
+    waiting = [ticket.number for ticket in system.queues["teller"].queue]
+    serving = system.counters["teller"].counters[0].number
+    return [f"cancel teller {waiting[-1]}\n", f"cancel teller {waiting[-1]}\n",
+            f"cancel teller {waiting[len(waiting) // 2]}\n", "cancel cs x\n",
+            "skip teller 1\n", "skip teller 9\n", "status teller\n",
+            f"recall teller {serving}\n", f"recall teller {serving}\n", "recall cs 1\n",
+            "finish teller 2\n", "status teller\n"]
+
+
+@pytest.mark.parametrize("engine", ["bc", "tugas"])
+def test_driver_matches_menus(engine, driver_commands):
+    lines = list(driver_commands)
+    # Every status view and the awkward inputs the menus also accept.
+    lines += ["status teller\n", "status cs\n", "finish teller 9\n", "finish cs 0\n",
+              "finish cs x\n", "finish teller 1\n", "status teller\n"]
+    commands = lines + bank_only(lines) if engine == "bc" else lines
+    assert driver_output(engine, commands) == menu_output(engine, commands)
@@ -0,0 +1,19 @@
+"""fifo_waits gives the waits a replay through the real dispatcher gives."""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from batch_simulation import fifo_waits, poisson_arrivals, service_times
+from simulation import replay
+
+
+@pytest.mark.parametrize("counters", [1, 2, 4, 7])
+def test_fifo_waits_match_replay(counters, hourly_profiles, seed=42):
+    rng = np.random.default_rng(seed)
+    arrivals = poisson_arrivals(rng, hourly_profiles)
+    services = service_times(rng, arrivals.shape, mean=300.0)
+    batch = fifo_waits(arrivals, services, np.full(len(arrivals), counters))
+    for row in range(len(arrivals)):
+        n = np.count_nonzero(np.isfinite(arrivals[row]))
+        scalar = replay(arrivals[row, :n].tolist(), services[row, :n].tolist(), counters)
+        np.testing.assert_allclose(batch[row, :n], scalar, rtol=0, atol=1e-9)
@@ -0,0 +1,60 @@
+"""Branch sharding in one process and in worker processes."""
+import threading
+
+import pytest
+
+from branches import BranchRegistry
+
+REQUESTS = [("issue", f"cabang-{i % 7}", "teller" if i % 3 else "cs") for i in range(40)] + [
+    ("finish", f"cabang-{i}", "teller", 1) for i in range(7)]
+
+
+def finishes(action, timeout=30):
+    """Run action() on a thread; False if it is still blocked after `timeout` s."""
+    thread = threading.Thread(target=action, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    return not thread.is_alive()
+
+
+def shown(results):
+    return [str(result) for result in results]
+
+
+def test_worker_processes_match_in_process_shards():
+    local = BranchRegistry(shards=3)
+    remote = BranchRegistry(shards=3, processes=True)
+    try:
+        assert shown(remote.execute(REQUESTS)) == shown(local.execute(REQUESTS))
+        assert remote.metrics() == local.metrics()
+    finally:
+        assert finishes(remote.close)
+
+
+def test_failed_send_leaves_shards_usable():
+    # A request that cannot be pickled fails in send(); the shard's lock must
+    # be released and its pipe left in step, or the next request and close()
+    # block for good.
+    registry = BranchRegistry(shards=2, processes=True)
+    try:
+        with pytest.raises(TypeError):
+            registry.call("issue", "cabang-1", "teller", threading.Lock())
+        with pytest.raises(TypeError):
+            registry.execute([("issue", "cabang-1", "teller"), ("issue", "cabang-2", "teller", threading.Lock()),
+                              ("issue", "cabang-3", "cs")])
+        # cabang-1 already has A 001 if its shard was sent to before the failure.
+        assert str(registry.call("issue", "cabang-1", "teller")) in ("A 001", "A 002")
+        assert registry.metrics()["branches"] >= 1
+    finally:
+        assert finishes(registry.close)
+
+
+def test_only_listed_operations_run():
+    registry = BranchRegistry(shards=2)
+    for operation in ("branch", "execute", "__init__", "nonexistent"):
+        with pytest.raises(ValueError):
+            registry.call(operation, "cabang-1")
+    assert registry.metrics()["branches"] == 0
+    [result] = registry.execute([("branches", "cabang-1")])
+    assert isinstance(result, ValueError)
+    assert str(registry.call("issue", "cabang-1", "teller")) == "A 001"
@@ -0,0 +1,180 @@
+"""Cancel, skip and recall against plain-list models, through the journal,
+and the no-show timers on a fake clock."""
+import random
+import tracemalloc
+
+from bc import BankQueueSystem
+from categories import Category
+from journal import Journal
+from no_show import NoShowMonitor
+from scheduler import LANE_BOOST, SECOND, PriorityScheduler
+from ticket_queue import Ticket, TicketLine
+
+LANES = list(LANE_BOOST)
+
+
+def test_fifo_line_matches_model(steps=50_000):
+    rng = random.Random(0)
+    line = TicketLine()
+    recalled, waiting = [], []      # the model: recalls first, then FIFO
+    called = []
+    for number in range(1, steps + 1):
+        r = rng.random()
+        if r < 0.4:
+            line.enqueue(Ticket("A", number))
+            waiting.append(number)
+        elif r < 0.7:
+            if line:
+                ticket = line.dequeue()
+                assert ticket.number == (recalled or waiting).pop(0)
+                called.append(ticket)
+        elif r < 0.9:
+            model = recalled + waiting
+            target = rng.choice(model) if model and rng.random() < 0.9 else -number
+            ticket = line.cancel(target)
+            if target in recalled:
+                recalled.remove(target)
+            elif target in waiting:
+                waiting.remove(target)
+            else:
+                assert ticket is None
+                continue
+            assert ticket.number == target
+        elif called:
+            ticket = called.pop(rng.randrange(len(called)))
+            line.recall(ticket)
+            recalled.append(ticket.number)
+        if number % 100 == 0:
+            model = recalled + waiting
+            assert [t.number for t in line] == model
+            assert len(line) == len(model)
+            for n in model[::max(1, len(model) // 20)]:
+                assert line.position(n) == model.index(n) + 1
+
+
+def test_cancelled_tickets_are_let_go():
+    # Tombstones are compacted away, so cancelling most of a long line
+    # frees most of the memory its tickets held.
+    line = TicketLine()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for number in range(1, 10_001):
+            line.enqueue(Ticket("A", number, arrived_ns=0))
+        full = tracemalloc.get_traced_memory()[0] - before
+        for number in range(1, 10_001):
+            if number % 100:
+                line.cancel(number)
+        left = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    assert [t.number for t in line] == list(range(100, 10_001, 100))
+    assert left < full / 2
+
+
+def test_scheduler_matches_model(steps=20_000):
+    rng = random.Random(1)
+    now = [0]
+    line = PriorityScheduler(clock=lambda: now[0])
+    live, recalls = set(), []
+    for number in range(1, steps + 1):
+        now[0] += rng.randrange(0, 30 * SECOND)
+        r = rng.random()
+        if r < 0.5:
+            ticket = Ticket("A", number, arrived_ns=now[0])
+            if rng.random() < 0.2:
+                line.enqueue(ticket, appointment_ns=now[0] + rng.randrange(0, 3600 * SECOND))
+            else:
+                line.enqueue(ticket, lane=rng.choice(LANES))
+            live.add(number)
+        elif r < 0.75:
+            if line:
+                ticket = line.dequeue()
+                assert ticket.number in live
+                if recalls:
+                    assert ticket.number == recalls.pop(0)
+                live.discard(ticket.number)
+                if rng.random() < 0.2:
+                    line.recall(ticket)
+                    recalls.append(ticket.number)
+                    live.add(ticket.number)
+        elif live:
+            target = rng.choice(sorted(live)) if rng.random() < 0.9 else -number
+            ticket = line.cancel(target)
+            if target < 0:
+                assert ticket is None
+                continue
+            assert ticket.number == target
+            live.discard(target)
+            if target in recalls:
+                recalls.remove(target)
+            assert line.cancel(target) is None
+        if number % 100 == 0:
+            assert len(line) == len(live)
+            assert {t.number for t in line} == live
+    now[0] += 10 * 3600 * SECOND
+    drained = set()
+    while line:
+        drained.add(line.dequeue().number)
+    assert drained == live
+
+
+def test_journal_replays_cancel_skip_recall(tmp_path, events=30_000):
+    rng = random.Random(2)
+    directory = str(tmp_path)
+    system = BankQueueSystem()
+    journal = Journal(directory, snapshot_every=5_000)
+    journal.attach(system)
+    dispatcher = system.dispatcher
+    for _ in range(events):
+        category = "teller" if rng.random() < 0.75 else "cs"
+        queue = system.queues[category]
+        counters = len(system.get_counter(category).counters)
+        r = rng.random()
+        if r < 0.45:
+            dispatcher.arrive(category)
+        elif r < 0.75:
+            dispatcher.finish(category, rng.randint(1, counters))
+        elif r < 0.85:
+            dispatcher.cancel(category, rng.randint(1, queue.last_ticket + 1))
+        elif r < 0.93:
+            dispatcher.skip(category, rng.randint(1, counters))
+        elif queue.skipped:
+            dispatcher.recall(category, rng.choice(list(queue.skipped)))
+    journal.close()
+    restored = BankQueueSystem()
+    Journal(directory).recover(restored)
+    assert restored.snapshot_state() == system.snapshot_state()
+
+
+def test_no_show_timers():
+    now = [0.0]
+    system = BankQueueSystem(categories=[Category("teller", "A", "Teller", 4, no_show_timeout=60),
+                                         Category("cs", "B", "Customer Service", 3)])
+    announced = []
+    system.on_assign = announced.extend
+    monitor = NoShowMonitor(system, clock=lambda: now[0])
+    dispatcher = system.dispatcher
+    for _ in range(8):
+        dispatcher.arrive("teller")
+        dispatcher.arrive("cs")
+    serving = system.get_counter("teller").counters
+    assert monitor.check_in("teller", 2) and not monitor.check_in("teller", 2)
+    dispatcher.finish("teller", 3)              # A 3 served; A 5 called to counter 3
+    now[0] = 59.0
+    assert monitor.advance() == 0
+    now[0] = 61.0
+    monitor.advance()
+    # A 1, A 4 and A 5 did not show up; A 6, A 7 and A 8 took their counters.
+    assert list(system.queues["teller"].skipped) == [1, 4, 5]
+    assert [t.number for t in serving] == [6, 2, 8, 7]
+    # The counters the timer handed on are announced.
+    assert sorted((c, t.number) for c, t in announced) == [(1, 6), (3, 8), (4, 7)]
+    assert system.queues["cs"].skipped == {}
+    dispatcher.recall("teller", 4)              # waits at the front of the line
+    now[0] = 200.0
+    monitor.advance()
+    # A 6 gives counter 1 to the recalled A 4; nothing waits for 3 and 4.
+    assert list(system.queues["teller"].skipped) == [1, 5, 6, 7, 8]
+    assert [t and t.number for t in serving] == [4, 2, None, None]
+    assert monitor.skipped == 6 and len(monitor.wheel) == 1
@@ -0,0 +1,56 @@
+"""Recovery puts priority tickets back in their lane, at their place, and
+re-arms the timers of booked appointments."""
+import random
+
+import pytest
+
+from bc import BankQueueSystem
+from journal import Journal
+from scheduler import SECOND
+
+LANES = ["normal", "vip", "elderly", "disabled"]
+
+
+def drive(system, journal, rng, events=3000, snapshot_every=None):
+    dispatcher = system.dispatcher
+    for i in range(events):
+        category = "teller" if rng.random() < 0.7 else "cs"
+        queue = system.queues[category]
+        counters = len(system.counters[category].counters)
+        r = rng.random()
+        if r < 0.4:
+            dispatcher.arrive(category, lane=rng.choice(LANES))
+        elif r < 0.5:
+            slot = queue.queue.clock() + rng.randrange(-3600, 3 * 3600) * SECOND
+            dispatcher.arrive(category, appointment_ns=slot)
+        elif r < 0.75:
+            dispatcher.finish(category, rng.randint(1, counters))
+        elif r < 0.85:
+            dispatcher.cancel(category, rng.randint(1, queue.last_ticket + 1))
+        elif r < 0.93:
+            dispatcher.skip(category, rng.randint(1, counters))
+        elif queue.skipped:
+            dispatcher.recall(category, rng.choice(list(queue.skipped)))
+        if snapshot_every and i % snapshot_every == 0:
+            journal.snapshot()
+
+
+@pytest.mark.parametrize("snapshot_every", [None, 500])
+def test_recovery_restores_lanes_and_appointments(tmp_path, snapshot_every):
+    system = BankQueueSystem(num_tellers=2, num_cs=1, priority=True)
+    journal = Journal(str(tmp_path))
+    journal.attach(system)
+    drive(system, journal, random.Random(0), snapshot_every=snapshot_every)
+    journal.close()
+
+    restored = BankQueueSystem(num_tellers=2, num_cs=1, priority=True)
+    assert Journal(str(tmp_path)).recover(restored) == journal.seq
+    assert restored.snapshot_state() == system.snapshot_state()
+    booked = 0
+    for category, queue in system.queues.items():
+        line = restored.queues[category].queue
+        assert [t.number for t in line] == [t.number for t in queue.queue]
+        for ticket in queue.queue:
+            assert line.place(ticket.number) == queue.queue.place(ticket.number)
+        booked += sum(queue.queue.slot_of(ticket.number) is not None for ticket in queue.queue)
+    assert booked and len(restored.appointment_timers) >= booked
@@ -0,0 +1,79 @@
+"""Positions from the line indexes equal the place in the line's own order.
+
+A FIFO TicketLine, a PriorityScheduler and the tugas engine go through
+random issue/call/leave events.
+"""
+import contextlib
+import os
+import random
+
+from scheduler import LANE_BOOST, SECOND, PriorityScheduler
+from ticket_queue import Ticket, TicketLine
+from tugas import SistemAntrianBank
+
+LANES = list(LANE_BOOST)
+
+
+def drive_line(line, rng, steps=20_000, lanes=False):
+    now = [0]
+    if lanes:
+        line.clock = lambda: now[0]
+    waiting = set()
+    for number in range(1, steps + 1):
+        now[0] += rng.randrange(0, 30 * SECOND)
+        r = rng.random()
+        if r < 0.55:
+            options = {}
+            if lanes:
+                if rng.random() < 0.1:
+                    options["appointment_ns"] = now[0] + rng.randrange(0, 60 * 60 * SECOND)
+                else:
+                    options["lane"] = rng.choice(LANES)
+            line.enqueue(Ticket("A", number, arrived_ns=now[0]), **options)
+            waiting.add(number)
+        elif line:
+            waiting.discard(line.dequeue().number)
+        if number % 50 == 0:
+            bool(line)   # promote due appointments first
+            order = [t.number for t in line]
+            # Booked appointments are listed last and have no position yet.
+            ready = order if not lanes else [n for n in order if line.slot_of(n) is None]
+            for place, n in enumerate(ready, 1):
+                assert line.position(n) == place, (n, line.position(n), place)
+            assert all(line.position(n) is None for n in order[len(ready):])
+
+
+def drive_tugas(rng, steps=5_000):
+    sistem = SistemAntrianBank()
+    layanan = sistem.layanan["teller"]
+    ids = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for step in range(steps):
+            r = rng.random()
+            if r < 0.5:
+                sistem.tambah_nasabah(f"nasabah {step % 50}", "teller", rng.choice(LANES))
+                ids.append(max(sistem.nasabah))
+            elif r < 0.8:
+                sistem.selesaikan_layanan("teller", rng.randint(1, 4))
+            elif ids:
+                sistem.keluar_antrian(rng.choice(ids), "teller")
+            if step % 25 == 0:
+                for place, nasabah in enumerate(layanan.antrian, 1):
+                    assert sistem.posisi_antrian(nasabah.id) == place
+                for l in layanan.loket:
+                    if l.nasabah_saat_ini:
+                        assert sistem.posisi_antrian(l.nasabah_saat_ini.id) == 0
+    assert len(sistem.nasabah) == len(layanan.antrian) + sum(l.nasabah_saat_ini is not None for l in layanan.loket)
+    assert all(n.nama == "nasabah 7" for n in sistem.cari_nama("nasabah 7"))
+
+
+def test_fifo_positions():
+    drive_line(TicketLine(), random.Random(0))
+
+
+def test_priority_positions():
+    drive_line(PriorityScheduler(), random.Random(1), lanes=True)
+
+
+def test_tugas_positions():
+    drive_tugas(random.Random(2))
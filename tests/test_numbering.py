@@ -0,0 +1,140 @@
+"""Per-day display numbers, wrap and the daily rollover."""
+import random
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from bc import BankQueueSystem
+from categories import Category
+from journal import Journal
+from numbering import DailyRollover, TicketSeries
+
+
+@pytest.mark.parametrize("wrap", [None, 7, 999])
+def test_series_display_and_lookup(wrap, days=30):
+    rng = random.Random(wrap)
+    series = TicketSeries("A", 3, wrap)
+    shown = {}          # number -> expected display
+    for day in range(days):
+        series.rollover(f"hari-{day}")
+        for count in range(1, rng.randrange(0, 40) + 1):
+            number = series.upcoming()
+            series.sequence = number
+            shown[number] = count if wrap is None else (count - 1) % wrap + 1
+        recent = [n for n in shown if n >= series.day_starts[0]] if series.day_starts else list(shown)
+        assert all(series.display(n) == shown[n] for n in recent)
+        today = series.day_starts[-1] if series.day_starts else 1
+        for number in range(today, series.sequence + 1):
+            latest = max(n for n in range(today, series.sequence + 1) if shown[n] == shown[number])
+            assert series.number_of(shown[number]) == latest
+        assert series.number_of(10_000) is None
+    assert series.rollover(f"hari-{days - 1}") is False
+
+
+def test_rollover_waits_for_idle_lines():
+    now = [datetime(2026, 10, 18, 23, 59).timestamp()]
+    system = BankQueueSystem(categories=[Category("teller", "A", "Teller", 1, number_width=4),
+                                         Category("cs", "B", "Customer Service", 1, number_wrap=3)])
+    rollover = DailyRollover(system, "00:00", clock=lambda: now[0])
+    assert rollover.check() and not rollover.check()
+    dispatcher = system.dispatcher
+    first = [dispatcher.arrive("teller")[0] for _ in range(5)]
+    dispatcher.skip("teller", 1)                         # A 0001 skipped, A 0002 called
+    cs = [str(dispatcher.arrive("cs")[0]) for _ in range(5)]
+    # The wrap reuses B 001 and B 002 while the first ones still wait;
+    # looking a display number up finds the newer ticket.
+    assert cs == ["B 001", "B 002", "B 003", "B 001", "B 002"]
+    assert system.ticket_number("cs", 1) == 4 and system.ticket_number("cs", 3) == 3
+    assert [str(t) for t in first] == ["A 0001", "A 0002", "A 0003", "A 0004", "A 0005"]
+    assert rollover.seconds_left() == 60
+
+    now[0] += 120
+    # Yesterday's tickets are still waiting: both categories keep the old
+    # day, so a number of the new day never meets one of yesterday.
+    assert not rollover.check() and rollover.pending
+    assert system.behind("2026-10-19") == ["teller", "cs"]
+    assert str(dispatcher.arrive("teller")[0]) == "A 0006"
+    assert rollover.seconds_left() == 24 * 3600 - 60
+    for _ in range(5):
+        dispatcher.finish("teller", 1)                   # serve A 0002 .. A 0006
+    assert system.counters["teller"].counters == [None]
+    assert rollover.check() and rollover.pending
+    assert system.behind("2026-10-19") == ["cs"]
+    assert system.queues["teller"].skipped == {}         # yesterday's no-shows are gone
+    second = [dispatcher.arrive("teller")[0] for _ in range(3)]
+    assert [str(t) for t in second] == ["A 0001", "A 0002", "A 0003"]
+    assert [t.number for t in second] == [7, 8, 9]
+    assert system.ticket_number("teller", 2) == 8 and system.ticket_number("teller", 4) is None
+    assert str(dispatcher.arrive("cs")[0]) == "B 003"    # cs still on the old day
+    for _ in range(6):
+        dispatcher.finish("cs", 1)
+    assert rollover.check() and not rollover.pending and not rollover.check()
+    assert str(dispatcher.arrive("cs")[0]) == "B 001"
+
+
+def test_rollover_survives_recovery(tmp_path):
+    directory = str(tmp_path)
+    now = [datetime(2026, 10, 18, 4, 0).timestamp()]
+    categories = [Category("teller", "A", "Teller", 2), Category("cs", "B", "Customer Service", 1)]
+    system = BankQueueSystem(categories=categories)
+    journal = Journal(directory)
+    journal.attach(system)
+    rollover = DailyRollover(system, "05:00", on_rollover=journal.snapshot, clock=lambda: now[0])
+    rollover.check()
+    for _ in range(4):
+        system.dispatcher.arrive("teller")
+    now[0] += 2 * 3600                               # 06:00, a new business day
+    assert rollover.check()                          # cs is idle and starts the day...
+    assert system.behind("2026-10-18") == ["teller"]  # ...A 003 and A 004 still wait
+    for counter_id in (1, 2, 1, 2):
+        system.dispatcher.finish("teller", counter_id)
+    assert rollover.check()
+    for _ in range(4):
+        system.dispatcher.arrive("teller")
+    journal.close()
+
+    restored = BankQueueSystem(categories=categories)
+    Journal(directory).recover(restored)
+    assert restored.snapshot_state() == system.snapshot_state()
+    assert [str(t) for t in restored.queues["teller"].queue] == ["A 003", "A 004"]
+    again = DailyRollover(restored, "05:00", clock=lambda: now[0])
+    assert not again.check()                         # same business day: no second reset
+    assert str(restored.dispatcher.arrive("teller")[0]) == "A 005"
+
+
+def test_rollover_never_repeats_a_number_on_screen(days=20):
+    # Random traffic with a rollover check every hour: the tickets waiting
+    # or at a counter never share a display number, and each one is found
+    # again from the number it shows.
+    rng = random.Random(0)
+    now = [datetime(2026, 10, 1, 0, 30).timestamp()]
+    system = BankQueueSystem(num_tellers=2, num_cs=1)
+    rollover = DailyRollover(system, "00:00", clock=lambda: now[0])
+    dispatcher = system.dispatcher
+    for _ in range(days * 24):
+        rollover.check()
+        for _ in range(rng.randrange(0, 8)):
+            category = rng.choice(["teller", "cs"])
+            if rng.random() < 0.5:
+                dispatcher.arrive(category)
+            else:
+                dispatcher.finish(category, rng.randint(1, len(system.counters[category].counters)))
+        for category, queue in system.queues.items():
+            on_screen = list(queue.queue) + [t for t in system.counters[category].counters if t]
+            shown = [queue.series.display(t.number) for t in on_screen]
+            assert len(set(shown)) == len(shown)
+            for ticket in queue.queue:
+                assert system.ticket_number(category, queue.series.display(ticket.number)) == ticket.number
+        now[0] += 3600
+    assert all(len(queue.series.day_starts) > 1 for queue in system.queues.values())
+
+
+def test_rollover_time_across_dst():
+    # The rollover is a point in time: 00:00 -> 05:00 across the spring
+    # DST change in New York is four hours, and the fall change six.
+    new_york = ZoneInfo("America/New_York")
+    dst = DailyRollover(BankQueueSystem(), "05:00", tz=new_york)
+    assert dst.seconds_left(datetime(2026, 3, 8, 0, 0, tzinfo=new_york).timestamp()) == 4 * 3600
+    assert dst.seconds_left(datetime(2026, 11, 1, 0, 0, tzinfo=new_york).timestamp()) == 6 * 3600
+    assert dst.business_day(datetime(2026, 3, 8, 4, 59, tzinfo=new_york).timestamp()) == "2026-03-07"
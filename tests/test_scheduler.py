@@ -0,0 +1,48 @@
+"""PriorityScheduler ordering: aging, priority lanes and appointments."""
+from bc import BankQueueSystem
+from scheduler import SECOND, PriorityScheduler
+from ticket_queue import Ticket
+from timer_wheel import TimerWheel
+
+MINUTE = 60 * SECOND
+
+
+def test_aging_lanes_and_appointments():
+    now = [0]
+    line = PriorityScheduler(clock=lambda: now[0])
+    line.enqueue(Ticket("A", 1, arrived_ns=0))                          # normal, waited 12 min
+    line.enqueue(Ticket("A", 2, arrived_ns=11 * MINUTE), lane="vip")    # VIP, just arrived
+    line.enqueue(Ticket("A", 3, arrived_ns=11 * MINUTE), lane="elderly")
+    line.enqueue(Ticket("A", 4, arrived_ns=11 * MINUTE))
+    line.enqueue(Ticket("A", 5, arrived_ns=0), appointment_ns=30 * MINUTE)
+    now[0] = 12 * MINUTE
+    assert len(line) == 5
+    # Aging: the normal ticket has waited longer than the VIP head start.
+    assert [line.dequeue().number for _ in range(3)] == [1, 2, 3]
+    assert line and line.peek().number == 4
+    # The appointment is not callable until its slot is near...
+    now[0] = 24 * MINUTE
+    assert [t.number for t in line] == [4, 5]
+    assert line.peek().number == 4
+    # ...and then goes ahead of walk-ins.
+    now[0] = 26 * MINUTE
+    assert line.dequeue().number == 5 and line.dequeue().number == 4
+    assert not line and len(line) == 0
+
+
+def test_appointment_timer_calls_idle_counter():
+    # An appointment due while every counter is idle is called by the
+    # system's appointment timer, with no other event.
+    now = [0]
+    system = BankQueueSystem(num_tellers=1, priority=True)
+    queue = system.queues["teller"].queue
+    queue.clock = lambda: now[0]
+    system.appointment_timers = TimerWheel(clock=lambda: now[0] / SECOND)
+    ticket, assignments = system.dispatcher.arrive("teller", appointment_ns=60 * MINUTE)
+    assert assignments == [] and len(queue) == 1
+    now[0] = 54 * MINUTE
+    system.appointment_timers.advance()
+    assert system.counters["teller"].counters == [None]
+    now[0] = 55 * MINUTE + SECOND
+    assert system.appointment_timers.advance() == 1
+    assert system.counters["teller"].counters == [ticket]
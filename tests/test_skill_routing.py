@@ -0,0 +1,147 @@
+"""Shared counters: policy choice, counters serving several lines, and
+arrive/finish from many threads."""
+import random
+import sys
+import threading
+
+from bc import BankQueueSystem
+from categories import default_categories
+from skill_routing import LONGEST_WAIT, WEIGHTED_FAIR, SkillRouting
+
+
+def shared(skills, policy=LONGEST_WAIT, weights=None):
+    return BankQueueSystem(routing=SkillRouting(default_categories(), skills, policy, weights))
+
+
+def served_after(system, teller, cs, calls):
+    """Categories one shared counter calls after `teller` and `cs` tickets
+    queued alternately behind a teller ticket at that counter."""
+    dispatcher = system.dispatcher
+    dispatcher.arrive("teller")
+    for i in range(max(teller, cs)):
+        if i < teller:
+            dispatcher.arrive("teller")
+        if i < cs:
+            dispatcher.arrive("cs")
+    category, served = "teller", []
+    for _ in range(calls):
+        _, [(counter_id, ticket)] = dispatcher.finish(category, 1)
+        category = "teller" if ticket.category == "A" else "cs"
+        served.append(category)
+    return served
+
+
+def test_longest_wait_takes_the_oldest_head():
+    system = shared([("teller", "cs")])
+    assert served_after(system, 4, 4, 8) == ["teller", "cs"] * 4
+
+
+def test_longest_wait_prefers_older_ticket_of_other_line():
+    system = shared([("teller", "cs")])
+    dispatcher = system.dispatcher
+    dispatcher.arrive("teller")
+    cs, _ = dispatcher.arrive("cs")
+    teller, _ = dispatcher.arrive("teller")
+    teller.arrived_ns = cs.arrived_ns + 1
+    assert dispatcher.finish("teller", 1)[1] == [(1, cs)]
+    assert dispatcher.finish("cs", 1)[1] == [(1, teller)]
+
+
+def test_weighted_fair_holds_the_weights():
+    system = shared([("teller", "cs")], WEIGHTED_FAIR, {"teller": 3})
+    served = served_after(system, 30, 30, 40)
+    assert served.count("teller") == 30 and served.count("cs") == 10
+    # No line starves: cs is called within every four calls.
+    assert all("cs" in served[i:i + 4] for i in range(0, 40, 4))
+
+
+def test_one_counter_serves_several_lines():
+    system = shared([("teller",), ("teller", "cs"), ("cs",)])
+    dispatcher = system.dispatcher
+    teller, cs = system.get_counter("teller"), system.get_counter("cs")
+
+    # Counter 1 only knows teller work; the next teller ticket goes to
+    # counter 2, and cs then to counter 3.
+    assert dispatcher.arrive("teller")[1][0][0] == 1
+    assert dispatcher.arrive("teller")[1][0][0] == 2
+    assert dispatcher.arrive("cs")[1][0][0] == 3
+    assert dispatcher.arrive("cs")[1] == []
+
+    # Freed, counter 2 takes the waiting cs ticket and shows in the cs table.
+    ticket, [(counter_id, called)] = dispatcher.finish("teller", 2)
+    assert ticket.category == "A" and counter_id == 2 and called.category == "B"
+    assert teller.counters[1] is None and cs.counters[1] is called
+
+    # A finish at counter 2 in the wrong category finds nothing to free.
+    assert dispatcher.finish("teller", 2) == (None, [])
+    # With both lines empty it goes idle, then takes a teller ticket again.
+    assert dispatcher.finish("cs", 2) == (called, [])
+    assert dispatcher.arrive("teller")[1][0][0] == 2     # counter 1 is still busy
+
+    # Counter 1 is never given a cs ticket, even when it is the only one free.
+    for _ in range(5):
+        dispatcher.arrive("cs")
+    assert dispatcher.finish("teller", 1)[1] == []
+    assert dispatcher.finish("cs", 3)[1][0][0] == 3
+
+
+def test_threads_share_counters_without_deadlock_or_double_assignment(threads=8, steps=10_000):
+    skills = [("teller",), ("teller", "cs"), ("cs", "teller"), ("cs",), ("teller", "cs")]
+    system = shared(skills)
+    dispatcher = system.dispatcher
+    guard = threading.Lock()
+    busy = {}                   # counter id -> ticket it serves
+    called, errors = set(), []  # (prefix, number) of every ticket called
+
+    def watch(event, category, ticket, counter_id):
+        with guard:
+            if event == "assign":
+                if counter_id in busy:
+                    errors.append(f"loket {counter_id} sudah melayani {busy[counter_id]}")
+                if (ticket.category, ticket.number) in called:
+                    errors.append(f"{ticket} dipanggil dua kali")
+                busy[counter_id] = ticket
+                called.add((ticket.category, ticket.number))
+            elif busy.pop(counter_id, None) is not ticket:
+                errors.append(f"{ticket} selesai di loket {counter_id} yang tidak melayaninya")
+
+    system.subscribe(watch, ("assign", "finish"))
+    issued = [0] * threads
+
+    def worker(seed):
+        rng = random.Random(seed)
+        for _ in range(steps):
+            category = rng.choice(("teller", "cs"))
+            if rng.random() < 0.5:
+                dispatcher.arrive(category)
+                issued[seed] += 1
+            else:
+                dispatcher.finish(category, rng.randint(1, len(skills)))
+
+    workers = [threading.Thread(target=worker, args=(seed,), daemon=True) for seed in range(threads)]
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)     # switch threads often, inside the locked sections too
+    try:
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join(60)
+    finally:
+        sys.setswitchinterval(interval)
+    assert not any(thread.is_alive() for thread in workers), "deadlock"
+    assert errors == []
+
+    # Every counter is busy in at most one category, and free in the shared
+    # bitmap exactly when no category has it.
+    pools = [system.get_counter(category) for category in ("teller", "cs")]
+    for idx in range(len(skills)):
+        holders = [counter.counters[idx] for counter in pools if counter.counters[idx] is not None]
+        assert len(holders) <= 1
+        assert system.dispatcher.routing.free.is_free(idx) == (not holders)
+
+    # Draining serves everything that was issued, each ticket once.
+    while busy:
+        counter_id, ticket = next(iter(busy.items()))
+        dispatcher.finish("teller" if ticket.category == "A" else "cs", counter_id)
+    assert len(called) == sum(issued)
+    assert all(not system.queues[category].queue for category in ("teller", "cs"))
@@ -0,0 +1,88 @@
+"""A display that applies the feed's diffs to its snapshots ends up with the
+feed's own board, also when it falls behind while other threads dispatch."""
+import asyncio
+import random
+import threading
+
+from bc import BankQueueSystem
+from status_feed import StatusFeed
+
+
+def apply(board, message):
+    """Apply one diff the way a display keeps its own state."""
+    lane = board[message["category"]]
+    assert message["seq"] == lane["seq"] + 1, "diff hilang atau terulang"
+    event = message["event"]
+    if event in ("enqueue", "recall"):
+        lane["waiting"] += 1
+    elif event == "assign":
+        lane["waiting"] -= 1
+        lane["serving"][message["counter"] - 1] = message["ticket"]
+    elif event == "cancel":
+        lane["waiting"] -= 1
+    else:
+        lane["serving"][message["counter"] - 1] = None
+    lane["seq"] = message["seq"]
+
+
+def follow(board, message):
+    if message["type"] == "snapshot":
+        return message["state"], 1
+    apply(board, message)
+    return board, 0
+
+
+def test_slow_display_resyncs_without_double_counting():
+    async def main():
+        system = BankQueueSystem()
+        feed = StatusFeed(system, buffer_size=20)
+        subscription = feed.subscribe()
+        stop = threading.Event()
+
+        def traffic():
+            rng = random.Random(1)
+            while not stop.is_set():
+                category = rng.choice(["teller", "cs"])
+                system.dispatcher.arrive(category)
+                system.dispatcher.finish(category, rng.randint(1, 3))
+
+        worker = threading.Thread(target=traffic)
+        worker.start()
+        board, snapshots = None, 0
+        try:
+            for i in range(5000):
+                board, snapshot = follow(board, await subscription.get())
+                snapshots += snapshot
+                if i % 97 == 0:
+                    await asyncio.sleep(0.001)   # fall behind now and then
+        finally:
+            stop.set()
+            worker.join()
+        await asyncio.sleep(0.05)                # diffs still queued on the loop
+        while subscription.buffer or subscription.resync:
+            board, snapshot = follow(board, await subscription.get())
+            snapshots += snapshot
+        assert snapshots > 1
+        assert board == feed.snapshot()
+
+    asyncio.run(main())
+
+
+def test_overflow_is_replaced_by_one_snapshot():
+    async def main():
+        system = BankQueueSystem(num_tellers=1, num_cs=1)
+        feed = StatusFeed(system, buffer_size=4)
+        subscription = feed.subscribe()
+        board = (await subscription.get())["state"]
+        for _ in range(10):
+            system.dispatcher.arrive("teller")
+        assert subscription.coalesced == 1
+        message = await subscription.get()
+        assert message["type"] == "snapshot" and message["state"]["teller"]["waiting"] == 9
+        board = message["state"]
+        system.dispatcher.finish("teller", 1)
+        while subscription.buffer:
+            apply(board, await subscription.get())
+        assert board == feed.snapshot()
+
+    asyncio.run(main())
@@ -0,0 +1,27 @@
+"""CounterTable renders the same table tabulate did, column resizes included."""
+import random
+
+import pytest
+
+from status_view import CounterTable
+from ticket_queue import Ticket
+
+tabulate = pytest.importorskip("tabulate").tabulate
+
+
+@pytest.mark.parametrize("size", [1, 3, 12])
+def test_table_matches_tabulate(size, rounds=5000):
+    rng = random.Random(size)
+    table = CounterTable("Customer Service", size)
+    counters = [None] * size
+    for _ in range(rounds):
+        idx = rng.randrange(size)
+        if rng.random() < 0.3:
+            counters[idx] = None
+        else:
+            # Mostly 3-digit numbers, sometimes wide enough to resize the column.
+            number = rng.choice([rng.randrange(1, 1000), rng.randrange(10 ** 12, 10 ** 16)])
+            counters[idx] = Ticket("B", number)
+        expected = tabulate([[f"Loket {i + 1}", str(t) if t else "Kosong"] for i, t in enumerate(counters)],
+                            headers=["Customer Service Counter", "Nomor Antrian"])
+        assert table.render(counters) == expected
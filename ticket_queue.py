@@ -0,0 +1,338 @@
+import time
+from collections import deque
+
+from line_index import LineIndex
+
+
+class Ticket:
+    """Compact queue ticket; the display string is only built when shown.
+
+    `number` is the category's ever-increasing sequence. With a `series`
+    (numbering.TicketSeries, shared by the category) the ticket shows its
+    series' display number instead, e.g. the count since the day started.
+    """
+
+    __slots__ = ("category", "number", "arrived_ns", "series")
+
+    def __init__(self, category, number, arrived_ns=None, series=None):
+        self.category = category  # kode kategori, mis. "A" untuk teller
+        self.number = number
+        self.arrived_ns = time.monotonic_ns() if arrived_ns is None else arrived_ns
+        self.series = series
+
+    def __str__(self):
+        if self.series is None:
+            return f"{self.category} {self.number:03}"
+        return self.series.format(self.number)
+
+    def __repr__(self):
+        return f"Ticket({self.category!r}, {self.number})"
+
+
+class QueueFullError(Exception):
+    """Raised when a bounded queue is already at capacity."""
+
+
+class TicketQueue:
+    """FIFO waiting line with O(1) enqueue, dequeue, peek and length."""
+
+    def __init__(self, capacity=None):
+        if capacity is not None and capacity < 1:
+            raise ValueError("capacity harus lebih dari 0")
+        self._items = deque()
+        self.capacity = capacity
+
+    def is_full(self):
+        return self.capacity is not None and len(self._items) >= self.capacity
+
+    def enqueue(self, ticket):
+        if self.is_full():
+            raise QueueFullError(f"Antrian penuh (kapasitas {self.capacity}).")
+        self._items.append(ticket)
+
+    def dequeue(self):
+        """Remove and return the ticket at the head of the line."""
+        if not self._items:
+            raise IndexError("dequeue dari antrian kosong")
+        return self._items.popleft()
+
+    def peek(self):
+        """Return the ticket at the head of the line without removing it."""
+        if not self._items:
+            raise IndexError("peek dari antrian kosong")
+        return self._items[0]
+
+    def clear(self):
+        self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __getitem__(self, index):
+        # O(1) for the ends of the line (0 and -1), which is all callers need.
+        return self._items[index]
+
+    def __repr__(self):
+        return f"TicketQueue({list(self._items)!r}, capacity={self.capacity})"
+
+
+RECALL = "recall"           # index lane of recalled tickets
+RECALL_KEY = -(1 << 62)     # recalled tickets sort ahead of every other key
+COMPACT_MIN = 64            # tombstones tolerated before a compaction pays off
+
+
+class TicketLine(TicketQueue):
+    """FIFO line of Tickets that can also find, cancel and recall a ticket.
+
+    position() and ahead() are O(log n) with a line_index.LineIndex, which
+    costs O(1) per enqueue and dequeue.
+
+    cancel() leaves a tombstone: the ticket's number is added to a set and
+    its deque entry stays where it is. dequeue() and iteration skip dead
+    entries. Once the tombstones outnumber the live tickets, the deque is
+    rebuilt without them, so a cancel is O(1) amortised. recall() puts a
+    ticket back at the front, behind earlier recalls.
+    """
+
+    def __init__(self, capacity=None):
+        super().__init__(capacity)
+        self.index = LineIndex()
+        self._push = self.index.push
+        self._discard = self.index.discard
+        self._recalled = deque()
+        self._dead = set()          # numbers of cancelled tickets still in a deque
+        self._recalls = 0
+
+    def is_full(self):
+        return self.capacity is not None and len(self) >= self.capacity
+
+    def enqueue(self, ticket):
+        if self.capacity is not None and len(self) >= self.capacity:
+            raise QueueFullError(f"Antrian penuh (kapasitas {self.capacity}).")
+        self._items.append(ticket)
+        self._push(ticket.number, ticket)
+
+    def extend(self, tickets):
+        """Enqueue tickets in order; one bulk index load, for restoring a line."""
+        tickets = list(tickets)
+        if self.capacity is not None and len(self) + len(tickets) > self.capacity:
+            raise QueueFullError(f"Antrian penuh (kapasitas {self.capacity}).")
+        self.index.extend([ticket.number for ticket in tickets], tickets)
+        self._items.extend(tickets)
+
+    def dequeue(self):
+        dead = self._dead
+        while True:
+            line = self._recalled or self._items
+            if not line:
+                raise IndexError("dequeue dari antrian kosong")
+            ticket = line.popleft()
+            if not dead or ticket.number not in dead:
+                break
+            dead.discard(ticket.number)
+        self._discard(ticket.number)
+        return ticket
+
+    def peek(self):
+        dead = self._dead
+        while True:
+            line = self._recalled or self._items
+            if not line:
+                raise IndexError("peek dari antrian kosong")
+            if not dead or line[0].number not in dead:
+                return line[0]
+            dead.discard(line.popleft().number)
+
+    def cancel(self, number):
+        """Remove waiting ticket `number`; returns it, or None if it is not waiting."""
+        ticket = self._discard(number)
+        if ticket is None:
+            return None
+        dead = self._dead
+        dead.add(number)
+        if len(dead) >= COMPACT_MIN and 2 * len(dead) > len(self._items) + len(self._recalled):
+            self._items = deque(t for t in self._items if t.number not in dead)
+            self._recalled = deque(t for t in self._recalled if t.number not in dead)
+            dead.clear()
+        return ticket
+
+    def recall(self, ticket):
+        """Put a ticket back at the front of the line, behind earlier recalls."""
+        self._recalls += 1
+        self._recalled.append(ticket)
+        self._push(ticket.number, ticket, RECALL, RECALL_KEY + self._recalls)
+
+    def clear(self):
+        super().clear()
+        self._recalled.clear()
+        self._dead.clear()
+        self.index.clear()
+
+    def find(self, number):
+        """The waiting ticket with this number, or None."""
+        return self.index.get(number)
+
+    def ahead(self, number):
+        """Tickets waiting in front of ticket `number`, or None if it is not waiting."""
+        items = self._items
+        if items and items[-1].number == number and number not in self._dead:
+            return len(self) - 1    # the newest ticket, e.g. one just issued
+        return self.index.ahead(number)
+
+    def position(self, number):
+        """1-based place in line of ticket `number`, or None."""
+        return self.index.position(number)
+
+    def __len__(self):
+        return len(self._items) + len(self._recalled) - len(self._dead)
+
+    def __bool__(self):
+        # Checked on every dispatch; without tombstones no arithmetic is needed.
+        if self._dead:
+            return len(self) > 0
+        return bool(self._items or self._recalled)
+
+    def __iter__(self):
+        dead = self._dead
+        for line in (self._recalled, self._items):
+            for ticket in line:
+                if not dead or ticket.number not in dead:
+                    yield ticket
+
+    def __getitem__(self, index):
+        raise TypeError("TicketLine tidak mendukung akses per indeks; pakai peek() atau find()")
+
+    def __repr__(self):
+        return f"TicketLine({list(self)!r}, capacity={self.capacity})"
+
+
+class IndexedPriorityQueue:
+    """Binary min-heap keyed on priority with O(log n) removal by item id.
+
+    Iteration yields items in priority order from a cached ordered view, so
+    repeatedly displaying the line does not re-sort it.
+    """
+
+    def __init__(self):
+        self._heap = []      # entries: [priority, seq, item_id, item]
+        self._pos = {}       # item_id -> index in self._heap
+        self._seq = 0
+        self._ordered = deque()  # ordered view; may contain removed entries
+        self._ordered_valid = True
+        self._stale = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __contains__(self, item_id):
+        return item_id in self._pos
+
+    def push(self, item_id, priority, item):
+        if item_id in self._pos:
+            raise KeyError(f"item {item_id!r} sudah ada di antrian")
+        entry = [priority, self._seq, item_id, item]
+        self._seq += 1
+        self._heap.append(entry)
+        self._pos[item_id] = len(self._heap) - 1
+        self._sift_up(len(self._heap) - 1)
+
+        if self._ordered_valid:
+            if not self._ordered or self._ordered[-1][:2] <= entry[:2]:
+                self._ordered.append(entry)
+            else:
+                self._ordered_valid = False
+
+    def peek(self):
+        if not self._heap:
+            raise IndexError("peek dari antrian kosong")
+        return self._heap[0][3]
+
+    def priority(self, item_id):
+        """The priority item_id was pushed with; KeyError if it is absent."""
+        return self._heap[self._pos[item_id]][0]
+
+    def pop(self):
+        """Remove and return the item with the lowest priority value."""
+        if not self._heap:
+            raise IndexError("pop dari antrian kosong")
+        entry = self._remove_at(0)
+        if self._ordered_valid:
+            ordered = self._ordered
+            while ordered[0] is not entry:
+                ordered.popleft()
+                self._stale -= 1
+            ordered.popleft()
+        return entry[3]
+
+    def remove(self, item_id):
+        """Remove and return the item with the given id."""
+        index = self._pos.get(item_id)
+        if index is None:
+            raise KeyError(item_id)
+        entry = self._remove_at(index)
+        if self._ordered_valid:
+            # Leave the entry in the ordered view and skip it lazily.
+            self._stale += 1
+            if self._stale > len(self._heap):
+                self._ordered_valid = False
+        return entry[3]
+
+    def __iter__(self):
+        if not self._ordered_valid:
+            self._ordered = deque(sorted(self._heap))
+            self._ordered_valid = True
+            self._stale = 0
+        pos = self._pos
+        heap = self._heap
+        for entry in self._ordered:
+            index = pos.get(entry[2])
+            if index is not None and heap[index] is entry:
+                yield entry[3]
+
+    def _remove_at(self, index):
+        heap = self._heap
+        entry = heap[index]
+        last = heap.pop()
+        del self._pos[entry[2]]
+        if index < len(heap):
+            heap[index] = last
+            self._pos[last[2]] = index
+            self._sift_down(index)
+            self._sift_up(index)
+        return entry
+
+    def _sift_up(self, index):
+        heap, pos = self._heap, self._pos
+        entry = heap[index]
+        key = entry[:2]
+        while index > 0:
+            parent = (index - 1) >> 1
+            if heap[parent][:2] <= key:
+                break
+            heap[index] = heap[parent]
+            pos[heap[index][2]] = index
+            index = parent
+        heap[index] = entry
+        pos[entry[2]] = index
+
+    def _sift_down(self, index):
+        heap, pos = self._heap, self._pos
+        size = len(heap)
+        entry = heap[index]
+        key = entry[:2]
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1][:2] < heap[child][:2]:
+                child += 1
+            if key <= heap[child][:2]:
+                break
+            heap[index] = heap[child]
+            pos[heap[index][2]] = index
+            index = child
+        heap[index] = entry
+        pos[entry[2]] = index
@@ -0,0 +1,117 @@
+"""Hashed timer wheel: O(1) schedule and cancel for many short timeouts.
+
+A timer is due `delay` seconds from now, rounded up to whole ticks. It sits
+in slot `due_tick % slots` of a ring. advance() moves the wheel to the
+current tick and only visits the slots it passed. A timer that is more than
+one revolution away is left in its slot until the wheel comes round again.
+cancel() only marks the timer dead; the slot drops it when it is next
+visited. Neither operation depends on how many timers are pending, and an
+idle wheel costs one clock read per tick.
+
+Callbacks run after the wheel's lock is released, so a callback may take
+other locks (a dispatcher category lock) or schedule new timers.
+
+    wheel = TimerWheel(tick=1.0)
+    wheel.start()
+    handle = wheel.schedule(120, print, "waktu habis")
+    wheel.cancel(handle)
+    wheel.close()
+"""
+import math
+import threading
+import time
+
+
+class Timer:
+    __slots__ = ("due", "callback", "args")
+
+    def __init__(self, due, callback, args):
+        self.due = due              # tick number the timer fires at
+        self.callback = callback    # None once cancelled or fired
+        self.args = args
+
+
+class TimerWheel:
+    def __init__(self, tick=1.0, slots=512, clock=time.monotonic):
+        if tick <= 0 or slots < 1:
+            raise ValueError("tick dan slots harus lebih dari 0")
+        self.tick = tick
+        self.clock = clock
+        self._slots = [[] for _ in range(slots)]
+        self._now = self._tick_of(clock())     # last tick advance() has handled
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _tick_of(self, seconds):
+        return math.floor(seconds / self.tick)
+
+    def __len__(self):
+        return self._pending
+
+    def schedule(self, delay, callback, *args):
+        """Call callback(*args) about `delay` seconds from now; returns a handle."""
+        with self._lock:
+            # Never due in a tick that advance() has already handled.
+            due = max(self._tick_of(self.clock()) + math.ceil(delay / self.tick), self._now + 1)
+            timer = Timer(due, callback, args)
+            self._slots[due % len(self._slots)].append(timer)
+            self._pending += 1
+            return timer
+
+    def cancel(self, timer):
+        """Stop a timer; returns False if it already fired or was cancelled."""
+        with self._lock:
+            if timer.callback is None:
+                return False
+            timer.callback = None
+            self._pending -= 1
+            return True
+
+    def advance(self, now=None):
+        """Fire every timer due by `now` (default: the clock); returns how many fired."""
+        target = self._tick_of(self.clock() if now is None else now)
+        due = []
+        with self._lock:
+            if target <= self._now:
+                return 0
+            slots = self._slots
+            size = len(slots)
+            # After a long pause, one revolution visits every slot once.
+            first = max(self._now + 1, target - size + 1)
+            for tick in range(first, target + 1):
+                slot = slots[tick % size]
+                if not slot:
+                    continue
+                keep = []
+                for timer in slot:
+                    if timer.callback is None:
+                        continue
+                    if timer.due <= target:
+                        due.append((timer.callback, timer.args))
+                        timer.callback = None
+                    else:
+                        keep.append(timer)
+                slots[tick % size] = keep
+            self._now = target
+            self._pending -= len(due)
+        for callback, args in due:
+            callback(*args)
+        return len(due)
+
+    def start(self):
+        """Advance the wheel from a daemon thread once per tick."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.tick):
+            self.advance()
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
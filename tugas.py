@@ -1,160 +1,259 @@
-import uuid
-from datetime import datetime
+import itertools
+import sys
+import threading
+import time
 from typing import List, Optional
+from ticket_queue import IndexedPriorityQueue
+from line_index import LineIndex
+from counter_index import FreeCounterIndex
+from scheduler import LANE_BOOST, NORMAL
+from categories import Category, default_categories, load_categories, validate
+from profiling import traced
+
+_id_nasabah = itertools.count(1)
 
 class Nasabah:
+    __slots__ = ('id', 'nama', 'nomor_antrian', 'waktu_kedatangan')
+
     def __init__(self, nama: str, nomor_antrian: int):
-        self.id = str(uuid.uuid4())
+        self.id = next(_id_nasabah)
         self.nama = nama
         self.nomor_antrian = nomor_antrian
-        self.waktu_kedatangan = datetime.now()
+        # Waktu kedatangan dalam nanodetik monotonic
+        self.waktu_kedatangan = time.monotonic_ns()
 
 class Loket:
-    def __init__(self, nomor: int, kategori: str):
-        # Generate kode unik loket berdasarkan kategori
-        self.kode_loket = f"{'A' if kategori == 'teller' else 'B'}{nomor:02d}"
+    def __init__(self, nomor: int, kategori: str, prefix: str):
+        # Kode unik loket: prefix kategori + nomor loket
+        self.kode_loket = f"{prefix}{nomor:02d}"
         self.nomor = nomor
         self.kategori = kategori
         self.nasabah_saat_ini: Optional[Nasabah] = None
 
-class SistemAntrianBank:
-    def __init__(self):
-        # Inisialisasi loket dengan kode unik
-        self.loket_teller = [Loket(i+1, 'teller') for i in range(4)]
-        self.loket_cs = [Loket(i+1, 'cs') for i in range(3)]
-        
-        # Antrian
-        self.antrian_teller: List[Nasabah] = []
-        self.antrian_cs: List[Nasabah] = []
-        
+class Layanan:
+    """Semua keadaan satu kategori layanan, diambil dengan satu lookup dict."""
+    __slots__ = ('kategori', 'label', 'loket', 'loket_kosong', 'antrian', 'indeks', 'nomor_antrian', 'kunci')
+
+    def __init__(self, kategori: Category):
+        self.kategori = kategori.key
+        self.label = kategori.label
+        self.loket = [Loket(i + 1, kategori.key, kategori.prefix) for i in range(kategori.counters)]
+        # Indeks loket kosong (bitmap), diperbarui saat loket diisi/dikosongkan
+        self.loket_kosong = FreeCounterIndex(len(self.loket))
+        # Antrian (heap berdasarkan waktu kedatangan efektif, bisa dihapus per id nasabah)
+        self.antrian = IndexedPriorityQueue()
+        # Indeks posisi: urutan nasabah menunggu per jalur, O(log n) per query
+        self.indeks = LineIndex()
         # Nomor antrian terakhir
-        self.nomor_antrian_teller = 0
-        self.nomor_antrian_cs = 0
-
-    def tambah_nasabah(self, nama: str, kategori: str):
-        # Menentukan kategori dan antrian
-        if kategori == 'teller':
-            self.nomor_antrian_teller += 1
-            nomor_antrian = self.nomor_antrian_teller
-            antrian = self.antrian_teller
-            loket = self.loket_teller
-        else:
-            self.nomor_antrian_cs += 1
-            nomor_antrian = self.nomor_antrian_cs
-            antrian = self.antrian_cs
-            loket = self.loket_cs
-
-        # Buat nasabah baru
-        nasabah_baru = Nasabah(nama, nomor_antrian)
-        
-        # Periksa apakah ada loket kosong
-        loket_kosong = next((l for l in loket if l.nasabah_saat_ini is None), None)
-        
-        if loket_kosong:
-            # Langsung layani di loket kosong
-            loket_kosong.nasabah_saat_ini = nasabah_baru
-            print(f"Nasabah {nama} langsung dilayani di {kategori.capitalize()} {loket_kosong.kode_loket}")
-            return nomor_antrian
-        else:
-            # Tambahkan ke antrian
-            antrian.append(nasabah_baru)
-            print(f"Nasabah {nama} menunggu di antrian {kategori.capitalize()}. Nomor Antrian: {nomor_antrian}")
-            return nomor_antrian
+        self.nomor_antrian = 0
+        # Kunci per kategori: nomor antrian, antrian dan loket satu kategori
+        # hanya diubah oleh satu thread, tanpa menghalangi kategori lain
+        self.kunci = threading.RLock()
+
+class SistemAntrianBank:
+    def __init__(self, kategori: Optional[List[Category]] = None):
+        # Tabel layanan per kategori; default teller (A, 4 loket) dan cs (B, 3 loket)
+        kategori = validate(kategori or default_categories())
+        self.layanan = {k.key: Layanan(k) for k in kategori}
+        # Direktori nasabah yang menunggu atau sedang dilayani: id -> (kategori, nasabah)
+        # dan nama -> {id: nasabah}; punya kunci sendiri karena dipakai semua kategori
+        self.nasabah = {}
+        self.nama_nasabah = {}
+        self.kunci_direktori = threading.Lock()
+
+    def _hapus_dari_direktori(self, nasabah: Nasabah):
+        with self.kunci_direktori:
+            del self.nasabah[nasabah.id]
+            sama_nama = self.nama_nasabah[nasabah.nama]
+            del sama_nama[nasabah.id]
+            if not sama_nama:
+                del self.nama_nasabah[nasabah.nama]
+
+    def cari_nasabah(self, nasabah_id: int) -> Optional[Nasabah]:
+        entri = self.nasabah.get(nasabah_id)
+        return None if entri is None else entri[1]
+
+    def cari_nama(self, nama: str) -> List[Nasabah]:
+        # Semua nasabah dengan nama ini yang masih menunggu atau sedang dilayani
+        with self.kunci_direktori:
+            return list(self.nama_nasabah.get(nama, {}).values())
+
+    def posisi_antrian(self, nasabah_id: int) -> Optional[int]:
+        # Urutan ke-n dalam antrian (1 = dipanggil berikutnya), 0 jika sedang
+        # dilayani, None jika tidak dikenal; O(jalur * log n)
+        entri = self.nasabah.get(nasabah_id)
+        if entri is None:
+            return None
+        layanan = self.layanan[entri[0]]
+        with layanan.kunci:
+            if nasabah_id not in self.nasabah:
+                return None
+            posisi = layanan.indeks.position(nasabah_id)
+            return 0 if posisi is None else posisi
+
+    @traced
+    def tambah_nasabah(self, nama: str, kategori: str, jalur: str = NORMAL):
+        # Jalur prioritas (vip, elderly, disabled) dihitung seolah datang lebih
+        # awal, jadi nasabah biasa yang sudah lama menunggu tetap didahulukan
+        boost = LANE_BOOST[jalur]
+        layanan = self.layanan[kategori]
+        with layanan.kunci:
+            layanan.nomor_antrian += 1
+            nomor_antrian = layanan.nomor_antrian
+
+            # Buat nasabah baru
+            nasabah_baru = Nasabah(nama, nomor_antrian)
+            with self.kunci_direktori:
+                self.nasabah[nasabah_baru.id] = (kategori, nasabah_baru)
+                self.nama_nasabah.setdefault(nama, {})[nasabah_baru.id] = nasabah_baru
+
+            # Periksa apakah ada loket kosong
+            idx = layanan.loket_kosong.acquire()
+
+            if idx is not None:
+                # Langsung layani di loket kosong
+                loket_kosong = layanan.loket[idx]
+                loket_kosong.nasabah_saat_ini = nasabah_baru
+                print(f"Nasabah {nama} langsung dilayani di {kategori.capitalize()} {loket_kosong.kode_loket}")
+                return nomor_antrian
+            else:
+                # Tambahkan ke antrian
+                prioritas = nasabah_baru.waktu_kedatangan - boost
+                layanan.antrian.push(nasabah_baru.id, prioritas, nasabah_baru)
+                layanan.indeks.push(nasabah_baru.id, nasabah_baru, jalur, prioritas)
+                print(f"Nasabah {nama} menunggu di antrian {kategori.capitalize()}. Nomor Antrian: {nomor_antrian}")
+                return nomor_antrian
 
+    @traced
     def update_antrian(self, kategori: str):
-        # Menentukan kategori dan antrian
-        if kategori == 'teller':
-            antrian = self.antrian_teller
-            loket = self.loket_teller
-        else:
-            antrian = self.antrian_cs
-            loket = self.loket_cs
-
-        # Cari loket kosong
-        loket_kosong = next((l for l in loket if l.nasabah_saat_ini is None), None)
-        
-        # Jika ada loket kosong dan ada antrian
-        if loket_kosong and antrian:
-            # Ambil nasabah pertama dalam antrian (FIFO)
-            nasabah_berikutnya = min(antrian, key=lambda n: n.nomor_antrian)
-            
-            # Tempatkan di loket kosong
-            loket_kosong.nasabah_saat_ini = nasabah_berikutnya
-            
-            # Hapus dari antrian
-            antrian.remove(nasabah_berikutnya)
-            
-            print(f"Nasabah {nasabah_berikutnya.nama} (Nomor Antrian: {nasabah_berikutnya.nomor_antrian}) "
-                  f"dipanggil di {kategori.capitalize()} {loket_kosong.kode_loket}")
+        layanan = self.layanan[kategori]
+        with layanan.kunci:
+            antrian = layanan.antrian
+            loket_kosong_idx = layanan.loket_kosong
+
+            # Selama ada loket kosong dan ada antrian
+            while loket_kosong_idx and antrian:
+                # Ambil nasabah dengan waktu kedatangan efektif terkecil
+                nasabah_berikutnya = antrian.pop()
+                layanan.indeks.discard(nasabah_berikutnya.id)
+
+                # Tempatkan di loket kosong
+                loket_kosong = layanan.loket[loket_kosong_idx.acquire()]
+                loket_kosong.nasabah_saat_ini = nasabah_berikutnya
+
+                print(f"Nasabah {nasabah_berikutnya.nama} (Nomor Antrian: {nasabah_berikutnya.nomor_antrian}) "
+                      f"dipanggil di {kategori.capitalize()} {loket_kosong.kode_loket}")
+
+    @traced
+    def selesaikan_layanan(self, kategori: str, nomor_loket: int) -> Optional[Nasabah]:
+        layanan = self.layanan[kategori]
+        with layanan.kunci:
+            loket = layanan.loket
+            if not 1 <= nomor_loket <= len(loket):
+                print("Nomor loket tidak valid.")
+                return None
+
+            l = loket[nomor_loket - 1]
+            nasabah = l.nasabah_saat_ini
+            if nasabah is None:
+                print(f"Loket {l.kode_loket} sedang kosong.")
+                return None
+
+            # Kosongkan loket lalu langsung panggil nasabah berikutnya
+            l.nasabah_saat_ini = None
+            layanan.loket_kosong.release(nomor_loket - 1)
+            self._hapus_dari_direktori(nasabah)
+            print(f"Nasabah {nasabah.nama} (Nomor Antrian: {nasabah.nomor_antrian}) "
+                  f"selesai dilayani di {kategori.capitalize()} {l.kode_loket}")
+            self.update_antrian(kategori)
+            return nasabah
+
+    def keluar_antrian(self, nasabah_id: int, kategori: str) -> Optional[Nasabah]:
+        # Hapus nasabah yang meninggalkan antrian tanpa menelusuri seluruh antrian
+        layanan = self.layanan[kategori]
+        with layanan.kunci:
+            if nasabah_id not in layanan.antrian:
+                return None
+            layanan.indeks.discard(nasabah_id)
+            nasabah = layanan.antrian.remove(nasabah_id)
+            self._hapus_dari_direktori(nasabah)
+            return nasabah
 
     def tampilkan_status_antrian(self, kategori: str):
-        if kategori == 'teller':
-            antrian = self.antrian_teller
-            loket = self.loket_teller
-        else:
-            antrian = self.antrian_cs
-            loket = self.loket_cs
-
-        print(f"\nStatus Antrian {kategori.capitalize()}:")
-        
-        # Tampilkan status loket
-        for l in loket:
-            if l.nasabah_saat_ini:
-                print(f"Loket {l.kode_loket}: Sedang melayani {l.nasabah_saat_ini.nama} "
-                      f"(Nomor Antrian: {l.nasabah_saat_ini.nomor_antrian})")
+        layanan = self.layanan[kategori]
+        with layanan.kunci:
+            antrian = layanan.antrian
+            loket = layanan.loket
+
+            print(f"\nStatus Antrian {kategori.capitalize()}:")
+
+            # Tampilkan status loket
+            for l in loket:
+                if l.nasabah_saat_ini:
+                    print(f"Loket {l.kode_loket}: Sedang melayani {l.nasabah_saat_ini.nama} "
+                          f"(Nomor Antrian: {l.nasabah_saat_ini.nomor_antrian})")
+                else:
+                    print(f"Loket {l.kode_loket}: Kosong")
+
+            # Tampilkan antrian
+            if antrian:
+                print("Nasabah dalam Antrian:")
+                for n in antrian:
+                    print(f"- {n.nama} (Nomor Antrian: {n.nomor_antrian})")
             else:
-                print(f"Loket {l.kode_loket}: Kosong")
-        
-        # Tampilkan antrian
-        if antrian:
-            print("Nasabah dalam Antrian:")
-            for n in sorted(antrian, key=lambda x: x.nomor_antrian):
-                print(f"- {n.nama} (Nomor Antrian: {n.nomor_antrian})")
-        else:
-            print("Tidak ada nasabah dalam antrian.")
+                print("Tidak ada nasabah dalam antrian.")
 
-def main():
-    sistem_antrian = SistemAntrianBank()
+def main(kategori_layanan: Optional[List[Category]] = None):
+    sistem_antrian = SistemAntrianBank(kategori_layanan)
+    daftar_kategori = list(sistem_antrian.layanan)
+    nomor_keluar = str(len(daftar_kategori) + 1)
 
     while True:
         print("\n--- SISTEM ANTRIAN BANK ---")
-        print("1. Loket Teller")
-        print("2. Customer Service")
-        print("3. Keluar")
+        for i, k in enumerate(daftar_kategori, 1):
+            print(f"{i}. {sistem_antrian.layanan[k].label}")
+        print(f"{nomor_keluar}. Keluar")
         
-        pilihan = input("Pilih layanan (1/2/3): ")
+        pilihan = input(f"Pilih layanan (1-{nomor_keluar}): ")
 
-        if pilihan == '3':
+        if pilihan == nomor_keluar:
             print("Terima kasih. Selamat tinggal!")
             break
 
-        if pilihan not in ['1', '2']:
+        if not (pilihan.isdigit() and 1 <= int(pilihan) <= len(daftar_kategori)):
             print("Pilihan tidak valid. Silakan coba lagi.")
             continue
 
-        kategori = 'teller' if pilihan == '1' else 'cs'
+        kategori = daftar_kategori[int(pilihan) - 1]
         
         while True:
             print(f"\n--- MENU {kategori.upper()} ---")
             print("1. Ambil Nomor Antrian")
             print("2. Lihat Status Antrian")
-            print("3. Kembali ke Menu Utama")
+            print("3. Selesaikan Layanan")
+            print("4. Kembali ke Menu Utama")
             
             sub_pilihan = input("Pilih opsi: ")
             
-            if sub_pilihan == '3':
+            if sub_pilihan == '4':
                 break
             
             if sub_pilihan == '1':
                 nama = input("Masukkan nama Anda: ")
                 sistem_antrian.tambah_nasabah(nama, kategori)
-                sistem_antrian.update_antrian(kategori)
             
             elif sub_pilihan == '2':
                 sistem_antrian.tampilkan_status_antrian(kategori)
             
+            elif sub_pilihan == '3':
+                nomor = input("Masukkan nomor loket: ")
+                if nomor.isdigit():
+                    sistem_antrian.selesaikan_layanan(kategori, int(nomor))
+                else:
+                    print("Nomor loket tidak valid.")
+            
             else:
                 print("Pilihan tidak valid. Silakan coba lagi.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(load_categories(sys.argv[1]) if len(sys.argv) > 1 else None)
\ No newline at end of file